@@ -0,0 +1,194 @@
+"""Agendador dos agentes: cada um roda só quando vence o próprio período no relógio da simulação.
+
+Cada agente é registrado como uma tarefa periódica com `periodo` (s simulados),
+`prioridade` e as tarefas que precisam rodar antes dele no mesmo ciclo
+(`depois_de`: o irrigador e o colhedor dependem do sensor). A cada ciclo,
+`executar()` roda, em ordem de dependência e prioridade, só as tarefas
+vencidas (`agora - ultimo >= periodo`, a mesma conta que os agentes faziam a
+cada chamada para responder "Aguardando...").
+
+Funções comuns rodam direto, em sequência. Tarefas `async def` rodam num laço
+asyncio próprio: as vencidas no mesmo ciclo andam juntas e cada uma espera só
+as suas dependências, então um agente que aguarda E/S não segura os outros.
+
+Para cada tarefa ficam o atraso (tempo de parede entre o início do ciclo e o
+início da tarefa, ou seja, quanto as anteriores a seguraram), a duração, os
+períodos perdidos (em tempo simulado, quando o relógio salta ciclos) e os
+estouros: execuções mais longas que `orcamento`. Um agente lento aparece em
+`resumo()` em vez de só deixar o ciclo mais lento.
+"""
+import inspect
+import math
+import time
+
+import relogio
+
+
+class Tarefa:
+    """Um agente periódico e as estatísticas das suas execuções.
+
+    `periodo` e `ultimo` podem ser números ou funções sem argumentos: com
+    `ultimo`, o horário da última execução vem do próprio agente (que pode ser
+    restaurado ou adiantado por fora, ver restauracao.py e eventos.py).
+    """
+
+    def __init__(self, nome, funcao, periodo, prioridade=0, depois_de=(), ultimo=None, orcamento=0.002):
+        self.nome = nome
+        self.funcao = funcao
+        self.assincrona = inspect.iscoroutinefunction(funcao)
+        self._periodo = periodo
+        self._ultimo = ultimo
+        self.prioridade = prioridade
+        self.depois_de = tuple(depois_de)
+        self.orcamento = orcamento
+        self.ultima_execucao = float("-inf")
+        self.zerar()
+
+    def zerar(self):
+        self.execucoes = 0
+        self.atraso_total = 0.0
+        self.atraso_max = 0.0
+        self.perdidos = 0
+        self.duracao_total = 0.0
+        self.duracao_max = 0.0
+        self.estouros = 0
+
+    @property
+    def periodo(self):
+        return self._periodo() if callable(self._periodo) else self._periodo
+
+    @property
+    def ultimo(self):
+        return self._ultimo() if self._ultimo is not None else self.ultima_execucao
+
+    def vencida(self, agora):
+        return agora - self.ultimo >= self.periodo
+
+    def _antes(self, agora, atraso):
+        """Anota o atraso desta execução; chamado antes de rodar (o agente atualiza `ultimo`)."""
+        ultimo, periodo = self.ultimo, self.periodo
+        if math.isfinite(ultimo) and periodo > 0:
+            self.perdidos += max(0, int((agora - ultimo) // periodo) - 1)
+        self.atraso_total += atraso
+        self.atraso_max = max(self.atraso_max, atraso)
+        self.ultima_execucao = agora
+
+    def _depois(self, duracao):
+        self.execucoes += 1
+        self.duracao_total += duracao
+        self.duracao_max = max(self.duracao_max, duracao)
+        if duracao > self.orcamento:
+            self.estouros += 1
+
+    def estatisticas(self):
+        """Execuções, atraso e duração (ms de parede), períodos perdidos e estouros."""
+        n = self.execucoes or 1
+        return {
+            "execucoes": self.execucoes,
+            "atraso_medio_ms": self.atraso_total / n * 1e3,
+            "atraso_max_ms": self.atraso_max * 1e3,
+            "perdidos": self.perdidos,
+            "duracao_media_ms": self.duracao_total / n * 1e3,
+            "duracao_max_ms": self.duracao_max * 1e3,
+            "estouros": self.estouros,
+        }
+
+
+class Agendador:
+    """Tarefas periódicas em ordem de dependência; `executar()` uma vez por ciclo."""
+
+    def __init__(self):
+        self.tarefas = []  # em ordem de execução
+        self._por_nome = {}
+        self._laco = None
+        self.ciclos = 0
+        self.ciclos_ociosos = 0  # ciclos sem nenhuma tarefa vencida
+
+    def registrar(self, nome, funcao, periodo, prioridade=0, depois_de=(), ultimo=None, orcamento=0.002):
+        """Registra um agente; entre tarefas sem dependência, maior `prioridade` roda antes."""
+        if nome in self._por_nome:
+            raise ValueError(f"tarefa {nome!r} já registrada")
+        faltando = [d for d in depois_de if d not in self._por_nome]
+        if faltando:
+            raise ValueError(f"{nome!r} depende de tarefas não registradas: {', '.join(faltando)}")
+        tarefa = Tarefa(nome, funcao, periodo, prioridade, depois_de, ultimo, orcamento)
+        self._por_nome[nome] = tarefa
+        self.tarefas = self._ordenar(list(self._por_nome.values()))
+        return tarefa
+
+    @staticmethod
+    def _ordenar(tarefas):
+        """Ordem topológica; entre as liberadas, maior prioridade e depois ordem de registro."""
+        ordem, feitas = [], set()
+        pendentes = list(tarefas)
+        while pendentes:
+            livres = [t for t in pendentes if all(d in feitas for d in t.depois_de)]
+            escolhida = max(livres, key=lambda t: (t.prioridade, -pendentes.index(t)))
+            ordem.append(escolhida)
+            feitas.add(escolhida.nome)
+            pendentes.remove(escolhida)
+        return ordem
+
+    def __getitem__(self, nome):
+        return self._por_nome[nome]
+
+    def executar(self, agora=None):
+        """Roda as tarefas vencidas em `agora` (padrão: relógio atual); devolve quantas rodaram."""
+        inicio_ciclo = time.perf_counter()
+        agora = relogio.agora() if agora is None else agora
+        self.ciclos += 1
+        vencidas = [t for t in self.tarefas if t.vencida(agora)]
+        if not vencidas:
+            self.ciclos_ociosos += 1
+            return 0
+        if any(t.assincrona for t in vencidas):
+            if self._laco is None:
+                import asyncio  # só quem registra tarefas async paga pela importação
+
+                self._laco = asyncio.new_event_loop()
+            self._laco.run_until_complete(self._rodada(vencidas, agora, inicio_ciclo))
+        else:
+            for tarefa in vencidas:
+                inicio = time.perf_counter()
+                tarefa._antes(agora, inicio - inicio_ciclo)
+                tarefa.funcao()
+                tarefa._depois(time.perf_counter() - inicio)
+        return len(vencidas)
+
+    async def _rodada(self, vencidas, agora, inicio_ciclo):
+        import asyncio
+
+        concluidas = {t.nome: asyncio.Event() for t in vencidas}
+
+        async def rodar(tarefa):
+            # Só espera as dependências que também venceram neste ciclo
+            for nome in tarefa.depois_de:
+                if nome in concluidas:
+                    await concluidas[nome].wait()
+            inicio = time.perf_counter()
+            tarefa._antes(agora, inicio - inicio_ciclo)
+            try:
+                if tarefa.assincrona:
+                    await tarefa.funcao()
+                else:
+                    tarefa.funcao()
+            finally:
+                tarefa._depois(time.perf_counter() - inicio)
+                concluidas[tarefa.nome].set()
+
+        await asyncio.gather(*(rodar(t) for t in vencidas))
+
+    def reiniciar_horarios(self):
+        """Esquece a última execução das tarefas sem `ultimo` próprio (ao voltar o relógio, ver restauracao.py)."""
+        for tarefa in self.tarefas:
+            tarefa.ultima_execucao = float("-inf")
+
+    def resumo(self):
+        """[(tarefa, atraso médio ms, duração máx ms, estouros)] para a sobreposição de perfil."""
+        return [(t.nome, t.atraso_total / (t.execucoes or 1) * 1e3, t.duracao_max * 1e3, t.estouros)
+                for t in list(self.tarefas)]
+
+    def fechar(self):
+        if self._laco is not None:
+            self._laco.close()
+            self._laco = None
@@ -1,18 +1,312 @@
 ### colhedor.py
-import time
+import heapq
+import itertools
+
+import ambiente
+import relogio
+from agentes import sensor
 
 AMARELO = (255, 215, 0)
 
-ultimo_tempo = 0
+ultimo_tempo = float("-inf")  # nenhuma ação ainda
 delay = 0.0  # segundos
 
+# Estrutura opcional de busca de alvos (ver usar_indice_espacial e usar_fila_prazo)
+indice = None
+
+
+class IndiceEspacial:
+    """Grade uniforme de baldes para achar a planta mais próxima sem varrer o campo."""
+
+    def __init__(self, tamanho_celula=130):
+        self.tamanho_celula = tamanho_celula
+        self.celulas = {}  # (cx, cy) -> {planta: None}, preserva ordem de inserção
+        self.quantidade = 0
+        self.limites = None  # (cx_min, cy_min, cx_max, cy_max) já ocupados
+
+    def _celula(self, planta):
+        return int(planta.x // self.tamanho_celula), int(planta.y // self.tamanho_celula)
+
+    def __len__(self):
+        return self.quantidade
+
+    def __contains__(self, planta):
+        return planta in self.celulas.get(self._celula(planta), ())
+
+    def inserir(self, planta):
+        celula = self._celula(planta)
+        balde = self.celulas.setdefault(celula, {})
+        if planta in balde:
+            return
+        balde[planta] = None
+        self.quantidade += 1
+        cx, cy = celula
+        if self.limites is None:
+            self.limites = (cx, cy, cx, cy)
+        else:
+            x0, y0, x1, y1 = self.limites
+            self.limites = (min(x0, cx), min(y0, cy), max(x1, cx), max(y1, cy))
+
+    def remover(self, planta):
+        celula = self._celula(planta)
+        balde = self.celulas.get(celula)
+        if balde is None or planta not in balde:
+            return
+        del balde[planta]
+        self.quantidade -= 1
+        if not balde:
+            del self.celulas[celula]
+
+    def mais_proximo(self, pos):
+        """Planta mais próxima de `pos`; empates vão para a de menor (y, x), como na ordem do campo."""
+        if not self.quantidade:
+            return None
+        c = self.tamanho_celula
+        px, py = pos
+        cx, cy = int(px // c), int(py // c)
+        x0, y0, x1, y1 = self.limites
+        raio_max = max(cx - x0, x1 - cx, cy - y0, y1 - cy, 0)
+
+        def chave(planta):
+            dx = planta.x - px
+            dy = planta.y - py
+            return dx*dx + dy*dy, planta.y, planta.x
+
+        if self.quantidade <= 32:
+            # Poucas plantas: comparar todas é mais barato que percorrer anéis vazios
+            return min((p for balde in self.celulas.values() for p in balde), key=chave)
+
+        melhor, melhor_chave = None, None
+        for raio in range(raio_max + 1):
+            for celula in _anel(cx, cy, raio, self.limites):
+                for planta in self.celulas.get(celula, ()):
+                    k = chave(planta)
+                    if melhor_chave is None or k < melhor_chave:
+                        melhor, melhor_chave = planta, k
+            # Tudo que está além do anel `raio` fica a mais de raio*c de distância
+            if melhor_chave is not None and melhor_chave[0] <= (raio * c) ** 2:
+                break
+        return melhor
+
+
+def _anel(cx, cy, raio, limites):
+    """Células a exatamente `raio` células (Chebyshev) de (cx, cy), só dentro de `limites`."""
+    x0, y0, x1, y1 = limites
+    if raio == 0:
+        yield (cx, cy)
+        return
+    xs = range(max(cx - raio, x0), min(cx + raio, x1) + 1)
+    for y in (cy - raio, cy + raio):
+        if y0 <= y <= y1:
+            for x in xs:
+                yield (x, y)
+    ys = range(max(cy - raio + 1, y0), min(cy + raio - 1, y1) + 1)
+    for x in (cx - raio, cx + raio):
+        if x0 <= x <= x1:
+            for y in ys:
+                yield (x, y)
+
+
+class IndiceColheita:
+    """Plantas maduras e mortas indexadas por posição.
+
+    As candidatas são as das listas de colheita da última leitura do sensor
+    (avisos de sensor.registrar_leitor), as mesmas que agir_colhedor varreria;
+    como na varredura, vale o estado atual delas, acompanhado pelos avisos das
+    plantas (morreu, foi replantada).
+    """
+
+    def __init__(self, plantas, tamanho_celula=130):
+        self.membros = set(plantas)
+        self.lidas = {"maduras": set(), "mortas": set()}  # listas publicadas pelo sensor
+        self.maduras = IndiceEspacial(tamanho_celula)
+        self.mortas = IndiceEspacial(tamanho_celula)
+        for planta in sensor.plantas_maduras:
+            self.ao_ler(planta, "maduras", True)
+        for planta in sensor.plantas_mortas:
+            self.ao_ler(planta, "mortas", True)
+
+    def ao_ler(self, planta, categoria, dentro):
+        # Leitor registrado no sensor: a leitura pôs ou tirou a planta de uma lista
+        lidas = self.lidas.get(categoria)
+        if lidas is None or planta not in self.membros:
+            return
+        if dentro:
+            lidas.add(planta)
+        else:
+            lidas.discard(planta)
+        self.classificar(planta)
+
+    def lida(self, planta):
+        return planta in self.lidas["maduras"] or planta in self.lidas["mortas"]
+
+    def classificar(self, planta):
+        self.maduras.remover(planta)
+        self.mortas.remover(planta)
+        if planta.coletada or not self.lida(planta):
+            return
+        if planta.morta:
+            self.mortas.inserir(planta)
+        elif planta.maturidade >= 100:
+            self.maduras.inserir(planta)
+
+    def __call__(self, planta, evento):
+        # Observador registrado em ambiente: uma candidata morreu ou foi replantada
+        if self.lida(planta):
+            self.classificar(planta)
+
+    def tem_alvo(self):
+        return len(self.maduras) > 0 or len(self.mortas) > 0
+
+    def alvo(self, pos_atual):
+        """Retorna (planta, ação): a madura mais próxima ou, sem maduras, a morta mais próxima."""
+        alvo = self.maduras.mais_proximo(pos_atual)
+        if alvo is not None:
+            return alvo, "colher"
+        alvo = self.mortas.mais_proximo(pos_atual)
+        if alvo is not None:
+            return alvo, "remover"
+        return None, None
+
+
+class FilaColheita(IndiceColheita):
+    """Maduras em fila de prioridade pela folga até morrer de madura; distância desempata.
+
+    Como no índice, só entram as maduras que o sensor já leu.
+    """
+
+    def __init__(self, plantas, tamanho_celula=130):
+        self.fila = []  # heap de (ciclo_prazo, seq, planta)
+        self.entradas = {}  # planta -> seq da sua entrada válida na fila
+        self._seq = itertools.count()
+        super().__init__(plantas, tamanho_celula)
+
+    def classificar(self, planta):
+        self.mortas.remover(planta)
+        self.entradas.pop(planta, None)
+        if planta.coletada or not self.lida(planta):
+            return
+        if planta.morta:
+            self.mortas.inserir(planta)
+        elif planta.maturidade >= 100:
+            # tempo_madura_cheia sobe 1 por ciclo; a planta morre quando passa do limite,
+            # então o ciclo do prazo fica fixo enquanto ela estiver madura
+            prazo = relogio.ciclo() + planta.limite_tempo_madura_cheia - planta.tempo_madura_cheia
+            seq = next(self._seq)
+            self.entradas[planta] = seq
+            heapq.heappush(self.fila, (prazo, seq, planta))
+
+    def tem_alvo(self):
+        # Entradas só existem para maduras vivas: classificar as remove ao morrer ou resetar
+        return bool(self.entradas) or len(self.mortas) > 0
+
+    def _valida(self, entrada):
+        _, seq, planta = entrada
+        return self.entradas.get(planta) == seq and not planta.morta and not planta.coletada
+
+    def alvo(self, pos_atual):
+        fila = self.fila
+        while fila and not self._valida(fila[0]):
+            heapq.heappop(fila)
+
+        if fila:
+            # Retira todas as entradas com o menor prazo e fica com a mais próxima
+            prazo = fila[0][0]
+            empatadas = []
+            while fila and fila[0][0] == prazo:
+                entrada = heapq.heappop(fila)
+                if self._valida(entrada):
+                    empatadas.append(entrada)
+
+            def chave(entrada):
+                planta = entrada[2]
+                dx = planta.x - pos_atual[0]
+                dy = planta.y - pos_atual[1]
+                return dx*dx + dy*dy, planta.y, planta.x
+
+            escolhida = min(empatadas, key=chave)
+            for entrada in empatadas:
+                if entrada is not escolhida:
+                    heapq.heappush(fila, entrada)
+            return escolhida[2], "colher"
+
+        alvo = self.mortas.mais_proximo(pos_atual)
+        if alvo is not None:
+            return alvo, "remover"
+        return None, None
+
+
+def _instalar(novo_indice):
+    global indice
+    if indice is not None:
+        ambiente.remover_observador(indice)
+        sensor.remover_leitor(indice.ao_ler)
+    indice = novo_indice
+    ambiente.registrar_observador(indice)
+    sensor.registrar_leitor(indice.ao_ler)
+    return indice
+
+
+def usar_indice_espacial(plantas, tamanho_celula=130):
+    """Passa a buscar alvos em um índice espacial mantido de forma incremental."""
+    return _instalar(IndiceColheita(plantas, tamanho_celula))
+
+
+def usar_fila_prazo(plantas, tamanho_celula=130):
+    """Passa a colher primeiro a planta madura mais perto de morrer (menor folga)."""
+    return _instalar(FilaColheita(plantas, tamanho_celula))
+
+
+def reiniciar():
+    """Zera o controle de intervalo do colhedor e desliga o índice espacial."""
+    global ultimo_tempo, indice
+    ultimo_tempo = float("-inf")
+    if indice is not None:
+        ambiente.remover_observador(indice)
+        sensor.remover_leitor(indice.ao_ler)
+        indice = None
+
+def tem_alvo(plantas):
+    """True se agir_colhedor teria alguma planta para colher ou remover agora."""
+    if indice is not None:
+        return indice.tem_alvo()
+    return any(not p.coletada and (p.morta or p.maturidade >= 100) for p in plantas)
+
 def agir_colhedor(plantas, pos_atual):
     global ultimo_tempo
 
-    agora = time.time()
+    agora = relogio.agora()
     if agora - ultimo_tempo < delay:
         return pos_atual, "Aguardando próximo ciclo...", 0, 0
 
+    if indice is not None:
+        alvo, acao = indice.alvo(pos_atual)
+    else:
+        alvo, acao = _alvo_varredura(plantas, pos_atual)
+
+    ultimo_tempo = agora
+    if alvo is None:
+        return pos_atual, "Nenhuma ação possível", 0, 0
+    return colher(alvo)
+
+
+def colher(alvo):
+    """Colhe (madura) ou remove (morta) `alvo` e replanta; devolve (coords, mensagem, colhida, morta)."""
+    coords = (alvo.x, alvo.y)
+    morta = alvo.morta
+    agregados = alvo.agregados
+    if agregados is not None:
+        agregados.retirar(alvo)
+    alvo.coletada = True
+    if agregados is not None:
+        agregados.incluir(alvo)
+    alvo.resetar()
+    if not morta:
+        return coords, f"Colheu e replantou em {coords}", 1, 0
+    return coords, f"Removeu planta morta em {coords}", 0, 1
+
+
+def _alvo_varredura(plantas, pos_atual):
     pendentes = [p for p in plantas if not p.coletada]
     maduros = [p for p in pendentes if (not p.morta) and p.maturidade >= 100]
     mortos  = [p for p in pendentes if p.morta]
@@ -23,21 +317,8 @@ def agir_colhedor(plantas, pos_atual):
         return dx*dx + dy*dy
 
     if maduros:
-        alvo = min(maduros, key=dist2)
-        acao = "colher"
-    elif mortos:
-        alvo = min(mortos, key=dist2)
-        acao = "remover"
-    else:
-        ultimo_tempo = agora
-        return pos_atual, "Nenhuma ação possível", 0, 0
-
-    alvo.coletada = True
-    coords = (alvo.x, alvo.y)
-    alvo.resetar()
-    ultimo_tempo = agora
+        return min(maduros, key=dist2), "colher"
+    if mortos:
+        return min(mortos, key=dist2), "remover"
+    return None, None
 
-    if acao == "colher":
-        return coords, f"Colheu e replantou em {coords}", 1, 0
-    else:
-        return coords, f"Removeu planta morta em {coords}", 0, 1
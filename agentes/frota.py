@@ -0,0 +1,222 @@
+"""Frotas de irrigadores e colhedores com um despachante central.
+
+A cada ciclo, os agentes livres recebem alvos todos de uma vez: o custo de
+mandar o agente i à planta j é a distância (ponderada) mais a urgência da
+planta, e `atribuir` escolhe a combinação de menor custo total (método
+húngaro). `atribuir_guloso` reproduz a escolha antiga, cada agente pegando o
+seu melhor alvo livre, e serve de comparação (benchmarks/bench_frota.py).
+"""
+import heapq
+import time
+
+import numpy as np
+
+import relogio
+from agentes import colhedor
+from agentes.irrigador import AgenteIrrigador
+
+# Uma planta morta só é removida quando não há madura disponível para aquele agente
+PENALIDADE_REMOCAO = 1_000.0
+
+
+def atribuir(custos):
+    """Atribuição de custo mínimo: para cada linha, a coluna escolhida (-1 se sobrou).
+
+    Método húngaro na forma de caminhos aumentantes mais curtos (potenciais u, v),
+    O(n² m) para n linhas e m colunas, com a varredura das colunas em NumPy.
+    """
+    custos = np.asarray(custos, dtype=float)
+    if custos.shape[0] > custos.shape[1]:
+        # Mais linhas que colunas: resolve a transposta e inverte o resultado
+        colunas = atribuir(custos.T)
+        linhas = np.full(custos.shape[0], -1)
+        atribuidas = colunas >= 0
+        linhas[colunas[atribuidas]] = np.flatnonzero(atribuidas)
+        return linhas
+
+    n, m = custos.shape
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    dono = np.zeros(m + 1, dtype=int)  # linha (1..n) de cada coluna; 0 = livre
+    caminho = np.zeros(m + 1, dtype=int)
+    for i in range(1, n + 1):
+        dono[0] = i
+        j0 = 0
+        menor = np.full(m + 1, np.inf)
+        usada = np.zeros(m + 1, dtype=bool)
+        while True:
+            usada[j0] = True
+            i0 = dono[j0]
+            livres = ~usada[1:]
+            reduzido = custos[i0 - 1] - u[i0] - v[1:]
+            melhora = livres & (reduzido < menor[1:])
+            menor[1:][melhora] = reduzido[melhora]
+            caminho[1:][melhora] = j0
+
+            candidatos = np.where(livres, menor[1:], np.inf)
+            j1 = int(np.argmin(candidatos)) + 1
+            delta = candidatos[j1 - 1]
+            usadas = np.flatnonzero(usada)
+            u[dono[usadas]] += delta
+            v[usadas] -= delta
+            menor[1:][livres] -= delta
+            j0 = j1
+            if dono[j0] == 0:
+                break
+        # Inverte o caminho aumentante encontrado
+        while j0:
+            j1 = caminho[j0]
+            dono[j0] = dono[j1]
+            j0 = j1
+
+    linhas = np.full(n, -1)
+    colunas = np.flatnonzero(dono[1:])
+    linhas[dono[1:][colunas] - 1] = colunas
+    return linhas
+
+
+def atribuir_guloso(custos):
+    """Cada linha, em ordem, fica com a coluna livre mais barata (como um `min()` por agente)."""
+    custos = np.array(custos, dtype=float)
+    linhas = np.full(custos.shape[0], -1)
+    for i in range(min(custos.shape)):
+        j = int(np.argmin(custos[i]))
+        linhas[i] = j
+        custos[:, j] = np.inf
+    return linhas
+
+
+METODOS = {"hungaro": atribuir, "guloso": atribuir_guloso}
+
+
+class Frota:
+    """`irrigadores` irrigadores e `colhedores` colhedores servidos por um despachante.
+
+    Cada irrigador é um `AgenteIrrigador` (intervalo, limiares, histórico e
+    contador de emergências próprios); os colhedores seguem `colhedor.delay`.
+    O despachante olha só os `candidatos_por_agente` alvos mais urgentes por
+    agente livre, então o custo de cada despacho não cresce com o campo.
+    """
+
+    def __init__(self, irrigadores=1, colhedores=1, metodo="hungaro", peso_distancia=0.05,
+                 candidatos_por_agente=4, capacidade_historico=4_096):
+        self.irrigadores = [AgenteIrrigador(capacidade_historico=capacidade_historico) for _ in range(irrigadores)]
+        self.pos_irrigadores = [(0, 0)] * irrigadores
+        self.irrigadores_ativos = [False] * irrigadores
+        self.pos_colhedores = [(0, 0)] * colhedores
+        self.colhedores_ativos = [False] * colhedores
+        self.ultimo_tempo_colhedores = [float("-inf")] * colhedores
+        self.metodo = metodo
+        self.atribuir = METODOS[metodo]
+        self.peso_distancia = peso_distancia
+        self.candidatos_por_agente = candidatos_por_agente
+
+        # Custo acumulado das decisões (s), para os benchmarks
+        self.tempo_despacho = 0.0
+        self.despachos = 0
+
+    def agentes(self):
+        """[(tipo, posição, ativo)] de todos os agentes, irrigadores primeiro."""
+        return ([("irrigador", pos, ativo) for pos, ativo in zip(self.pos_irrigadores, self.irrigadores_ativos)] +
+                [("colhedor", pos, ativo) for pos, ativo in zip(self.pos_colhedores, self.colhedores_ativos)])
+
+    def _despachar(self, posicoes, alvos, urgencias):
+        """[(agente, alvo)] com a atribuição de menor custo total."""
+        inicio = time.perf_counter()
+        origem = np.asarray(posicoes, dtype=float)
+        destino = np.array([(p.x, p.y) for p in alvos], dtype=float)
+        distancias = np.hypot(origem[:, None, 0] - destino[None, :, 0], origem[:, None, 1] - destino[None, :, 1])
+        custos = distancias * self.peso_distancia + np.asarray(urgencias, dtype=float)
+        pares = [(i, int(j)) for i, j in enumerate(self.atribuir(custos)) if j >= 0]
+        self.tempo_despacho += time.perf_counter() - inicio
+        self.despachos += 1
+        return pares
+
+    def irrigar(self, candidatas):
+        """Irriga com cada irrigador livre; devolve (irrigações, livres)."""
+        agora = relogio.agora()
+        livres = [i for i, agente in enumerate(self.irrigadores) if agora - agente.ultimo_tempo >= agente.delay]
+        if not livres:
+            return 0, 0
+        for i in livres:
+            self.irrigadores[i].ultimo_tempo = agora
+            self.irrigadores_ativos[i] = False
+
+        # As listas do sensor podem estar atrasadas: vale a água de agora
+        limiar = self.irrigadores[0].limiar_preventivo
+        alvos = heapq.nsmallest(len(livres) * self.candidatos_por_agente,
+                                (p for p in candidatas if not p.coletada and p.agua < limiar),
+                                key=lambda p: p.agua)
+        if not alvos:
+            return 0, len(livres)
+
+        pares = self._despachar([self.pos_irrigadores[i] for i in livres], alvos, [p.agua for p in alvos])
+        for k, j in pares:
+            i = livres[k]
+            agente, planta = self.irrigadores[i], alvos[j]
+            if planta.agua < agente.limiar_critico:
+                agente.contador_emergencia += 1
+            self.pos_irrigadores[i], _ = agente.agir(planta)
+            self.irrigadores_ativos[i] = True
+        return len(pares), len(livres)
+
+    def colher(self, candidatas):
+        """Colhe ou remove com cada colhedor livre; devolve (colhidas, removidas, livres)."""
+        agora = relogio.agora()
+        livres = [j for j, ultimo in enumerate(self.ultimo_tempo_colhedores) if agora - ultimo >= colhedor.delay]
+        if not livres:
+            return 0, 0, 0
+        for j in livres:
+            self.ultimo_tempo_colhedores[j] = agora
+            self.colhedores_ativos[j] = False
+
+        def urgencia(p):
+            # Madura: ciclos de folga até morrer de madura; morta: depois de todas as maduras
+            if p.morta:
+                return PENALIDADE_REMOCAO
+            return p.limite_tempo_madura_cheia - p.tempo_madura_cheia
+
+        alvos = heapq.nsmallest(len(livres) * self.candidatos_por_agente,
+                                (p for p in candidatas if not p.coletada and (p.morta or p.maturidade >= 100)),
+                                key=urgencia)
+        if not alvos:
+            return 0, 0, len(livres)
+
+        colhidas = removidas = 0
+        pares = self._despachar([self.pos_colhedores[j] for j in livres], alvos, [urgencia(p) for p in alvos])
+        for k, a in pares:
+            j = livres[k]
+            coords, _, colhida, removida = colhedor.colher(alvos[a])
+            self.pos_colhedores[j] = coords
+            self.colhedores_ativos[j] = bool(colhida)
+            colhidas += colhida
+            removidas += removida
+        return colhidas, removidas, len(livres)
+
+    def estado(self, agora):
+        """Estado dos agentes, com os intervalos relativos a `agora` (ver restauracao.py)."""
+        return {
+            "pos_irrigadores": list(self.pos_irrigadores),
+            "irrigadores_ativos": list(self.irrigadores_ativos),
+            "ultimo_tempo_irrigadores": [a.ultimo_tempo - agora for a in self.irrigadores],
+            "contador_emergencia": [a.contador_emergencia for a in self.irrigadores],
+            "pos_colhedores": list(self.pos_colhedores),
+            "colhedores_ativos": list(self.colhedores_ativos),
+            "ultimo_tempo_colhedores": [t - agora for t in self.ultimo_tempo_colhedores],
+        }
+
+    def retomar(self, estado, agora):
+        """Volta ao que `estado` devolveu (frota do mesmo tamanho)."""
+        if (len(estado["pos_irrigadores"]), len(estado["pos_colhedores"])) != (len(self.irrigadores),
+                                                                                len(self.pos_colhedores)):
+            raise ValueError("o ponto de restauração é de uma frota de outro tamanho")
+        self.pos_irrigadores = list(estado["pos_irrigadores"])
+        self.irrigadores_ativos = list(estado["irrigadores_ativos"])
+        for agente, ultimo, contador in zip(self.irrigadores, estado["ultimo_tempo_irrigadores"],
+                                            estado["contador_emergencia"]):
+            agente.ultimo_tempo = agora + ultimo
+            agente.contador_emergencia = contador
+        self.pos_colhedores = list(estado["pos_colhedores"])
+        self.colhedores_ativos = list(estado["colhedores_ativos"])
+        self.ultimo_tempo_colhedores = [agora + t for t in estado["ultimo_tempo_colhedores"]]
+
@@ -0,0 +1,195 @@
+"""Histórico de irrigações em colunas NumPy de capacidade fixa (buffer circular).
+
+Cada campo do registro antigo `(tempo, coords, agua_original, agua_final,
+contador_emergencia)` vira um array tipado. Quando a capacidade enche, os
+registros mais antigos são sobrescritos; com `arquivo`, cada bloco completo é
+antes enviado a uma thread que o grava em disco (formato binário colunar lido
+por `ler_arquivo`), então nada se perde e a memória fica constante.
+"""
+import json
+import queue
+import struct
+import threading
+
+import numpy as np
+
+CAMPOS = (
+    ("tempo", np.float64),
+    ("x", np.int32),
+    ("y", np.int32),
+    ("agua_original", np.float64),
+    ("agua_final", np.float64),
+    ("contador_emergencia", np.int64),
+)
+
+MAGICO = b"HIRR1\n"
+_TAMANHO = struct.Struct("<I")
+
+
+class EscritorHistorico(threading.Thread):
+    """Grava blocos de colunas em segundo plano.
+
+    Arquivo: MAGICO, cabeçalho JSON com os campos, e blocos com o número de linhas
+    (uint32) seguido dos bytes de cada coluna, na ordem de CAMPOS.
+    """
+
+    def __init__(self, caminho, max_blocos=64):
+        super().__init__(name="historico-irrigacao", daemon=True)
+        self.caminho = caminho
+        self.fila = queue.Queue(max_blocos)  # cheia, quem registra espera (sem perder dados)
+        self.erro = None
+        self.arquivo = open(caminho, "wb")
+        cabecalho = json.dumps([(nome, np.dtype(tipo).str) for nome, tipo in CAMPOS]).encode()
+        self.arquivo.write(MAGICO + _TAMANHO.pack(len(cabecalho)) + cabecalho)
+        self.start()
+
+    def enviar(self, colunas):
+        if self.erro is not None:
+            raise self.erro
+        self.fila.put(colunas)
+
+    def run(self):
+        try:
+            while True:
+                colunas = self.fila.get()
+                if colunas is None:
+                    break
+                self.arquivo.write(_TAMANHO.pack(len(colunas[0])))
+                for coluna in colunas:
+                    self.arquivo.write(coluna.tobytes())
+        except OSError as erro:
+            self.erro = erro
+        finally:
+            self.arquivo.close()
+
+    def fechar(self):
+        self.fila.put(None)
+        self.join()
+        if self.erro is not None:
+            raise self.erro
+
+
+def ler_arquivo(caminho):
+    """Lê um arquivo gravado por EscritorHistorico e devolve {campo: array}."""
+    with open(caminho, "rb") as arquivo:
+        if arquivo.read(len(MAGICO)) != MAGICO:
+            raise ValueError(f"{caminho} não é um histórico de irrigação")
+        (tamanho,) = _TAMANHO.unpack(arquivo.read(_TAMANHO.size))
+        campos = [(nome, np.dtype(tipo)) for nome, tipo in json.loads(arquivo.read(tamanho))]
+        partes = {nome: [] for nome, _ in campos}
+        while True:
+            bruto = arquivo.read(_TAMANHO.size)
+            if not bruto:
+                break
+            (linhas,) = _TAMANHO.unpack(bruto)
+            for nome, tipo in campos:
+                partes[nome].append(np.frombuffer(arquivo.read(linhas * tipo.itemsize), dtype=tipo))
+    return {nome: np.concatenate(partes[nome]) if partes[nome] else np.empty(0, tipo)
+            for nome, tipo in campos}
+
+
+class HistoricoIrrigacao:
+    """Últimas `capacidade` irrigações em colunas tipadas, com gravação opcional em disco.
+
+    Indexar ou iterar devolve tuplas no formato antigo
+    `(tempo, (x, y), agua_original, agua_final, contador_emergencia)`.
+    """
+
+    def __init__(self, capacidade=65_536, arquivo=None, bloco=4_096):
+        bloco = min(bloco, capacidade)
+        if capacidade % bloco:
+            raise ValueError("capacidade deve ser múltipla do tamanho do bloco")
+        self.capacidade = capacidade
+        self.bloco = bloco
+        self.colunas = {nome: np.zeros(capacidade, dtype=tipo) for nome, tipo in CAMPOS}
+        self.total = 0  # registros desde o início, inclusive os já sobrescritos
+        self.gravados = 0  # registros já enviados ao escritor
+        # contador_emergencia do registro anterior ao mais antigo ainda em memória
+        self._contador_antes = 0
+        self.escritor = EscritorHistorico(arquivo) if arquivo else None
+
+    def __len__(self):
+        return min(self.total, self.capacidade)
+
+    def registrar(self, tempo, coords, agua_original, agua_final, contador_emergencia):
+        i = self.total % self.capacidade
+        c = self.colunas
+        if self.total >= self.capacidade:
+            self._contador_antes = int(c["contador_emergencia"][i])
+        c["tempo"][i] = tempo
+        c["x"][i], c["y"][i] = coords
+        c["agua_original"][i] = agua_original
+        c["agua_final"][i] = agua_final
+        c["contador_emergencia"][i] = contador_emergencia
+        self.total += 1
+
+        # Bloco completo: vai para o disco antes de poder ser sobrescrito
+        if self.escritor is not None and self.total - self.gravados == self.bloco:
+            self._gravar_pendentes()
+
+    def _gravar_pendentes(self):
+        n = self.total - self.gravados
+        if n == 0:
+            return
+        inicio = self.gravados % self.capacidade
+        if inicio + n <= self.capacidade:
+            self.escritor.enviar([self.colunas[nome][inicio:inicio + n].copy() for nome, _ in CAMPOS])
+        else:
+            self.escritor.enviar([np.concatenate((self.colunas[nome][inicio:],
+                                                  self.colunas[nome][:inicio + n - self.capacidade]))
+                                  for nome, _ in CAMPOS])
+        self.gravados = self.total
+
+    def fechar(self):
+        """Grava o que falta e encerra a thread de escrita (se houver)."""
+        if self.escritor is not None:
+            self._gravar_pendentes()
+            self.escritor.fechar()
+            self.escritor = None
+
+    def coluna(self, nome):
+        """Coluna `nome` em ordem cronológica (mais antigo primeiro)."""
+        dados = self.colunas[nome]
+        if self.total <= self.capacidade:
+            return dados[:self.total]
+        inicio = self.total % self.capacidade
+        return np.concatenate((dados[inicio:], dados[:inicio]))
+
+    def __getitem__(self, indice):
+        n = len(self)
+        if indice < 0:
+            indice += n
+        if not 0 <= indice < n:
+            raise IndexError("índice fora do histórico")
+        i = (self.total - n + indice) % self.capacidade
+        c = self.colunas
+        return (float(c["tempo"][i]), (int(c["x"][i]), int(c["y"][i])),
+                float(c["agua_original"][i]), float(c["agua_final"][i]), int(c["contador_emergencia"][i]))
+
+    def __iter__(self):
+        for indice in range(len(self)):
+            yield self[indice]
+
+    def emergencias(self):
+        """Máscara das irrigações que foram emergências (o contador subiu nelas)."""
+        contador = self.coluna("contador_emergencia")
+        return np.diff(contador, prepend=self._contador_antes) > 0
+
+    def irrigacoes_por_planta(self):
+        """{(x, y): quantidade de irrigações} dentro do histórico em memória."""
+        # (x, y) codificado em um único int64 para o np.unique trabalhar em uma dimensão
+        chaves = (self.coluna("x").astype(np.int64) << 32) | (self.coluna("y").astype(np.int64) & 0xFFFFFFFF)
+        unicas, contagens = np.unique(chaves, return_counts=True)
+        xs = (unicas >> 32).astype(np.int32)
+        ys = (unicas & 0xFFFFFFFF).astype(np.uint32).view(np.int32)
+        return {(int(x), int(y)): int(n) for x, y, n in zip(xs, ys, contagens)}
+
+    def emergencias_por_janela(self, janela):
+        """(inícios das janelas, emergências em cada uma) para janelas de `janela` segundos."""
+        tempo = self.coluna("tempo")
+        if len(tempo) == 0:
+            return np.empty(0), np.empty(0, dtype=np.int64)
+        origem = np.floor(tempo[0] / janela) * janela
+        indices = ((tempo - origem) // janela).astype(np.int64)
+        contagens = np.bincount(indices, weights=self.emergencias(), minlength=indices[-1] + 1)
+        return origem + janela * np.arange(len(contagens)), contagens.astype(np.int64)
@@ -1,17 +1,35 @@
-import time  # Para controlar o intervalo entre ações
+import heapq
+import itertools
+import math
+
+import ambiente
+import relogio  # Para controlar o intervalo entre ações
+from agentes.historico import HistoricoIrrigacao
 
 AZUL = (70, 130, 180)  # Cor do agente irrigador (visual)
 
 class AgenteIrrigador:
-    def __init__(self, delay=0.3, limiar_critico=25, limiar_preventivo=45, quantidade_agua=70):
-        self.ultimo_tempo = 0  # Última irrigação
+    def __init__(self, delay=0.3, limiar_critico=25, limiar_preventivo=45, quantidade_agua=70, modo="limiar",
+                 capacidade_historico=65_536, arquivo_historico=None):
+        self.ultimo_tempo = float("-inf")  # Última irrigação
         self.delay = delay  # Intervalo entre ações
         self.limiar_critico = limiar_critico  # Água mínima crítica
         self.limiar_preventivo = limiar_preventivo  # Água mínima preventiva
         self.quantidade_agua = quantidade_agua  # Quanto irrigar por vez
-        self.historico = []  # Registro de ações
+        # Registro de ações: últimas `capacidade_historico` em memória, o resto opcionalmente em disco
+        self.historico = HistoricoIrrigacao(capacidade_historico, arquivo_historico)
         self.contador_emergencia = 0  # Quantas vezes agiu em emergência
 
+        # Modo "limiar": mais seca entre as listas do sensor (original).
+        # Modo "prazo": fila de prioridade pelo ciclo previsto em que a água zera.
+        # Só as plantas abaixo de limiar_preventivo ficam na fila; as outras esperam
+        # em um segundo heap pelo ciclo previsto em que cruzam o limiar.
+        self.modo = modo
+        self.fila = []  # heap de (ciclo_prazo, seq, planta)
+        self.espera = []  # heap de (ciclo_verificacao, seq, ciclo_prazo, planta)
+        self.entradas = {}  # planta -> seq da sua entrada válida na fila ou na espera
+        self._seq = itertools.count()
+
     def decidir(self, criticas, preventivas):
         if criticas:
             self.contador_emergencia += 1
@@ -24,20 +42,152 @@ class AgenteIrrigador:
         deficit = 100 - planta.agua
         agua_a_adicionar = min(deficit, self.quantidade_agua)
         agua_original = planta.agua
-        planta.agua += agua_a_adicionar
+        planta.irrigar(agua_a_adicionar)
         coords = (planta.x, planta.y)
 
-        self.historico.append((
-            time.time(), coords, agua_original, planta.agua, self.contador_emergencia
-        ))
+        self.historico.registrar(
+            relogio.agora(), coords, agua_original, planta.agua, self.contador_emergencia
+        )
 
         return coords, f"💧 Irrigou planta em {coords} (de {agua_original} para {planta.agua})"
 
+    def preparar_fila(self, plantas):
+        """Monta a fila por prazo com o campo inteiro e passa a ouvir os replantios."""
+        self.encerrar_fila()
+        ciclo = relogio.ciclo()
+        self.fila = []
+        self.espera = []
+        self.entradas = {}
+        for planta in plantas:
+            seq = next(self._seq)
+            self.entradas[planta] = seq
+            if not planta.morta and not planta.coletada:
+                self._inserir(self._prazo(planta, ciclo), seq, planta, ciclo, montando=True)
+        heapq.heapify(self.fila)
+        heapq.heapify(self.espera)
+        ambiente.registrar_observador(self._ao_mudar_planta)
+
+    def estado_fila(self):
+        """([(planta, prazo, seq)], próximo seq) da fila por prazo; prazo nan se a planta está fora dos heaps."""
+        prazos = {seq: prazo for prazo, seq, _ in self.fila}
+        prazos.update((seq, prazo) for _, seq, prazo, _ in self.espera)
+        proximo = next(self._seq)
+        self._seq = itertools.count(proximo)
+        return [(planta, prazos.get(seq, math.nan), seq) for planta, seq in self.entradas.items()], proximo
+
+    def retomar_fila(self, entradas, proximo):
+        """Refaz a fila com o que estado_fila devolveu (mesmos prazos, mesma ordem de desempate)."""
+        self.encerrar_fila()
+        ciclo = relogio.ciclo()
+        self.entradas = {planta: seq for planta, _, seq in entradas}
+        self.fila = []
+        self.espera = []
+        for planta, prazo, seq in entradas:
+            if not math.isnan(prazo):
+                self._inserir(prazo, seq, planta, ciclo, montando=True)
+        heapq.heapify(self.fila)
+        heapq.heapify(self.espera)
+        self._seq = itertools.count(proximo)
+        ambiente.registrar_observador(self._ao_mudar_planta)
+
+    def encerrar_fila(self):
+        ambiente.remover_observador(self._ao_mudar_planta)
+
+    def _prazo(self, planta, ciclo):
+        # A água cai fator_consumo por ciclo, então agua/fator_consumo é o número
+        # de ciclos até zerar; somado ao ciclo atual, o prazo não muda até a
+        # próxima irrigação ou replantio.
+        return ciclo + planta.agua / planta.fator_consumo
+
+    def _verificacao(self, planta, ciclo):
+        # Ciclo em que conferir de novo a água de uma planta ainda acima do limiar:
+        # no máximo um ciclo antes de ela cruzar (a conta de ponto flutuante pode
+        # errar por pouco e adiantar é só uma conferência a mais), nunca o atual.
+        return ciclo + max(1, math.floor((planta.agua - self.limiar_preventivo) / planta.fator_consumo))
+
+    def _inserir(self, prazo, seq, planta, ciclo, montando=False):
+        """Põe a entrada na fila se a planta já está abaixo do limiar; senão, na espera."""
+        if planta.agua < self.limiar_preventivo:
+            heap, entrada = self.fila, (prazo, seq, planta)
+        else:
+            heap, entrada = self.espera, (self._verificacao(planta, ciclo), seq, prazo, planta)
+        if montando:
+            heap.append(entrada)  # quem monta chama heapify no fim
+        else:
+            heapq.heappush(heap, entrada)
+
+    def _agendar(self, planta):
+        seq = next(self._seq)
+        self.entradas[planta] = seq
+        ciclo = relogio.ciclo()
+        self._inserir(self._prazo(planta, ciclo), seq, planta, ciclo)
+
+        # Entradas vencidas são descartadas aos poucos; reconstrói se acumularem demais
+        if len(self.fila) + len(self.espera) > 2 * len(self.entradas) + 64:
+            self.fila = [e for e in self.fila if self.entradas.get(e[2]) == e[1]]
+            self.espera = [e for e in self.espera if self.entradas.get(e[3]) == e[1]]
+            heapq.heapify(self.fila)
+            heapq.heapify(self.espera)
+
+    def _ao_mudar_planta(self, planta, evento):
+        if evento == "resetada" and planta in self.entradas:
+            self._agendar(planta)
+
+    def _valida(self, entrada):
+        _, seq, planta = entrada
+        return self.entradas.get(planta) == seq and not planta.morta and not planta.coletada
+
+    def _mais_urgente(self):
+        """Planta viva abaixo de limiar_preventivo com o menor prazo, ou None.
+
+        Primeiro passa da espera para a fila as plantas que cruzaram o limiar; depois
+        descarta do topo da fila as entradas vencidas e devolve à espera as plantas
+        que voltaram a ter água (irrigadas por fora). O custo é proporcional às
+        plantas que mudaram de heap, não ao campo.
+        """
+        ciclo = relogio.ciclo()
+        espera, fila = self.espera, self.fila
+        while espera and espera[0][0] <= ciclo:
+            _, seq, prazo, planta = heapq.heappop(espera)
+            if self.entradas.get(planta) == seq and not planta.morta and not planta.coletada:
+                self._inserir(prazo, seq, planta, ciclo)
+        while fila:
+            prazo, seq, planta = fila[0]
+            if not self._valida(fila[0]):
+                heapq.heappop(fila)
+            elif planta.agua >= self.limiar_preventivo:
+                heapq.heappop(fila)
+                self._inserir(prazo, seq, planta, ciclo)
+            else:
+                return planta
+        return None
+
+    def tem_trabalho(self, plantas):
+        """True se uma chamada de executar agora (fora do intervalo) irrigaria alguma planta."""
+        if self.modo == "prazo":
+            return self._mais_urgente() is not None
+        return any(p.agua < self.limiar_preventivo for p in plantas)
+
+    def executar_por_prazo(self, agora):
+        planta_alvo = self._mais_urgente()
+        self.ultimo_tempo = agora
+        if planta_alvo is None:
+            return (0, 0), "✅ Nenhuma planta precisa de irrigação."
+
+        if planta_alvo.agua < self.limiar_critico:
+            self.contador_emergencia += 1
+        coords, msg = self.agir(planta_alvo)
+        self._agendar(planta_alvo)
+        return coords, msg
+
     def executar(self, plantas):
-        agora = time.time()
+        agora = relogio.agora()
         if agora - self.ultimo_tempo < self.delay:
             return (0, 0), "⏳ Aguardando próximo ciclo..."
 
+        if self.modo == "prazo":
+            return self.executar_por_prazo(agora)
+
         criticas = [p for p in plantas if p.agua < self.limiar_critico]
         preventivas = [p for p in plantas if self.limiar_critico <= p.agua < self.limiar_preventivo]
         planta_alvo = self.decidir(criticas, preventivas)
@@ -53,6 +203,14 @@ class AgenteIrrigador:
 # Instância global usada no sistema
 agente_global = AgenteIrrigador()
 
+def reiniciar(**parametros):
+    """Substitui o agente global por um novo, sem histórico."""
+    global agente_global
+    agente_global.encerrar_fila()
+    agente_global.historico.fechar()
+    agente_global = AgenteIrrigador(**parametros)
+    return agente_global
+
 # Função externa chamada pelo sistema principal
 def agir_irrigador(plantas):
     return agente_global.executar(plantas)
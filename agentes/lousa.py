@@ -0,0 +1,130 @@
+"""Lousa em memória compartilhada: as leituras do sensor para agentes em outros processos.
+
+Cada publicação grava as quatro listas do sensor (críticas, preventivas,
+maduras e mortas) como registros de layout fixo (`REGISTRO`), com o índice da
+planta no campo, e ganha uma versão nova. Há dois buffers: a versão v vai para
+o buffer v % 2, então quem está lendo a versão anterior tem uma publicação
+inteira de folga antes de ela ser sobrescrita. Cada buffer tem um contador de
+sequência (seqlock): -1 enquanto é escrito e v depois; o leitor confere o
+contador antes e depois de copiar e tenta de novo se ele mudou, sem trava.
+
+Só um processo escreve; qualquer número de processos lê com `Lousa.abrir(nome)`.
+"""
+import time
+from collections import namedtuple
+from multiprocessing import shared_memory
+
+import numpy as np
+
+REGISTRO = np.dtype([("indice", "<i8"), ("x", "<i4"), ("y", "<i4"), ("agua", "<f8"), ("maturidade", "<f8"),
+                     ("morta", "?")])
+
+CATEGORIAS = ("criticas", "preventivas", "maduras", "mortas")
+
+# Cabeçalho geral: versão publicada mais recente e capacidade (registros por buffer)
+_GERAL = np.dtype([("versao", "<i8"), ("capacidade", "<i8")])
+# Cabeçalho de cada buffer: sequência, tempo simulado da leitura e registros por categoria
+_BUFFER = np.dtype([("sequencia", "<i8"), ("tempo", "<f8"), ("contagens", "<i8", len(CATEGORIAS))])
+_CABECALHO = 64  # bytes reservados para cada cabeçalho
+
+Leitura = namedtuple("Leitura", ("versao", "tempo") + CATEGORIAS)
+Leitura.__doc__ = "Cópia de uma publicação: versão, tempo simulado e um array de `REGISTRO` por categoria."
+
+
+def _tamanho_buffer(capacidade):
+    return _CABECALHO + capacidade * REGISTRO.itemsize
+
+
+class Lousa:
+    """Bloco de memória compartilhada com dois buffers de até `capacidade` registros."""
+
+    def __init__(self, capacidade, nome=None):
+        criar = nome is None
+        tamanho = _CABECALHO + 2 * _tamanho_buffer(capacidade) if criar else 0
+        self.memoria = shared_memory.SharedMemory(name=nome, create=criar, size=tamanho)
+        self.criadora = criar
+        self._geral = np.ndarray((), dtype=_GERAL, buffer=self.memoria.buf)
+        if criar:
+            self._geral["versao"] = 0
+            self._geral["capacidade"] = capacidade
+        self.capacidade = int(self._geral["capacidade"])
+
+        self._cabecalhos = []
+        self._registros = []
+        for b in range(2):
+            inicio = _CABECALHO + b * _tamanho_buffer(self.capacidade)
+            self._cabecalhos.append(np.ndarray((), dtype=_BUFFER, buffer=self.memoria.buf, offset=inicio))
+            self._registros.append(np.ndarray(self.capacidade, dtype=REGISTRO, buffer=self.memoria.buf,
+                                              offset=inicio + _CABECALHO))
+        self.tentativas = 0  # releituras por escrita concorrente (só deste processo)
+
+    @classmethod
+    def abrir(cls, nome):
+        """Abre, para leitura, a lousa criada por outro processo."""
+        return cls(0, nome)
+
+    @property
+    def nome(self):
+        return self.memoria.name
+
+    @property
+    def versao(self):
+        return int(self._geral["versao"])
+
+    def publicar(self, tempo, grupos):
+        """Grava uma nova versão com os arrays de `REGISTRO` de cada categoria; devolve a versão."""
+        total = sum(len(g) for g in grupos)
+        if total > self.capacidade:
+            raise ValueError(f"{total} registros não cabem na lousa ({self.capacidade})")
+        versao = self.versao + 1
+        cabecalho, registros = self._cabecalhos[versao % 2], self._registros[versao % 2]
+
+        cabecalho["sequencia"] = -1  # escrevendo
+        cabecalho["tempo"] = tempo
+        inicio = 0
+        for k, grupo in enumerate(grupos):
+            registros[inicio:inicio + len(grupo)] = grupo
+            cabecalho["contagens"][k] = len(grupo)
+            inicio += len(grupo)
+        cabecalho["sequencia"] = versao
+        self._geral["versao"] = versao
+        return versao
+
+    def ler(self, depois_de=0):
+        """Cópia da versão mais recente, ou None se ela não for mais nova que `depois_de`."""
+        while True:
+            versao = self.versao
+            if versao <= depois_de:
+                return None
+            cabecalho, registros = self._cabecalhos[versao % 2], self._registros[versao % 2]
+            if cabecalho["sequencia"] != versao:
+                # O escritor já está duas versões à frente e reescreve este buffer
+                self.tentativas += 1
+                continue
+            tempo = float(cabecalho["tempo"])
+            contagens = cabecalho["contagens"].copy()
+            copia = registros[:int(contagens.sum())].copy()
+            if cabecalho["sequencia"] != versao:
+                self.tentativas += 1
+                continue
+            limites = np.concatenate(([0], np.cumsum(contagens)))
+            return Leitura(versao, tempo, *(copia[a:b] for a, b in zip(limites[:-1], limites[1:])))
+
+    def esperar(self, depois_de, tempo_limite, intervalo=0.0005):
+        """Como `ler`, mas espera até `tempo_limite` segundos por uma versão nova."""
+        fim = time.perf_counter() + tempo_limite
+        while True:
+            leitura = self.ler(depois_de)
+            if leitura is not None or time.perf_counter() >= fim:
+                return leitura
+            time.sleep(intervalo)
+
+    def fechar(self):
+        """Solta o bloco; quem criou a lousa também apaga o nome."""
+        self._geral = self._cabecalhos = self._registros = None
+        self.memoria.close()
+        if self.criadora:
+            try:
+                self.memoria.unlink()
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,210 @@
+"""Irrigador e colhedor em processos próprios, lendo a lousa e mandando comandos de volta.
+
+O processo principal roda o sensor e, a cada ciclo, publica as listas dele
+na `Lousa` (agentes/lousa.py). Cada agente roda em um processo que lê a versão
+mais recente sem trava, decide com as mesmas regras de `agentes.irrigador` e
+`agentes.colhedor` e coloca o comando numa fila: ("irrigar" | "colher",
+índice da planta, versão lida). O principal aplica os comandos no começo do
+ciclo seguinte, conferindo antes se a planta ainda precisa da ação (a leitura
+pode estar atrasada ou o comando repetido); os recusados só são contados.
+
+Com `sincrono=True` (o padrão sem interface, com relógio virtual), cada agente
+responde a toda versão, com um comando ou com ("nada", -1, versão), e o
+principal espera as duas respostas antes de seguir: o resultado deixa de
+depender da velocidade de cada processo e uma mesma semente dá sempre o mesmo
+resultado.
+"""
+import multiprocessing
+import queue
+
+import numpy as np
+
+import relogio
+from agentes import colhedor, irrigador, sensor
+from agentes.lousa import REGISTRO, Lousa
+
+# Espera máxima por uma versão nova antes de conferir se é hora de parar (s)
+_ESPERA = 0.05
+
+
+def _laco_irrigador(nome, comandos, parar, sincrono, delay, limiar_critico, limiar_preventivo, ultimo_tempo):
+    """Mais seca entre críticas e preventivas, no máximo uma vez a cada `delay` s simulados."""
+    lousa = Lousa.abrir(nome)
+    try:
+        versao = 0
+        while not parar.is_set():
+            leitura = lousa.esperar(versao, _ESPERA)
+            if leitura is None:
+                continue
+            versao = leitura.versao
+            comando = None
+            if leitura.tempo - ultimo_tempo >= delay:
+                ultimo_tempo = leitura.tempo
+                # A água publicada é a de agora: as listas do sensor podem estar atrasadas
+                candidatas = np.concatenate((leitura.criticas, leitura.preventivas))
+                candidatas = candidatas[candidatas["agua"] < limiar_preventivo]
+                criticas = candidatas[candidatas["agua"] < limiar_critico]
+                escolha = criticas if len(criticas) else candidatas
+                if len(escolha):
+                    comando = ("irrigar", int(escolha["indice"][np.argmin(escolha["agua"])]), versao)
+            if comando is not None:
+                comandos.put(comando)
+            elif sincrono:
+                comandos.put(("nada", -1, versao))
+    finally:
+        lousa.fechar()
+
+
+def _laco_colhedor(nome, comandos, parar, sincrono, pos):
+    """Madura mais próxima ou, sem maduras, morta mais próxima, a cada versão publicada."""
+    lousa = Lousa.abrir(nome)
+    try:
+        versao = 0
+        while not parar.is_set():
+            leitura = lousa.esperar(versao, _ESPERA)
+            if leitura is None:
+                continue
+            versao = leitura.versao
+            # Como na varredura do colhedor, valem a maturidade e a morte de agora, nas duas listas
+            # (uma madura que morreu depois da leitura do sensor também é removida)
+            lidas = np.concatenate((leitura.maduras, leitura.mortas))
+            maduras = lidas[(lidas["maturidade"] >= 100) & ~lidas["morta"]]
+            alvos = maduras if len(maduras) else lidas[lidas["morta"]]
+            if not len(alvos):
+                if sincrono:
+                    comandos.put(("nada", -1, versao))
+                continue
+            # Mesmo desempate do colhedor: menor distância, depois a primeira da lista
+            dx = alvos["x"].astype(np.int64) - pos[0]
+            dy = alvos["y"].astype(np.int64) - pos[1]
+            escolhida = alvos[np.argmin(dx * dx + dy * dy)]
+            pos = (int(escolhida["x"]), int(escolhida["y"]))
+            comandos.put(("colher", int(escolhida["indice"]), versao))
+    finally:
+        lousa.fechar()
+
+
+class AgentesEmProcessos:
+    """Lousa, fila de comandos e os processos do irrigador e do colhedor de uma simulação.
+
+    `sincrono`: os agentes respondem a cada versão publicada e esperar_respostas
+    bloqueia até as duas respostas chegarem (ver o cabeçalho do módulo).
+    `pos_colhedor` é a posição inicial do colhedor; o horário da última decisão do
+    irrigador vem de irrigador.agente_global.ultimo_tempo (ambos mudam ao restaurar).
+    """
+
+    def __init__(self, plantas, campo=None, sincrono=False, pos_colhedor=(0, 0)):
+        self.plantas = plantas
+        self.campo = campo
+        self.sincrono = sincrono
+        self._indices = None if campo is not None else {p: i for i, p in enumerate(plantas)}
+        # Uma planta aparece em no máximo duas listas (água e colheita)
+        self.lousa = Lousa(max(1, 2 * len(plantas)))
+        self.comandos_aplicados = 0
+        self.comandos_recusados = 0
+        self.atraso_total = 0  # soma de (versão atual - versão lida) dos comandos aplicados
+
+        contexto = multiprocessing.get_context("spawn")  # sem herdar a thread da simulação nem a janela
+        self.comandos = contexto.Queue()
+        self._parar = contexto.Event()
+        agente = irrigador.agente_global
+        self.processos = [
+            contexto.Process(target=_laco_irrigador, name="irrigador", daemon=True,
+                             args=(self.lousa.nome, self.comandos, self._parar, sincrono, agente.delay,
+                                   agente.limiar_critico, agente.limiar_preventivo, agente.ultimo_tempo)),
+            contexto.Process(target=_laco_colhedor, name="colhedor", daemon=True,
+                             args=(self.lousa.nome, self.comandos, self._parar, sincrono, tuple(pos_colhedor))),
+        ]
+        for processo in self.processos:
+            processo.start()
+
+    def _registros(self, lista):
+        registros = np.empty(len(lista), dtype=REGISTRO)
+        if self.campo is not None:
+            indices = np.fromiter((p.indice for p in lista), np.int64, len(lista))
+            for nome in ("x", "y", "agua", "maturidade", "morta"):
+                registros[nome] = getattr(self.campo, nome)[indices]
+            registros["indice"] = indices
+        else:
+            registros[:] = [(self._indices[p], p.x, p.y, p.agua, p.maturidade, p.morta) for p in lista]
+        return registros
+
+    def publicar(self):
+        """Publica as listas atuais do sensor, com a água e a maturidade de agora."""
+        return self.lousa.publicar(relogio.agora(), [
+            self._registros(lista) for lista in (sensor.plantas_criticas, sensor.plantas_preventivas,
+                                                 sensor.plantas_maduras, sensor.plantas_mortas)])
+
+    def _recebidos(self):
+        """Comandos já na fila, sem esperar."""
+        while True:
+            try:
+                yield self.comandos.get_nowait()
+            except queue.Empty:
+                return
+
+    def esperar_respostas(self, versao, tempo_limite=30.0):
+        """Bloqueia até cada agente responder à `versao` publicada; devolve os comandos recebidos."""
+        faltam = len(self.processos)
+        recebidos = []
+        while faltam:
+            try:
+                mensagem = self.comandos.get(timeout=1.0)
+            except queue.Empty:
+                tempo_limite -= 1.0
+                mortos = [p.name for p in self.processos if not p.is_alive()]
+                if mortos or tempo_limite <= 0:
+                    raise RuntimeError(f"agentes sem resposta à versão {versao} da lousa: "
+                                       f"{', '.join(mortos) or 'tempo esgotado'}")
+                continue
+            if mensagem[2] == versao:
+                faltam -= 1
+            if mensagem[0] != "nada":
+                recebidos.append(mensagem)
+        # Os dois chegam em qualquer ordem; aplica como os agentes no processo principal: irrigar, depois colher
+        recebidos.sort(key=lambda mensagem: mensagem[0] != "irrigar")
+        return recebidos
+
+    def aplicar_comandos(self, simulacao, comandos=None):
+        """Executa `comandos` (por padrão, os que já chegaram); devolve (irrigações, colhidas, removidas)."""
+        irrigacoes = colhidas = removidas = 0
+        versao = self.lousa.versao
+        for tipo, indice, lida in (self._recebidos() if comandos is None else comandos):
+            planta = self.plantas[indice]
+            if tipo == "irrigar":
+                agente = irrigador.agente_global
+                if planta.coletada or planta.agua >= agente.limiar_preventivo:
+                    self.comandos_recusados += 1
+                    continue
+                if planta.agua < agente.limiar_critico:
+                    agente.contador_emergencia += 1
+                simulacao.pos_irrigador, simulacao.ultima_acao_irrigador = agente.agir(planta)
+                agente.ultimo_tempo = relogio.agora()
+                irrigacoes += 1
+            else:
+                if planta.coletada or not (planta.morta or planta.maturidade >= 100):
+                    self.comandos_recusados += 1
+                    continue
+                simulacao.pos_colhedor, simulacao.ultima_acao_colhedor, colhida, morta = colhedor.colher(planta)
+                colhidas += colhida
+                removidas += morta
+            self.comandos_aplicados += 1
+            self.atraso_total += versao - lida
+        return irrigacoes, colhidas, removidas
+
+    def atraso_medio(self):
+        """Versões publicadas, em média, entre a leitura de um agente e a aplicação do comando."""
+        return self.atraso_total / self.comandos_aplicados if self.comandos_aplicados else 0.0
+
+    def fechar(self):
+        """Para os processos e apaga a lousa; os contadores continuam valendo."""
+        if self._parar.is_set():
+            return
+        self._parar.set()
+        for processo in self.processos:
+            processo.join(5)
+            if processo.is_alive():
+                processo.terminate()
+        self.comandos.close()
+        self.comandos.join_thread()
+        self.lousa.fechar()
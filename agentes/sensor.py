@@ -1,4 +1,5 @@
-import time
+import ambiente
+import relogio
 
 # Cores
 CINZA = (169, 169, 169)
@@ -9,36 +10,230 @@ plantas_preventivas = []
 plantas_maduras = []
 plantas_mortas = []
 
-ultimo_tempo = 0
+ultimo_tempo = float("-inf")  # nenhuma leitura ainda
 delay = 1.0  # segundos
 
-def agir_sensor(plantas):
+# Modo incremental: as categorias persistem entre leituras e cada leitura só
+# reclassifica as plantas que avisaram mudança (ambiente.registrar_observador).
+incremental = True
+
+_monitoradas = None  # lista de plantas acompanhada no modo incremental
+_tamanho = 0
+_membros = set()
+_alteradas = {}  # plantas com mudança desde a última leitura (ordem de chegada)
+_categorias = {
+    "criticas": {},
+    "preventivas": {},
+    "maduras": {},
+    "mortas": {},
+}
+
+# Funções chamadas como leitor(planta, categoria, dentro) quando uma leitura
+# põe (dentro=True) ou tira uma planta de uma das listas publicadas.
+_leitores = []
+
+
+def registrar_leitor(leitor):
+    if leitor not in _leitores:
+        _leitores.append(leitor)
+
+
+def remover_leitor(leitor):
+    if leitor in _leitores:
+        _leitores.remove(leitor)
+
+
+def _avisar(planta, categoria, dentro):
+    for leitor in list(_leitores):
+        leitor(planta, categoria, dentro)
+
+
+def _avisar_troca(categoria, antiga, nova):
+    """Avisa os leitores do que mudou ao trocar a lista `categoria` inteira (fora do modo incremental)."""
+    if not _leitores:
+        return
+    antes, depois = set(antiga), set(nova)
+    for p in antiga:
+        if p not in depois:
+            _avisar(p, categoria, False)
+    for p in nova:
+        if p not in antes:
+            _avisar(p, categoria, True)
+
+
+def _publicar(criticas, preventivas, maduras, mortas):
+    """Troca as quatro listas globais, avisando os leitores."""
+    global plantas_criticas, plantas_preventivas, plantas_maduras, plantas_mortas
+    for categoria, antiga, nova in zip(_categorias, (plantas_criticas, plantas_preventivas, plantas_maduras,
+                                                     plantas_mortas), (criticas, preventivas, maduras, mortas)):
+        _avisar_troca(categoria, antiga, nova)
+    plantas_criticas, plantas_preventivas, plantas_maduras, plantas_mortas = criticas, preventivas, maduras, mortas
+
+
+def configurar(intervalo=1.0, limiar_critico=25, limiar_preventivo=45):
+    """Intervalo entre leituras (s) e faixas de água: críticas < `limiar_critico` <= preventivas < `limiar_preventivo`.
+
+    As faixas ficam em ambiente.LIMIARES_AGUA, que também decide quando as
+    plantas avisam mudança de água; configure antes de criar as plantas (o
+    motor de eventos agenda os cruzamentos ao plantar).
+    """
+    global delay
+    delay = intervalo
+    ambiente.definir_limiares_agua(limiar_critico, limiar_preventivo)
+
+
+def reiniciar():
+    """Descarta as leituras anteriores, como se o sensor acabasse de ligar."""
     global ultimo_tempo
+    _publicar([], [], [], [])
+    ultimo_tempo = float("-inf")
+    _parar_monitoramento()
+
+
+def alteradas_pendentes():
+    """Plantas com mudança ainda não lida, ou None se o sensor não acompanha nenhum campo."""
+    if _monitoradas is None:
+        return None
+    return list(_alteradas)
+
+
+def retomar(plantas, listas, alteradas, tempo):
+    """Recoloca o sensor em um estado salvo.
+
+    `listas` são as quatro listas da última leitura (críticas, preventivas,
+    maduras, mortas) e `alteradas` o resultado de alteradas_pendentes() naquele
+    momento; a próxima leitura continua exatamente de onde a salva parou.
+    """
+    global ultimo_tempo, _monitoradas, _tamanho, _membros
+    reiniciar()
+    _publicar(*(list(l) for l in listas))
+    ultimo_tempo = tempo
+    if not incremental or alteradas is None:
+        return
+    _monitoradas = plantas
+    _tamanho = len(plantas)
+    _membros = set(plantas)
+    ambiente.registrar_observador(_ao_mudar_planta)
+    # Fora de uma leitura, cada categoria tem a mesma ordem da lista correspondente
+    for categoria, lista in zip(_categorias.values(), listas):
+        categoria.update(dict.fromkeys(lista))
+    _alteradas.update(dict.fromkeys(alteradas))
+
+
+def _ao_mudar_planta(planta, evento):
+    if planta in _membros:
+        _alteradas[planta] = None
+
+
+def _parar_monitoramento():
+    global _monitoradas, _tamanho, _membros
+    ambiente.remover_observador(_ao_mudar_planta)
+    _monitoradas = None
+    _tamanho = 0
+    _membros = set()
+    _alteradas.clear()
+    for nome, categoria in _categorias.items():
+        if _leitores:
+            for p in categoria:
+                _avisar(p, nome, False)
+        categoria.clear()
+
+
+def _classificar(p, alteradas):
+    """Coloca `p` nas categorias certas e anota em `alteradas` as que mudaram."""
+    ativa = not p.coletada
+    critico, preventivo = ambiente.LIMIARES_AGUA
+    pertence = {
+        "criticas": ativa and p.agua < critico,
+        "preventivas": ativa and critico <= p.agua < preventivo,
+        "maduras": ativa and p.maturidade >= 100 and not p.morta,
+        "mortas": ativa and p.morta,
+    }
+    for nome, dentro in pertence.items():
+        categoria = _categorias[nome]
+        if dentro != (p in categoria):
+            if dentro:
+                categoria[p] = None
+            else:
+                del categoria[p]
+            alteradas.add(nome)
+            if _leitores:
+                _avisar(p, nome, dentro)
+
+
+def tem_leitura_pendente(plantas):
+    """False se uma leitura agora não mudaria nenhuma lista (modo incremental, nada alterado)."""
+    return not incremental or plantas is not _monitoradas or len(plantas) != _tamanho or bool(_alteradas)
+
+
+def _ler_incremental(plantas):
+    """Atualiza as categorias em O(mudanças); só refaz a varredura se o campo mudar."""
+    global _monitoradas, _tamanho, _membros
     global plantas_criticas, plantas_preventivas, plantas_maduras, plantas_mortas
 
-    agora = time.time()
+    alteradas = set()
+    if plantas is not _monitoradas or len(plantas) != _tamanho:
+        _parar_monitoramento()
+        _monitoradas = plantas
+        _tamanho = len(plantas)
+        _membros = set(plantas)
+        ambiente.registrar_observador(_ao_mudar_planta)
+        for p in plantas:
+            _classificar(p, alteradas)
+        alteradas.update(_categorias)
+    else:
+        for p in _alteradas:
+            _classificar(p, alteradas)
+    _alteradas.clear()
+
+    # As listas globais lidas pelos outros agentes só são refeitas se mudaram
+    if "criticas" in alteradas:
+        plantas_criticas = list(_categorias["criticas"])
+    if "preventivas" in alteradas:
+        plantas_preventivas = list(_categorias["preventivas"])
+    if "maduras" in alteradas:
+        plantas_maduras = list(_categorias["maduras"])
+    if "mortas" in alteradas:
+        plantas_mortas = list(_categorias["mortas"])
+
+
+def agir_sensor(plantas):
+    global ultimo_tempo
+
+    agora = relogio.agora()
     if agora - ultimo_tempo < delay:
         return "Aguardando leitura..."
 
-    # Limpa listas anteriores
-    plantas_criticas = []
-    plantas_preventivas = []
-    plantas_maduras = []
-    plantas_mortas = []
+    if incremental:
+        _ler_incremental(plantas)
+        ultimo_tempo = agora
+        return _resumo()
+
+    # Listas novas a cada leitura
+    criticas = []
+    preventivas = []
+    maduras = []
+    mortas = []
 
+    critico, preventivo = ambiente.LIMIARES_AGUA
     for p in plantas:
         if not p.coletada:
-            if p.agua < 25:
-                plantas_criticas.append(p)
-            elif p.agua < 45:
-                plantas_preventivas.append(p)
+            if p.agua < critico:
+                criticas.append(p)
+            elif p.agua < preventivo:
+                preventivas.append(p)
 
             if p.maturidade >= 100 and not p.morta:
-                plantas_maduras.append(p)
+                maduras.append(p)
             if p.morta:
-                plantas_mortas.append(p)
+                mortas.append(p)
 
+    _publicar(criticas, preventivas, maduras, mortas)
     ultimo_tempo = agora
 
+    return _resumo()
+
+
+def _resumo():
     return f"Irrigação → Críticas: {len(plantas_criticas)}, Preventivas: {len(plantas_preventivas)} | " \
            f"Colheita → Maduras: {len(plantas_maduras)}, Mortas: {len(plantas_mortas)}"
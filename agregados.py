@@ -0,0 +1,152 @@
+"""Totais da fazenda mantidos por diferenças, para o HUD e os relatórios lerem em O(1).
+
+`Agregados` guarda as contagens (vivas, coletadas, mortas, críticas, maduras)
+e as somas de água e maturidade das plantas vivas. Quem muda uma planta chama
+`retirar(planta)` antes e `incluir(planta)` depois (`Planta.atualizar`,
+`resetar`, `irrigar` e `colhedor.colher` já fazem isso quando a planta tem
+`agregados`), então cada mudança custa uma planta, não a fazenda inteira.
+
+No `Campo` o passo muda todas as plantas vivas de uma vez: os totais são
+refeitos ali mesmo com somas NumPy (`contar`), e as leituras continuam O(1).
+Plantas com `agregavel = False` (motor de eventos) não são acompanhadas; a
+simulação recai na recontagem completa.
+
+Com `conferir=True`, cada leitura (e cada passo da `Simulacao`) refaz a
+contagem do zero e levanta AssertionError se os totais divergirem (modo de
+depuração, O(n) por leitura).
+"""
+import numpy as np
+
+import ambiente
+
+CAMPOS = ("vivas", "coletadas", "mortas", "criticas", "maduras", "soma_agua", "soma_maturidade")
+
+
+def contar(c, selecao=slice(None), limiares=None):
+    """Totais (na ordem de `CAMPOS`) das linhas `selecao` de um `Campo` ou objeto com as mesmas colunas.
+
+    `limiares` substitui ambiente.LIMIARES_AGUA (para quem conta em outro processo).
+    """
+    critico = (limiares if limiares is not None else ambiente.LIMIARES_AGUA)[0]
+    morta = np.atleast_1d(c.morta[selecao])
+    coletada = np.atleast_1d(c.coletada[selecao])
+    vivas = ~(morta | coletada)
+    agua = np.atleast_1d(c.agua[selecao])[vivas]
+    maturidade = np.atleast_1d(c.maturidade[selecao])[vivas]
+    return np.array([
+        np.count_nonzero(vivas), np.count_nonzero(coletada), np.count_nonzero(morta),
+        np.count_nonzero(agua < critico), np.count_nonzero(maturidade >= 100),
+        agua.sum(), maturidade.sum(),
+    ])
+
+
+class Agregados:
+    """Contagens e somas das plantas de uma simulação, atualizadas a cada mudança."""
+
+    def __init__(self, plantas, campo=None, conferir=False):
+        self.plantas = plantas
+        self.campo = campo
+        self.conferir = conferir
+        self.total = len(plantas)
+        self.recontar()
+
+    @classmethod
+    def acompanhar(cls, plantas, campo=None, conferir=False):
+        """Cria os agregados e os liga às plantas (ou ao campo); None se as plantas não permitem."""
+        if campo is None and plantas and not all(p.agregavel for p in plantas):
+            return None
+        agregados = cls(plantas, campo, conferir)
+        if campo is not None:
+            campo.agregados = agregados
+        else:
+            for planta in plantas:
+                planta.agregados = agregados
+        return agregados
+
+    def desligar(self):
+        """Solta as plantas (ou o campo), que voltam a mudar sem avisar ninguém."""
+        if self.campo is not None:
+            if self.campo.agregados is self:
+                self.campo.agregados = None
+        else:
+            for planta in self.plantas:
+                if planta.__dict__.get("agregados") is self:
+                    del planta.agregados
+
+    def _contar_tudo(self):
+        if self.campo is not None:
+            return contar(self.campo)
+        # Mesma conta de incluir(), planta a planta, sobre totais zerados
+        totais = Agregados.__new__(Agregados)
+        totais.definir(np.zeros(len(CAMPOS)))
+        for planta in self.plantas:
+            totais.incluir(planta)
+        return totais.valores()
+
+    def recontar(self):
+        """Refaz os totais do zero (depois de mudanças feitas por fora, como restaurar um ponto)."""
+        self.definir(self._contar_tudo())
+
+    def definir(self, valores):
+        """Troca os totais pelos `valores`, na ordem de `CAMPOS`."""
+        self.vivas, self.coletadas, self.mortas, self.criticas, self.maduras = (int(v) for v in valores[:5])
+        self.soma_agua, self.soma_maturidade = float(valores[5]), float(valores[6])
+
+    def valores(self):
+        """Os totais na ordem de `CAMPOS`, como array."""
+        return np.array([getattr(self, nome) for nome in CAMPOS], dtype=float)
+
+    def ajustar(self, diferenca):
+        """Soma `diferenca` (na ordem de `CAMPOS`) aos totais."""
+        self.definir(self.valores() + diferenca)
+
+    def _somar(self, planta, sinal):
+        if planta.coletada:
+            self.coletadas += sinal
+        if planta.morta:
+            self.mortas += sinal
+        elif not planta.coletada:
+            agua, maturidade = planta.agua, planta.maturidade
+            self.vivas += sinal
+            self.soma_agua += sinal * agua
+            self.soma_maturidade += sinal * maturidade
+            if agua < ambiente.LIMIARES_AGUA[0]:  # crítica: mesmo limiar do sensor
+                self.criticas += sinal
+            if maturidade >= 100:
+                self.maduras += sinal
+
+    def retirar(self, planta):
+        """Tira a contribuição atual de `planta`; chamar antes de mudá-la."""
+        self._somar(planta, -1)
+
+    def incluir(self, planta):
+        """Soma a contribuição atual de `planta`; chamar depois de mudá-la."""
+        self._somar(planta, 1)
+
+    def verificar(self):
+        """Compara com uma recontagem completa; AssertionError com as diferenças."""
+        esperado = self._contar_tudo()
+        diferencas = []
+        for nome, valor in zip(CAMPOS, esperado):
+            atual = getattr(self, nome)
+            # As somas acumulam arredondamento a cada diferença
+            if abs(atual - valor) > 1e-6 * max(1.0, abs(valor)):
+                diferencas.append(f"{nome}: {atual} (recontagem: {valor})")
+        if diferencas:
+            raise AssertionError("agregados divergem da recontagem: " + "; ".join(diferencas))
+
+    def resumo(self):
+        """(total, vivas, colhidas, mortas, água média, maturidade média), como visual.resumo_estatisticas."""
+        if self.conferir:
+            self.verificar()
+        vivas = self.vivas
+        if vivas > 0:
+            return (self.total, vivas, self.coletadas, self.mortas,
+                    self.soma_agua / vivas, self.soma_maturidade / vivas)
+        return self.total, vivas, self.coletadas, self.mortas, 0, 0
+
+    def contagens(self):
+        """Dicionário com todos os totais de `CAMPOS`."""
+        if self.conferir:
+            self.verificar()
+        return {nome: getattr(self, nome) for nome in CAMPOS}
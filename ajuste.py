@@ -0,0 +1,175 @@
+"""Ajusta limiares e intervalos do sensor e do irrigador por halving sucessivo, em paralelo.
+
+Sorteia `--candidatos` combinações de parâmetros (mais a configuração padrão)
+e avalia todas com poucos episódios sem interface, nos processos do pool de
+lote.py. A cada rodada só o melhor terço (1/`--eta`) segue, com `--eta` vezes
+mais episódios; as demais param ali. Todos os candidatos de uma rodada usam os
+mesmos episódios (mesmas sementes), então a comparação é pareada. A
+configuração padrão é sempre avaliada junto, como referência.
+
+O critério é a taxa de sucesso média (colhidas / (colhidas + mortas)); empates
+vão para quem colheu mais. `--consumo MIN MAX` troca a faixa de
+`fator_consumo` das plantas, para reajustar quando a lavoura muda.
+
+Uso: python ajuste.py --candidatos 27 --ciclos 21600 --consumo 0.5 1.5 --saida melhores.json
+     python lote.py --parametros melhores.json --consumo 0.5 1.5   # confere com mais episódios
+"""
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+from lote import executar_episodio, resumir, semente_do_episodio
+
+# Configuração escolhida à mão, a referência de todo ajuste
+PADRAO = {
+    "sensor": {"intervalo": 1.0, "limiar_critico": 25, "limiar_preventivo": 45},
+    "irrigador": {"delay": 0.3, "limiar_critico": 25, "limiar_preventivo": 45, "quantidade_agua": 70},
+}
+
+
+def _log_uniforme(rng, minimo, maximo):
+    return round(math.exp(rng.uniform(math.log(minimo), math.log(maximo))), 3)
+
+
+def sortear(rng, motor="ciclos"):
+    """Uma combinação aleatória de parâmetros, no formato de `PADRAO`."""
+    critico = rng.randint(10, 40)
+    sensor = {"intervalo": _log_uniforme(rng, 0.1, 5.0), "limiar_critico": critico,
+              "limiar_preventivo": rng.randint(critico + 5, 75)}
+    critico = rng.randint(10, 40)
+    irrigador = {"delay": _log_uniforme(rng, 0.05, 2.0), "limiar_critico": critico,
+                 "limiar_preventivo": rng.randint(critico + 5, 75), "quantidade_agua": rng.randint(20, 100)}
+    if motor == "eventos":
+        # O motor de eventos exige o limiar preventivo do irrigador entre os do sensor
+        irrigador["limiar_preventivo"] = sensor["limiar_preventivo"]
+        irrigador["limiar_critico"] = min(irrigador["limiar_critico"], sensor["limiar_preventivo"] - 1)
+    return {"sensor": sensor, "irrigador": irrigador}
+
+
+def formatar(parametros):
+    """Parâmetros em uma linha: sensor intervalo=1.0 critico=25 ... | irrigador ..."""
+    partes = []
+    for agente, valores in parametros.items():
+        texto = " ".join(f"{nome.replace('limiar_', '')}={valor}" for nome, valor in valores.items())
+        partes.append(f"{agente} {texto}")
+    return " | ".join(partes)
+
+
+def pontuar(resultados):
+    """(taxa de sucesso média, colhidas médias) dos episódios; episódios sem colheita nem morte não contam."""
+    taxa = resumir([r["taxa_sucesso"] for r in resultados])["media"]
+    colhidas = resumir([r["colhidas"] for r in resultados])["media"]
+    return (taxa if taxa is not None else -1.0, colhidas or 0.0)
+
+
+def _avaliar(tarefa):
+    """Roda um episódio de um candidato; executado nos processos do pool."""
+    indice, episodio = tarefa
+    return indice, executar_episodio(episodio)
+
+
+def ajustar(config, candidatos=27, eta=3, episodios=2, processos=None, semente=0, ao_terminar_rodada=None):
+    """Halving sucessivo sobre `candidatos` combinações; devolve os candidatos do melhor para o pior.
+
+    `config` é a configuração de lote.executar_episodio (sem "parametros").
+    Cada candidato é um dicionário com "parametros", "resultados" (um por
+    episódio), "pontuacao" e "rodada" (a última rodada em que foi avaliado);
+    o primeiro sorteado é o `PADRAO`.
+    `ao_terminar_rodada(rodada, vivos, episodios, segundos)` é chamada ao fim de cada rodada.
+    """
+    rng = random.Random(semente)
+    motor = config.get("motor", "ciclos")
+    todos = [{"parametros": PADRAO if i == 0 else sortear(rng, motor), "resultados": [], "pontuacao": None,
+              "rodada": 0} for i in range(candidatos + 1)]
+    referencia = todos[0]
+    vivos = list(todos)
+    rodada = 0
+    with multiprocessing.Pool(processos) as pool:
+        while True:
+            rodada += 1
+            inicio = time.perf_counter()
+            # A referência roda sempre, mesmo eliminada, com os mesmos episódios dos vivos
+            avaliados = vivos if any(c is referencia for c in vivos) else vivos + [referencia]
+            tarefas = [(i, (e, semente_do_episodio(semente, e), dict(config, parametros=todos[i]["parametros"])))
+                       for i, candidato in enumerate(todos) if any(c is candidato for c in avaliados)
+                       for e in range(len(candidato["resultados"]), episodios)]
+            for i, resultado in pool.imap_unordered(_avaliar, tarefas, chunksize=1):
+                todos[i]["resultados"].append(resultado)
+            for candidato in avaliados:
+                candidato["pontuacao"] = pontuar(candidato["resultados"])
+                candidato["rodada"] = rodada
+            vivos.sort(key=lambda c: c["pontuacao"], reverse=True)
+            if ao_terminar_rodada is not None:
+                ao_terminar_rodada(rodada, vivos, episodios, time.perf_counter() - inicio)
+            if len(vivos) == 1:
+                break
+            vivos = vivos[:max(1, len(vivos) // eta)]
+            episodios *= eta
+    return sorted(todos, key=lambda c: (c["rodada"], c["pontuacao"]), reverse=True)
+
+
+def _linha(rotulo, candidato):
+    taxa = resumir([r["taxa_sucesso"] for r in candidato["resultados"]])
+    colhidas = resumir([r["colhidas"] for r in candidato["resultados"]])["media"]
+    margem = taxa["ic"][1] - taxa["media"] if taxa["n"] else math.nan
+    media = taxa["media"] if taxa["n"] else math.nan
+    return (f"{rotulo:<7} {media:6.2f}% ± {margem:.2f} ({len(candidato['resultados'])} ep., "
+            f"{colhidas:.1f} colhidas, rodada {candidato['rodada']})  {formatar(candidato['parametros'])}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--candidatos", type=int, default=27, help="combinações sorteadas (além da padrão)")
+    parser.add_argument("--eta", type=int, default=3, help="a cada rodada segue 1/eta, com eta vezes mais episódios")
+    parser.add_argument("--episodios", type=int, default=2, help="episódios por candidato na primeira rodada")
+    parser.add_argument("--ciclos", type=int, default=12 * 1800, help="ciclos por episódio (12 = 1 s simulado)")
+    parser.add_argument("--plantas", type=int, default=20)
+    parser.add_argument("--motor", choices=("ciclos", "vetorizado", "eventos"), default="ciclos")
+    parser.add_argument("--consumo", type=float, nargs=2, metavar=("MIN", "MAX"), default=None,
+                        help="faixa do fator_consumo sorteado para as plantas (padrão: 0.3 1.0)")
+    parser.add_argument("--processos", type=int, default=None, help="padrão: todos os núcleos")
+    parser.add_argument("--semente", type=int, default=0, help="semente do sorteio e dos episódios")
+    parser.add_argument("--saida", metavar="ARQUIVO", default=None,
+                        help="grava a melhor configuração em JSON (use com python lote.py --parametros)")
+    args = parser.parse_args(argv)
+    if args.candidatos < 1 or args.eta < 2 or args.episodios < 1:
+        parser.error("use --candidatos >= 1, --eta >= 2 e --episodios >= 1")
+
+    config = {"ciclos": args.ciclos, "plantas": args.plantas, "irrigador": "limiar", "colhedor": "proximidade",
+              "motor": args.motor, "consumo": args.consumo}
+    processos = args.processos or os.cpu_count()
+    print(f"{args.candidatos} candidatos + padrão, episódios de {args.ciclos} ciclos, em {processos} processos...")
+
+    def rodada_concluida(rodada, vivos, episodios, segundos):
+        taxa, _ = vivos[0]["pontuacao"]
+        print(f"  rodada {rodada}: {len(vivos)} candidato(s) × {episodios} episódio(s) em {segundos:.1f}s; "
+              f"melhor {taxa:.2f}%", file=sys.stderr)
+
+    inicio = time.perf_counter()
+    ranking = ajustar(config, args.candidatos, args.eta, args.episodios, processos, args.semente, rodada_concluida)
+    print(f"Concluído em {time.perf_counter() - inicio:.1f}s")
+
+    print("=" * 50)
+    for posicao, candidato in enumerate(ranking[:5], 1):
+        print(_linha("padrão" if candidato["parametros"] is PADRAO else f"{posicao}.", candidato))
+    if not any(c["parametros"] is PADRAO for c in ranking[:5]):
+        print(_linha("padrão", next(c for c in ranking if c["parametros"] is PADRAO)))
+    print("=" * 50)
+
+    melhor = ranking[0]
+    if args.saida:
+        taxa = resumir([r["taxa_sucesso"] for r in melhor["resultados"]])
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            json.dump({"parametros": melhor["parametros"], "taxa_sucesso": taxa["media"], "ic": taxa["ic"],
+                       "episodios": len(melhor["resultados"]), "config": config}, arquivo, indent=2)
+            arquivo.write("\n")
+        print(f"Melhor configuração gravada em {args.saida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,30 +1,85 @@
 import random
 
+# Funções chamadas como observador(planta, evento) quando uma planta muda de estado.
+# Eventos: "madura", "morta", "resetada", "irrigada" e "agua" (cruzou um dos
+# LIMIARES_AGUA ao consumir água).
+_observadores = []
+
+# Faixas de água usadas pelo sensor (crítica < 25, preventiva < 45)
+LIMIARES_AGUA = (25, 45)
+
+# Faixa do consumo de água por ciclo sorteado para cada planta (o tipo de lavoura)
+FAIXA_CONSUMO = (0.3, 1.0)
+
+def definir_limiares_agua(critico=25, preventivo=45):
+    """Troca as faixas de água do sensor; valem para as plantas e campos criados depois."""
+    global LIMIARES_AGUA
+    if not 0 < critico < preventivo:
+        raise ValueError(f"limiares de água inválidos: {critico}, {preventivo}")
+    LIMIARES_AGUA = (critico, preventivo)
+
+def definir_faixa_consumo(minimo=0.3, maximo=1.0):
+    """Troca a faixa de `fator_consumo` sorteada ao plantar (e replantar)."""
+    global FAIXA_CONSUMO
+    if not 0 < minimo <= maximo:
+        raise ValueError(f"faixa de consumo inválida: {minimo}, {maximo}")
+    FAIXA_CONSUMO = (minimo, maximo)
+
+def registrar_observador(observador):
+    """Passa a avisar `observador` sobre as mudanças de estado das plantas."""
+    _observadores.append(observador)
+
+def remover_observador(observador):
+    if observador in _observadores:
+        _observadores.remove(observador)
+
+def notificar(planta, evento):
+    for observador in _observadores:
+        observador(planta, evento)
+
 class Planta:
-    def __init__(self, x, y):
+    # agregados.Agregados que acompanha esta planta (None: nenhum). As mudanças
+    # passam por ele em pares retirar/incluir, e os totais ficam em dia sem recontar.
+    agregados = None
+    agregavel = True  # False em plantas cujo estado muda sem passar pelos métodos abaixo
+
+    def __init__(self, x, y, rng=None):
         self.x, self.y = x, y
+        self.rng = rng if rng is not None else random  # gerador próprio permite reproduzir a execução
         self.resetar()
 
     def resetar(self):
         """Reinicia atributos da planta."""
-        self.maturidade = random.uniform(0, 20)  # Começa variada
-        self.agua = random.uniform(40, 70)       # Começa variada
+        agregados = self.agregados
+        if agregados is not None:
+            agregados.retirar(self)
+        rng = self.rng
+        self.maturidade = rng.uniform(0, 20)  # Começa variada
+        self.agua = rng.uniform(40, 70)       # Começa variada
         self.coletada = False
         self.morta = False
-        self.fator_crescimento = random.uniform(0.2, 1.0)  # crescimento mais suave
-        self.fator_consumo = random.uniform(0.3, 1.0)
+        self.fator_crescimento = rng.uniform(0.2, 1.0)  # crescimento mais suave
+        self.fator_consumo = rng.uniform(*FAIXA_CONSUMO)
         self.tempo_madura_cheia = 0
-        self.limite_tempo_madura_cheia = random.randint(10, 20)  # limite aleatório
+        self.limite_tempo_madura_cheia = rng.randint(10, 20)  # limite aleatório
+        if agregados is not None:
+            agregados.incluir(self)
+        if _observadores:
+            notificar(self, "resetada")
 
     def atualizar(self):
         """Atualiza estado da planta a cada ciclo."""
         if self.morta or self.coletada:
             return
+        agregados = self.agregados
+        if agregados is not None:
+            agregados.retirar(self)
 
         if self.agua > 0:
             # Crescimento
             self.maturidade = min(100, self.maturidade + self.fator_crescimento)
             # Consumo de água
+            agua_antes = self.agua
             self.agua = max(0, self.agua - self.fator_consumo)
 
             if self.maturidade >= 100:
@@ -33,8 +88,39 @@ class Planta:
                     self.morta = True
             else:
                 self.tempo_madura_cheia = 0
+
+            if agregados is not None:
+                agregados.incluir(self)
+            if _observadores:
+                self._avisar_ciclo(agua_antes)
         else:
             self.morta = True
+            if agregados is not None:
+                agregados.incluir(self)
+            if _observadores:
+                notificar(self, "morta")
+
+    def _avisar_ciclo(self, agua_antes):
+        """Avisa o que mudou no ciclo, já com o estado final da planta."""
+        for limiar in LIMIARES_AGUA:
+            if self.agua < limiar <= agua_antes:
+                notificar(self, "agua")
+                break
+        if self.tempo_madura_cheia == 1:
+            notificar(self, "madura")
+        if self.morta:
+            notificar(self, "morta")
+
+    def irrigar(self, quantidade):
+        """Adiciona água à planta."""
+        agregados = self.agregados
+        if agregados is not None:
+            agregados.retirar(self)
+        self.agua += quantidade
+        if agregados is not None:
+            agregados.incluir(self)
+        if _observadores:
+            notificar(self, "irrigada")
 
     def esta_madura(self):
         """Retorna True se planta está pronta para colher."""
@@ -0,0 +1,76 @@
+"""Compara o passo vetorizado do `Campo` com a lista de objetos `Planta`.
+
+Uso: python benchmarks/bench_campo.py [--tamanhos 20 10000 1000000] [--ciclos 20]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ambiente import Planta  # noqa: E402
+from campo import Campo  # noqa: E402
+
+ATRIBUTOS = (
+    "maturidade", "agua", "fator_crescimento", "fator_consumo",
+    "tempo_madura_cheia", "limite_tempo_madura_cheia", "coletada", "morta",
+)
+
+
+def copiar_para_objetos(campo):
+    """Cria objetos `Planta` com exatamente o mesmo estado das linhas do campo."""
+    colunas = {nome: getattr(campo, nome).tolist() for nome in ("x", "y") + ATRIBUTOS}
+    plantas = []
+    for i in range(len(campo)):
+        planta = Planta.__new__(Planta)
+        for nome, valores in colunas.items():
+            setattr(planta, nome, valores[i])
+        plantas.append(planta)
+    return plantas
+
+
+def conferir(campo, plantas):
+    """Garante que os dois caminhos chegaram ao mesmo estado."""
+    for nome in ATRIBUTOS:
+        esperado = np.array([getattr(p, nome) for p in plantas], dtype=getattr(campo, nome).dtype)
+        if not np.array_equal(getattr(campo, nome), esperado):
+            raise AssertionError(f"Divergência no atributo {nome}")
+
+
+def medir(tamanho, ciclos):
+    campo = Campo.em_grade(tamanho, semente=tamanho)
+    plantas = copiar_para_objetos(campo)
+
+    inicio = time.perf_counter()
+    for _ in range(ciclos):
+        for planta in plantas:
+            planta.atualizar()
+    tempo_objetos = (time.perf_counter() - inicio) / ciclos
+
+    inicio = time.perf_counter()
+    for _ in range(ciclos):
+        campo.passo()
+    tempo_campo = (time.perf_counter() - inicio) / ciclos
+
+    conferir(campo, plantas)
+    return tempo_objetos, tempo_campo
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[20, 10_000, 1_000_000])
+    parser.add_argument("--ciclos", type=int, default=20, help="ciclos medidos por tamanho")
+    args = parser.parse_args(argv)
+
+    print(f"{'plantas':>10} {'objetos (ms/ciclo)':>20} {'campo (ms/ciclo)':>18} {'ganho':>8}")
+    for tamanho in args.tamanhos:
+        tempo_objetos, tempo_campo = medir(tamanho, args.ciclos)
+        print(f"{tamanho:>10} {tempo_objetos * 1e3:>20.3f} {tempo_campo * 1e3:>18.3f} "
+              f"{tempo_objetos / tempo_campo:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
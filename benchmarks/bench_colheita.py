@@ -0,0 +1,75 @@
+"""Compara as políticas do colhedor: taxa de sucesso e tempo de CPU por chamada.
+
+Políticas (todas escolhem entre as maduras e mortas da última leitura do sensor):
+  gulosa     - madura mais próxima, varrendo as listas do sensor (original)
+  indexada   - madura mais próxima, pelo índice espacial
+  prazo      - madura com menor folga até morrer, distância como desempate
+
+Uso: python benchmarks/bench_colheita.py [--plantas 100 300] [--ciclos 12000] [--delay 0.25]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agentes import colhedor  # noqa: E402
+from simulacao import Simulacao, criar_plantas, executar_sem_interface  # noqa: E402
+
+POLITICAS = {
+    "gulosa": dict(),
+    "indexada": dict(colhedor_indexado=True),
+    "prazo": dict(politica_colhedor="prazo"),
+}
+
+
+def executar(politica, plantas, ciclos, delay, semente):
+    random.seed(semente)
+    simulacao = Simulacao(criar_plantas(plantas), modo_irrigador="prazo", **POLITICAS[politica])
+
+    # Mede só o tempo de CPU gasto dentro de agir_colhedor
+    original = colhedor.agir_colhedor
+    medidas = {"chamadas": 0, "cpu": 0.0}
+
+    def medido(*args):
+        inicio = time.process_time()
+        try:
+            return original(*args)
+        finally:
+            medidas["cpu"] += time.process_time() - inicio
+            medidas["chamadas"] += 1
+
+    colhedor.agir_colhedor = medido
+    delay_original = colhedor.delay
+    colhedor.delay = delay
+    try:
+        executar_sem_interface(ciclos, simulacao)
+    finally:
+        colhedor.agir_colhedor = original
+        colhedor.delay = delay_original
+
+    finalizadas = simulacao.plantas_colhidas + simulacao.plantas_mortas
+    taxa = simulacao.plantas_colhidas / finalizadas * 100 if finalizadas else 0.0
+    return taxa, simulacao.plantas_colhidas, simulacao.plantas_mortas, medidas["cpu"] / max(medidas["chamadas"], 1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--plantas", type=int, nargs="+", default=[100, 300])
+    parser.add_argument("--ciclos", type=int, default=12_000)
+    parser.add_argument("--delay", type=float, default=0.25,
+                        help="intervalo do colhedor em segundos (maior = colhedor mais sobrecarregado)")
+    parser.add_argument("--semente", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(f"{'plantas':>8} {'política':>10} {'sucesso':>8} {'colhidas':>9} {'mortas':>7} {'µs/chamada':>11}")
+    for plantas in args.plantas:
+        for politica in POLITICAS:
+            taxa, colhidas, mortas, cpu = executar(politica, plantas, args.ciclos, args.delay, args.semente)
+            print(f"{plantas:>8} {politica:>10} {taxa:>7.1f}% {colhidas:>9} {mortas:>7} {cpu * 1e6:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Confere o motor de eventos contra o laço ciclo a ciclo e compara os tempos.
+
+Os dois caminhos partem da mesma semente; colhidas e mortas precisam bater e
+o estado final das plantas só pode diferir no arredondamento.
+
+Uso: python benchmarks/bench_eventos.py [--plantas 3 20 200] [--ciclos 12000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from eventos import MotorEventos, executar_por_eventos  # noqa: E402
+from simulacao import Simulacao, criar_plantas, executar_sem_interface  # noqa: E402
+
+
+def comparar(plantas, ciclos, semente, modo_irrigador, politica_colhedor):
+    opcoes = dict(modo_irrigador=modo_irrigador, politica_colhedor=politica_colhedor)
+
+    random.seed(semente)
+    inicio = time.perf_counter()
+    por_ciclo = executar_sem_interface(ciclos, Simulacao(criar_plantas(plantas), **opcoes))
+    tempo_ciclos = time.perf_counter() - inicio
+
+    random.seed(semente)
+    inicio = time.perf_counter()
+    motor = MotorEventos.em_grade(plantas)
+    por_evento = executar_por_eventos(ciclos, motor, Simulacao(motor.plantas, **opcoes))
+    tempo_eventos = time.perf_counter() - inicio
+
+    contadores = (por_ciclo.plantas_colhidas, por_ciclo.plantas_mortas)
+    if contadores != (por_evento.plantas_colhidas, por_evento.plantas_mortas):
+        raise AssertionError(f"Contadores divergem: {contadores} != "
+                             f"{(por_evento.plantas_colhidas, por_evento.plantas_mortas)}")
+    diferenca = max(abs(p.agua - q.agua) + abs(p.maturidade - q.maturidade)
+                    for p, q in zip(por_ciclo.plantas, por_evento.plantas))
+    if diferenca > 1e-6:
+        raise AssertionError(f"Estado final diverge em {diferenca}")
+    return contadores, tempo_ciclos, tempo_eventos
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--plantas", type=int, nargs="+", default=[3, 20, 200])
+    parser.add_argument("--ciclos", type=int, default=12_000)
+    parser.add_argument("--semente", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    print(f"{'plantas':>8} {'irrigador':>9} {'colhedor':>11} {'colhidas/mortas':>16} "
+          f"{'ciclos (s)':>11} {'eventos (s)':>12}")
+    for plantas in args.plantas:
+        for modo_irrigador in ("limiar", "prazo"):
+            for politica_colhedor in ("proximidade", "prazo"):
+                contadores, tempo_ciclos, tempo_eventos = comparar(
+                    plantas, args.ciclos, args.semente, modo_irrigador, politica_colhedor
+                )
+                print(f"{plantas:>8} {modo_irrigador:>9} {politica_colhedor:>11} "
+                      f"{'%d/%d' % contadores:>16} {tempo_ciclos:>11.2f} {tempo_eventos:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Escala da frota: custo do despacho e taxa de sucesso conforme crescem agentes e plantas.
+
+Para cada combinação de plantas e agentes (o mesmo número de irrigadores e de
+colhedores), roda a simulação vetorizada com o despacho húngaro e com o guloso
+(cada agente pega o seu melhor alvo livre) e mostra o tempo médio de uma
+decisão, o tempo por ciclo, colhidas, mortas e a taxa de sucesso.
+
+Uso: python benchmarks/bench_frota.py [--plantas 200 2000 20000] [--agentes 1 4 16 64] [--ciclos 3600]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import relogio  # noqa: E402
+from campo import Campo  # noqa: E402
+from simulacao import Simulacao, executar_sem_interface  # noqa: E402
+
+
+def medir(plantas, agentes, despacho, ciclos, semente):
+    simulacao = Simulacao(campo=Campo.em_grade(plantas, semente=semente),
+                          irrigadores=agentes, colhedores=agentes, despacho=despacho)
+    inicio = time.perf_counter()
+    executar_sem_interface(ciclos, simulacao, relogio.RelogioVirtual())
+    total = time.perf_counter() - inicio
+
+    frota = simulacao.frota
+    colhidas, mortas = simulacao.plantas_colhidas, simulacao.plantas_mortas
+    return {
+        "decisao_ms": frota.tempo_despacho / frota.despachos * 1e3 if frota.despachos else 0.0,
+        "despacho_ms_ciclo": frota.tempo_despacho / ciclos * 1e3,
+        "ciclo_ms": total / ciclos * 1e3,
+        "colhidas": colhidas,
+        "mortas": mortas,
+        "sucesso": colhidas / (colhidas + mortas) * 100 if colhidas + mortas else 0.0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--plantas", type=int, nargs="+", default=[200, 2_000, 20_000])
+    parser.add_argument("--agentes", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--ciclos", type=int, default=12 * 300, help="ciclos por medida (12 = 1 s simulado)")
+    parser.add_argument("--semente", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(f"{'plantas':>8} {'agentes':>8} {'despacho':>9} {'ms/decisão':>11} {'despacho ms/ciclo':>18} "
+          f"{'ms/ciclo':>9} {'colhidas':>9} {'mortas':>8} {'sucesso':>8}")
+    for plantas in args.plantas:
+        for agentes in args.agentes:
+            for despacho in ("hungaro", "guloso"):
+                r = medir(plantas, agentes, despacho, args.ciclos, args.semente)
+                print(f"{plantas:>8} {agentes:>8} {despacho:>9} {r['decisao_ms']:>11.3f} "
+                      f"{r['despacho_ms_ciclo']:>18.3f} {r['ciclo_ms']:>9.3f} {r['colhidas']:>9} "
+                      f"{r['mortas']:>8} {r['sucesso']:>7.1f}%")
+
+
+if __name__ == "__main__":
+    main()
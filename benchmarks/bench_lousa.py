@@ -0,0 +1,98 @@
+"""Custo de publicar e ler a lousa e teste de leituras rasgadas com um leitor em outro processo.
+
+Para cada tamanho, mede publicar e ler (cópia) uma leitura com esse número de
+registros. Depois, um processo lê sem parar enquanto o principal publica
+versões cujos registros trazem todos o número da versão; qualquer registro
+de outra versão numa mesma leitura conta como leitura rasgada.
+
+Uso: python benchmarks/bench_lousa.py [--tamanhos 100 10000 1000000] [--segundos 3]
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agentes.lousa import REGISTRO, Lousa  # noqa: E402
+
+
+def grupos_da_versao(versao, tamanho):
+    """Quatro categorias de tamanhos variados, com todos os campos iguais à versão."""
+    total = tamanho - versao % 7
+    partes = np.array_split(np.full(total, versao, dtype=np.int64), 4)
+    grupos = []
+    for parte in partes:
+        grupo = np.zeros(len(parte), dtype=REGISTRO)
+        grupo["indice"] = parte
+        grupo["agua"] = parte
+        grupos.append(grupo)
+    return grupos
+
+
+def ler_sem_parar(nome, parar, resultado):
+    lousa = Lousa.abrir(nome)
+    leituras = rasgadas = 0
+    versao = 0
+    while not parar.is_set():
+        leitura = lousa.ler(versao)
+        if leitura is None:
+            continue
+        versao = leitura.versao
+        leituras += 1
+        registros = np.concatenate(leitura[2:])
+        if not (np.all(registros["indice"] == versao) and np.all(registros["agua"] == versao)):
+            rasgadas += 1
+    resultado.put((leituras, rasgadas, lousa.tentativas))
+    lousa.fechar()
+
+
+def cronometrar(funcao, repeticoes):
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        funcao()
+    return (time.perf_counter() - inicio) / repeticoes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[100, 10_000, 1_000_000])
+    parser.add_argument("--segundos", type=float, default=3.0, help="duração do teste com o leitor")
+    args = parser.parse_args(argv)
+
+    print(f"{'registros':>10} {'publicar (µs)':>14} {'ler (µs)':>10}")
+    for tamanho in args.tamanhos:
+        lousa = Lousa(tamanho)
+        grupos = grupos_da_versao(1, tamanho)
+        repeticoes = max(3, 200_000 // tamanho)
+        publicar = cronometrar(lambda: lousa.publicar(0.0, grupos), repeticoes)
+        ler = cronometrar(lousa.ler, repeticoes)
+        print(f"{tamanho:>10} {publicar * 1e6:>14.1f} {ler * 1e6:>10.1f}")
+        lousa.fechar()
+
+    tamanho = min(args.tamanhos)
+    lousa = Lousa(tamanho)
+    contexto = multiprocessing.get_context("spawn")
+    parar, resultado = contexto.Event(), contexto.Queue()
+    leitor = contexto.Process(target=ler_sem_parar, args=(lousa.nome, parar, resultado))
+    leitor.start()
+    publicadas = 0
+    fim = time.perf_counter() + args.segundos
+    while time.perf_counter() < fim:
+        versao = lousa.versao + 1
+        lousa.publicar(float(versao), grupos_da_versao(versao, tamanho))
+        publicadas += 1
+    parar.set()
+    leituras, rasgadas, tentativas = resultado.get()
+    leitor.join()
+    lousa.fechar()
+    print(f"\nleitor concorrente ({tamanho} registros, {args.segundos:.0f} s): {publicadas} publicações, "
+          f"{leituras} leituras, {tentativas} releituras, {rasgadas} rasgadas")
+    return 1 if rasgadas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
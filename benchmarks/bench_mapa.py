@@ -0,0 +1,74 @@
+"""Quadro completo com as plantas uma a uma e com o mapa de calor, em campos de vários tamanhos.
+
+Para cada tamanho mede visual.desenhar_quadro com o nível de detalhe fixo em
+"plantas" e em "mapa" (mediana de `--repeticoes` quadros, um ciclo simulado
+entre eles), com plantas objeto e com o motor vetorizado, e mostra qual modo o
+"auto" escolheria. O driver SDL é o `dummy`.
+
+Uso: python benchmarks/bench_mapa.py [--tamanhos 20 1000 10000 100000] [--repeticoes 20]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame  # noqa: E402
+
+import relogio  # noqa: E402
+import visual  # noqa: E402
+from campo import Campo  # noqa: E402
+from simulacao import Simulacao, criar_plantas  # noqa: E402
+
+
+def medir(simulacao, modo, repeticoes, tela, fontes):
+    """Tempos (s) de desenhar_quadro com o nível de detalhe `modo`."""
+    visual.mapa_calor.modo = modo
+    tempos = []
+    for i in range(repeticoes + 1):
+        simulacao.passo()
+        inicio = time.perf_counter()
+        visual.desenhar_quadro(tela, *fontes, simulacao, i * 33, 0)
+        tempos.append(time.perf_counter() - inicio)
+    return tempos[1:]  # o primeiro quadro prepara a grade e os sprites
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[20, 1000, 10000, 100000])
+    parser.add_argument("--repeticoes", type=int, default=20)
+    parser.add_argument("--semente", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    tela = pygame.display.set_mode((1000, 600))
+    fontes = visual.criar_fontes()
+    relogio.usar(relogio.RelogioVirtual())
+
+    print(f"{'plantas':>8} {'motor':<11} {'auto':<8} {'plantas (ms)':>13} {'mapa (ms)':>10} {'ganho':>7}")
+    for tamanho in args.tamanhos:
+        for motor in ("objetos", "vetorizado"):
+            if motor == "vetorizado":
+                simulacao = Simulacao(campo=Campo.em_grade(tamanho, semente=args.semente))
+            else:
+                simulacao = Simulacao(criar_plantas(tamanho, random.Random(args.semente)))
+            simulacao.iniciar_agentes()
+            visual.mapa_calor.modo = "auto"
+            auto = "mapa" if visual.mapa_calor.ativo(simulacao) else "plantas"
+            plantas = statistics.median(medir(simulacao, "plantas", args.repeticoes, tela, fontes))
+            mapa = statistics.median(medir(simulacao, "mapa", args.repeticoes, tela, fontes))
+            simulacao.encerrar_agentes()
+            print(f"{tamanho:>8} {motor:<11} {auto:<8} {plantas * 1e3:>13.2f} {mapa * 1e3:>10.2f} "
+                  f"{plantas / mapa:>6.1f}x")
+    visual.mapa_calor.modo = "auto"
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
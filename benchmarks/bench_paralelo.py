@@ -0,0 +1,56 @@
+"""Escala do campo em ladrilhos (campo_paralelo.py) com o número de processos.
+
+Para cada tamanho, avança um `Campo` comum e um `CampoParalelo` por processo
+pedido, todos com a mesma semente, e mostra o tempo por ciclo e o ganho sobre
+o `Campo`; ao final, todas as colunas têm de ser idênticas às do `Campo`.
+
+Uso: python benchmarks/bench_paralelo.py [--tamanhos 1000000 10000000] [--processos 1 2 4 8] [--ciclos 20]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from campo import COLUNAS, Campo  # noqa: E402
+from campo_paralelo import CampoParalelo  # noqa: E402
+
+
+def cronometrar(campo, ciclos):
+    campo.passo()  # aquecimento (páginas do bloco, processos acordados)
+    inicio = time.perf_counter()
+    for _ in range(ciclos):
+        campo.passo()
+    return (time.perf_counter() - inicio) / ciclos
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[1_000_000, 10_000_000])
+    parser.add_argument("--processos", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--ciclos", type=int, default=20, help="ciclos medidos por configuração")
+    args = parser.parse_args(argv)
+
+    print(f"núcleos disponíveis: {os.cpu_count()}")
+    print(f"{'plantas':>10} {'processos':>10} {'ms/ciclo':>10} {'ganho':>8} {'idêntico':>9}")
+    falhas = 0
+    for tamanho in args.tamanhos:
+        referencia = Campo.em_grade(tamanho, semente=tamanho)
+        tempo_base = cronometrar(referencia, args.ciclos)
+        print(f"{tamanho:>10} {'Campo':>10} {tempo_base * 1e3:>10.2f} {1:>7.1f}x {'-':>9}")
+        for processos in args.processos:
+            with CampoParalelo.em_grade(tamanho, semente=tamanho, processos=processos) as campo:
+                tempo = cronometrar(campo, args.ciclos)
+                igual = all(np.array_equal(getattr(campo, nome), getattr(referencia, nome)) for nome, _ in COLUNAS)
+            falhas += not igual
+            print(f"{tamanho:>10} {processos:>10} {tempo * 1e3:>10.2f} {tempo_base / tempo:>7.1f}x "
+                  f"{'sim' if igual else 'NÃO':>9}")
+        del referencia
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
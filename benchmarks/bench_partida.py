@@ -0,0 +1,59 @@
+"""Tempo de partida a frio: importar o núcleo, rodar um ciclo sem interface e importar a interface.
+
+Cada caso roda num interpretador novo (`python -c ...`), `--repeticoes` vezes,
+e mostra a mediana e o mínimo do tempo de parede, além de quais módulos
+pesados (pygame, numpy, asyncio, cProfile) ficaram carregados. O driver SDL é
+o `dummy`, então roda em servidores sem tela.
+
+Uso: python benchmarks/bench_partida.py [--repeticoes 15]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PESADOS = ("pygame", "numpy", "asyncio", "cProfile")
+
+CASOS = (
+    ("python vazio", "pass"),
+    ("import ambiente", "import ambiente"),
+    ("import agentes", "from agentes import colhedor, irrigador, sensor"),
+    ("import simulacao", "import simulacao"),
+    ("1 ciclo sem interface", "import simulacao; simulacao.executar_sem_interface(1)"),
+    ("import main", "import main"),
+    ("import visual", "import visual"),
+)
+
+
+def medir(codigo, repeticoes):
+    """Tempos (s) de `repeticoes` execuções de `codigo` e os módulos pesados carregados."""
+    relatorio = f"import sys; print(','.join(m for m in {PESADOS!r} if m in sys.modules))"
+    ambiente = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy",
+                    PYGAME_HIDE_SUPPORT_PROMPT="1", PYTHONDONTWRITEBYTECODE="1")
+    tempos, carregados = [], ""
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        saida = subprocess.run([sys.executable, "-c", f"{codigo}\n{relatorio}"], cwd=RAIZ, env=ambiente,
+                               capture_output=True, text=True, check=True).stdout
+        tempos.append(time.perf_counter() - inicio)
+        carregados = saida.strip().splitlines()[-1] if saida.strip() else ""
+    return tempos, carregados
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeticoes", type=int, default=15)
+    args = parser.parse_args(argv)
+
+    print(f"{'caso':<24} {'mediana (ms)':>13} {'mínimo (ms)':>12}  carregados")
+    for nome, codigo in CASOS:
+        tempos, carregados = medir(codigo, args.repeticoes)
+        print(f"{nome:<24} {statistics.median(tempos) * 1e3:>13.1f} {min(tempos) * 1e3:>12.1f}  {carregados or '-'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Mede salvar e restaurar pontos de restauração e confere que a execução continua idêntica.
+
+Para cada tamanho: aquece o campo, salva um ponto, roda mais `--ciclos` ciclos,
+restaura o ponto e roda os mesmos ciclos de novo; colhidas, mortas e a água de
+todas as plantas têm de bater.
+
+Uso: python benchmarks/bench_restauracao.py [--tamanhos 1000 100000 1000000] [--objetos]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import relogio  # noqa: E402
+from campo import Campo  # noqa: E402
+from restauracao import PontosRestauracao  # noqa: E402
+from simulacao import Simulacao, criar_plantas  # noqa: E402
+
+
+def estado(simulacao):
+    agua = np.fromiter((p.agua for p in simulacao.plantas), float, len(simulacao.plantas))
+    return simulacao.plantas_colhidas, simulacao.plantas_mortas, agua
+
+
+def medir(tamanho, objetos, ciclos, aquecimento, k, pasta):
+    if objetos:
+        simulacao = Simulacao(criar_plantas(tamanho, random.Random(tamanho)), modo_irrigador="prazo")
+    else:
+        simulacao = Simulacao(campo=Campo.em_grade(tamanho, semente=tamanho), modo_irrigador="prazo")
+    anterior = relogio.usar(relogio.RelogioVirtual())
+    pontos = PontosRestauracao(os.path.join(pasta, f"pontos_{tamanho}.bin"), tamanho, k)
+    try:
+        simulacao.iniciar_agentes()
+        for _ in range(aquecimento):
+            simulacao.passo()
+
+        inicio = time.perf_counter()
+        pontos.salvar(simulacao)
+        tempo_salvar = time.perf_counter() - inicio
+
+        for _ in range(ciclos):
+            simulacao.passo()
+        esperado = estado(simulacao)
+
+        inicio = time.perf_counter()
+        pontos.restaurar(simulacao)
+        tempo_restaurar = time.perf_counter() - inicio
+
+        for _ in range(ciclos):
+            simulacao.passo()
+        obtido = estado(simulacao)
+    finally:
+        relogio.usar(anterior)
+        pontos.fechar()
+
+    igual = esperado[:2] == obtido[:2] and np.array_equal(esperado[2], obtido[2])
+    return tempo_salvar, tempo_restaurar, pontos.tamanho_ponto, igual
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--objetos", action="store_true", help="usa objetos Planta em vez do Campo NumPy")
+    parser.add_argument("--ciclos", type=int, default=24, help="ciclos rodados depois de salvar")
+    parser.add_argument("--aquecimento", type=int, default=600)
+    parser.add_argument("--k", type=int, default=4, help="pontos mantidos no arquivo")
+    args = parser.parse_args(argv)
+
+    print(f"{'plantas':>10} {'salvar (ms)':>12} {'restaurar (ms)':>15} {'MiB/ponto':>10} {'idêntica':>9}")
+    falhas = 0
+    with tempfile.TemporaryDirectory() as pasta:
+        for tamanho in args.tamanhos:
+            salvar, restaurar, tamanho_ponto, igual = medir(
+                tamanho, args.objetos, args.ciclos, args.aquecimento, args.k, pasta)
+            falhas += not igual
+            print(f"{tamanho:>10} {salvar * 1e3:>12.2f} {restaurar * 1e3:>15.2f} "
+                  f"{tamanho_ponto / 2**20:>10.1f} {'sim' if igual else 'NÃO':>9}")
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,204 @@
+"""Mede cada caminho quente de um ciclo em vários tamanhos de campo e compara com uma base.
+
+Operações medidas (uma chamada cada, com o intervalo dos agentes liberado):
+  atualizar  - Planta.atualizar em todas as plantas (ou Campo.passo com --vetorizado)
+  sensor     - sensor.agir_sensor
+  irrigador  - irrigador.agir_irrigador
+  colhedor   - colhedor.agir_colhedor
+  quadro     - visual.desenhar_quadro, o quadro completo da interface (driver SDL "dummy")
+  quadro_incremental - visual.QuadroIncremental, redesenhando só as regiões alteradas
+
+Uso:
+  python benchmarks/bench_suite.py medir [--tamanhos 20 1000 10000 100000] [--saida atual.json]
+  python benchmarks/bench_suite.py comparar base.json atual.json [--tolerancia 0.15]
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+import pygame  # noqa: E402
+
+import relogio  # noqa: E402
+import visual  # noqa: E402
+from agentes import colhedor, irrigador, sensor  # noqa: E402
+from campo import Campo  # noqa: E402
+from simulacao import Simulacao, criar_plantas  # noqa: E402
+
+OPERACOES = ("atualizar", "sensor", "irrigador", "colhedor", "quadro", "quadro_incremental")
+
+
+def liberar_agentes():
+    """Zera o intervalo dos agentes para que a próxima chamada faça trabalho de verdade."""
+    sensor.ultimo_tempo = float("-inf")
+    irrigador.agente_global.ultimo_tempo = float("-inf")
+    colhedor.ultimo_tempo = float("-inf")
+
+
+def criar_simulacao(tamanho, vetorizado, semente):
+    if vetorizado:
+        return Simulacao(campo=Campo.em_grade(tamanho, semente=semente))
+    return Simulacao(criar_plantas(tamanho, random.Random(semente)))
+
+
+def medir_tamanho(tamanho, repeticoes, aquecimento, vetorizado, semente, tela, fontes):
+    """Tempos (s) de cada operação em um campo de `tamanho` plantas."""
+    simulacao = criar_simulacao(tamanho, vetorizado, semente)
+    relogio_virtual = relogio.RelogioVirtual()
+    anterior = relogio.usar(relogio_virtual)
+    try:
+        simulacao.iniciar_agentes()
+        # Aquecimento: leva o campo a um estado misto (secas, maduras, mortas)
+        for _ in range(aquecimento):
+            simulacao.passo()
+
+        plantas = simulacao.plantas
+        incremental = visual.QuadroIncremental(tela, *fontes)
+        incremental.desenhar(simulacao, 0, 0)  # o primeiro quadro é sempre completo
+        quadro = {"tempo": 0}  # ms da animação; avança um quadro (1/12 s) por repetição
+        chamadas = {
+            "atualizar": simulacao.atualizar_plantas,
+            "sensor": lambda: sensor.agir_sensor(plantas),
+            "irrigador": lambda: irrigador.agir_irrigador(plantas),
+            "colhedor": lambda: colhedor.agir_colhedor(plantas, simulacao.pos_colhedor),
+            "quadro": lambda: visual.desenhar_quadro(tela, *fontes, simulacao, quadro["tempo"], 0),
+            "quadro_incremental": lambda: incremental.desenhar(simulacao, quadro["tempo"], 0),
+        }
+        tempos = {nome: [] for nome in OPERACOES}
+        for _ in range(repeticoes):
+            # Um ciclo normal entre as repetições, fora da medição
+            simulacao.passo()
+            liberar_agentes()
+            quadro["tempo"] += 83
+            for nome in OPERACOES:
+                inicio = time.perf_counter()
+                chamadas[nome]()
+                tempos[nome].append(time.perf_counter() - inicio)
+    finally:
+        relogio.usar(anterior)
+
+    return {
+        nome: {
+            "mediana": statistics.median(valores),
+            "minimo": min(valores),
+            "por_planta": statistics.median(valores) / tamanho,
+            "repeticoes": len(valores),
+        }
+        for nome, valores in tempos.items()
+    }
+
+
+def medir(args):
+    pygame.init()
+    tela = pygame.display.set_mode((1000, 600))
+    fontes = visual.criar_fontes()
+
+    resultados = {}
+    for tamanho in args.tamanhos:
+        # Campos grandes: menos repetições para a suíte terminar em tempo razoável
+        repeticoes = args.repeticoes if tamanho <= 10_000 else max(3, args.repeticoes // 2)
+        medidas = medir_tamanho(tamanho, repeticoes, args.aquecimento, args.vetorizado,
+                                args.semente, tela, fontes)
+        for nome, medida in medidas.items():
+            resultados[f"{nome}@{tamanho}"] = medida
+            print(f"{nome:>18} {tamanho:>8} {medida['mediana'] * 1e3:>12.3f} ms "
+                  f"{medida['por_planta'] * 1e6:>10.3f} µs/planta")
+    pygame.quit()
+    estatisticas = visual.cache_texto.estatisticas()
+    print(f"Cache de texto: {estatisticas['taxa_acerto']:.1%} de acertos, "
+          f"{estatisticas['tamanho']}/{estatisticas['capacidade']} superfícies")
+
+    relatorio = {
+        "meta": {
+            "data": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "numpy": np.__version__,
+            "pygame": pygame.version.ver,
+            "vetorizado": args.vetorizado,
+            "aquecimento": args.aquecimento,
+            "semente": args.semente,
+            "cache_texto": visual.cache_texto.estatisticas(),
+        },
+        "resultados": resultados,
+    }
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            json.dump(relatorio, arquivo, indent=2, ensure_ascii=False)
+        print(f"Resultados gravados em {args.saida}")
+    return relatorio
+
+
+def comparar(base, atual, tolerancia, piso=50e-6):
+    """Lista (chave, base, atual, razão, regrediu) das medidas presentes nos dois relatórios.
+
+    Diferenças menores que `piso` segundos são ruído de medição e não contam como regressão.
+    """
+    linhas = []
+    for chave, medida in atual["resultados"].items():
+        if chave not in base["resultados"]:
+            continue
+        antes = base["resultados"][chave]["mediana"]
+        depois = medida["mediana"]
+        razao = depois / antes if antes > 0 else float("inf")
+        linhas.append((chave, antes, depois, razao, razao > 1 + tolerancia and depois - antes > piso))
+    return linhas
+
+
+def carregar(caminho):
+    with open(caminho, encoding="utf-8") as arquivo:
+        return json.load(arquivo)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    comandos = parser.add_subparsers(dest="comando", required=True)
+
+    p_medir = comandos.add_parser("medir", help="executa a suíte e grava o JSON")
+    p_medir.add_argument("--tamanhos", type=int, nargs="+", default=[20, 1_000, 10_000, 100_000])
+    p_medir.add_argument("--repeticoes", type=int, default=7)
+    p_medir.add_argument("--aquecimento", type=int, default=36, help="ciclos antes de medir")
+    p_medir.add_argument("--vetorizado", action="store_true", help="usa o Campo NumPy em vez de objetos Planta")
+    p_medir.add_argument("--semente", type=int, default=0)
+    p_medir.add_argument("--saida", default=None)
+
+    p_comparar = comandos.add_parser("comparar", help="compara dois JSON e aponta regressões")
+    p_comparar.add_argument("base")
+    p_comparar.add_argument("atual")
+    p_comparar.add_argument("--tolerancia", type=float, default=0.15,
+                            help="aumento relativo da mediana aceito antes de acusar regressão")
+    p_comparar.add_argument("--piso", type=float, default=50e-6,
+                            help="diferença absoluta mínima (s) para acusar regressão")
+
+    args = parser.parse_args(argv)
+    if args.comando == "medir":
+        medir(args)
+        return 0
+
+    linhas = comparar(carregar(args.base), carregar(args.atual), args.tolerancia, args.piso)
+    print(f"{'medida':>20} {'base (ms)':>12} {'atual (ms)':>12} {'razão':>7}")
+    regressoes = 0
+    for chave, antes, depois, razao, regrediu in linhas:
+        regressoes += regrediu
+        marca = "  REGRESSÃO" if regrediu else ""
+        print(f"{chave:>20} {antes * 1e3:>12.3f} {depois * 1e3:>12.3f} {razao:>6.2f}x{marca}")
+    if regressoes:
+        print(f"{regressoes} regressão(ões) acima de {args.tolerancia:.0%}")
+        return 1
+    print("Nenhuma regressão.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+import numpy as np
+
+import ambiente
+from agregados import contar
+from ambiente import Planta
+
+# Colunas do campo e seus tipos, na ordem em que são alocadas
+COLUNAS = (
+    ("x", np.int64), ("y", np.int64), ("maturidade", np.float64), ("agua", np.float64),
+    ("fator_crescimento", np.float64), ("fator_consumo", np.float64),
+    ("tempo_madura_cheia", np.int64), ("limite_tempo_madura_cheia", np.int64),
+    ("coletada", np.bool_), ("morta", np.bool_),
+)
+
+
+class Campo:
+    """Campo de plantas em arrays NumPy contíguos (uma coluna por atributo).
+
+    `passo()` avança todas as plantas de uma vez, com as mesmas regras de
+    `Planta.atualizar`. Agentes e interface continuam usando `campo.plantas`,
+    cujos itens são vistas (`PlantaCampo`) sobre as linhas dos arrays.
+    """
+
+    def __init__(self, posicoes, semente=None):
+        posicoes = np.asarray(posicoes, dtype=np.int64).reshape(-1, 2)
+        n = len(posicoes)
+        self.rng = np.random.default_rng(semente)
+
+        for nome, tipo in COLUNAS:
+            setattr(self, nome, self._alocar(nome, n, tipo))
+        self.x[:] = posicoes[:, 0]
+        self.y[:] = posicoes[:, 1]
+
+        self._vistas = None
+        self.agregados = None  # agregados.Agregados refeito a cada passo, se houver
+        self.resetar(slice(None))
+
+    @classmethod
+    def em_grade(cls, quantidade, colunas=5, semente=None):
+        """Cria o campo na mesma grade usada pela interface (5 plantas por linha)."""
+        i = np.arange(quantidade)
+        posicoes = np.column_stack((80 + (i % colunas) * 130, 80 + (i // colunas) * 110))
+        return cls(posicoes, semente)
+
+    def _alocar(self, nome, n, tipo):
+        """Array da coluna `nome`; subclasses podem alocar em outro lugar (campo_paralelo.py)."""
+        return np.empty(n, dtype=tipo)
+
+    def __len__(self):
+        return len(self.x)
+
+    @property
+    def plantas(self):
+        """Lista de vistas `PlantaCampo`, criada na primeira consulta."""
+        if self._vistas is None:
+            self._vistas = [PlantaCampo(self, i) for i in range(len(self))]
+        return self._vistas
+
+    def vista(self, indice):
+        """Retorna a `PlantaCampo` da linha `indice` sem criar as demais vistas."""
+        if self._vistas is not None:
+            return self._vistas[indice]
+        return PlantaCampo(self, int(indice))
+
+    def _notificar(self, mascara, evento):
+        for indice in np.flatnonzero(mascara):
+            ambiente.notificar(self.vista(indice), evento)
+
+    def resetar(self, indices):
+        """Reinicia as plantas indicadas (índice, fatia ou máscara), como `Planta.resetar`."""
+        n = len(self.x[indices]) if not np.isscalar(indices) else None
+        agregados = self.agregados
+        if agregados is not None:
+            antes = contar(self, indices)
+        uniform = self.rng.uniform
+        self.maturidade[indices] = uniform(0, 20, n)
+        self.agua[indices] = uniform(40, 70, n)
+        self.coletada[indices] = False
+        self.morta[indices] = False
+        self.fator_crescimento[indices] = uniform(0.2, 1.0, n)
+        self.fator_consumo[indices] = uniform(*ambiente.FAIXA_CONSUMO, n)
+        self.tempo_madura_cheia[indices] = 0
+        self.limite_tempo_madura_cheia[indices] = self.rng.integers(10, 20, n, endpoint=True)
+        if agregados is not None:
+            agregados.ajustar(contar(self, indices) - antes)
+
+        if ambiente._observadores:
+            for indice in np.arange(len(self))[indices].reshape(-1):
+                ambiente.notificar(self.vista(indice), "resetada")
+
+    def passo(self):
+        """Avança todas as plantas um ciclo (vetorizado)."""
+        observado = bool(ambiente._observadores)
+        mudancas = avancar(self, observado)
+        if self.agregados is not None:
+            self.agregados.definir(contar(self))
+        # Avisos só para as plantas que mudaram de estado neste ciclo
+        if observado:
+            cruzou, madura, morreu = mudancas
+            self._notificar(cruzou, "agua")
+            self._notificar(madura, "madura")
+            self._notificar(morreu, "morta")
+
+
+def avancar(c, observado=False, limiares=None):
+    """Avança um ciclo as plantas de `c` (um `Campo` ou qualquer objeto com as mesmas colunas).
+
+    As regras são as de `Planta.atualizar`, aplicadas planta a planta, então
+    avançar pedaços do campo separadamente dá o mesmo resultado. Com
+    `observado`, devolve as máscaras (cruzou limiar de água, ficou madura,
+    morreu); senão, None. `limiares` substitui ambiente.LIMIARES_AGUA (para
+    quem avança em outro processo, onde o global não foi trocado).
+    """
+    ativas = ~(c.morta | c.coletada)
+    if observado:
+        mortas_antes = c.morta.copy()
+        agua_antes = c.agua.copy()
+    com_agua = ativas & (c.agua > 0)
+
+    # Crescimento e consumo de água apenas onde ainda havia água
+    np.add(c.maturidade, c.fator_crescimento, out=c.maturidade, where=com_agua)
+    np.minimum(c.maturidade, 100, out=c.maturidade, where=com_agua)
+    np.subtract(c.agua, c.fator_consumo, out=c.agua, where=com_agua)
+    np.maximum(c.agua, 0, out=c.agua, where=com_agua)
+
+    madura = com_agua & (c.maturidade >= 100)
+    c.tempo_madura_cheia += madura
+    c.tempo_madura_cheia[com_agua & ~madura] = 0
+    c.morta |= madura & (c.tempo_madura_cheia > c.limite_tempo_madura_cheia)
+
+    # Sem água no início do ciclo: morre
+    c.morta |= ativas & ~com_agua
+
+    if not observado:
+        return None
+    cruzou = np.zeros(len(c.agua), dtype=bool)
+    for limiar in (limiares if limiares is not None else ambiente.LIMIARES_AGUA):
+        cruzou |= (c.agua < limiar) & (agua_antes >= limiar)
+    return cruzou, madura & (c.tempo_madura_cheia == 1), c.morta & ~mortas_antes
+
+
+def _coluna(nome, tipo):
+    """Cria uma propriedade que lê e escreve a linha da planta no array `nome`."""
+    def ler(self):
+        return tipo(getattr(self.campo, nome)[self.indice])
+
+    def escrever(self, valor):
+        getattr(self.campo, nome)[self.indice] = valor
+
+    return property(ler, escrever)
+
+
+class PlantaCampo(Planta):
+    """Vista leve sobre uma linha do `Campo`, com a mesma interface de `Planta`."""
+
+    x = _coluna("x", int)
+    y = _coluna("y", int)
+    maturidade = _coluna("maturidade", float)
+    agua = _coluna("agua", float)
+    fator_crescimento = _coluna("fator_crescimento", float)
+    fator_consumo = _coluna("fator_consumo", float)
+    tempo_madura_cheia = _coluna("tempo_madura_cheia", int)
+    limite_tempo_madura_cheia = _coluna("limite_tempo_madura_cheia", int)
+    coletada = _coluna("coletada", bool)
+    morta = _coluna("morta", bool)
+
+    @property
+    def agregados(self):
+        return self.campo.agregados
+
+    def __init__(self, campo, indice):
+        # Não chama Planta.__init__: os valores já estão nos arrays do campo
+        self.campo = campo
+        self.indice = indice
+
+    # Duas vistas da mesma linha representam a mesma planta
+    def __eq__(self, outra):
+        return isinstance(outra, PlantaCampo) and outra.campo is self.campo and outra.indice == self.indice
+
+    def __hash__(self):
+        # Só o índice: vistas de campos diferentes raramente se misturam e __eq__ as separa
+        return self.indice
+
+    def resetar(self):
+        """Reinicia atributos da planta."""
+        self.campo.resetar(self.indice)
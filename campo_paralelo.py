@@ -0,0 +1,240 @@
+"""Campo dividido em ladrilhos avançados em paralelo, com as colunas em memória compartilhada.
+
+`CampoParalelo` é um `Campo` cujas colunas ficam num único bloco de
+`multiprocessing.shared_memory`. O campo é cortado em `processos` ladrilhos de
+plantas consecutivas (na grade de `Campo.em_grade`, faixas horizontais de
+linhas); o processo principal avança o primeiro e cada um dos demais fica com
+um processo de trabalho. A cada `passo()` todos avançam o seu ladrilho com
+`campo.avancar` e esperam os outros numa barreira, então o campo inteiro anda
+um ciclo junto. Agentes e interface continuam lendo e escrevendo as mesmas
+colunas pelas vistas `PlantaCampo`, sem cópia nem pickle: os processos só
+trocam o nome do bloco na criação.
+
+Como `avancar` trata cada planta isoladamente, o resultado é idêntico ao do
+`Campo` com a mesma semente (ver benchmarks/bench_paralelo.py). Com
+`agregados`, cada processo também conta o próprio ladrilho (`agregados.contar`)
+e o principal só soma as parciais. Os limiares de água valem por processo
+(ambiente.LIMIARES_AGUA), então o principal grava os seus no cabeçalho do bloco
+a cada passo e os processos de trabalho usam esses.
+"""
+import multiprocessing
+import os
+import threading
+import weakref
+from multiprocessing import shared_memory
+from types import SimpleNamespace
+
+import numpy as np
+
+import ambiente
+from agregados import CAMPOS, contar
+from campo import COLUNAS, Campo, avancar
+
+# Ordem para os processos, no início do bloco (seguida de 1 se devem contar os agregados
+# e dos dois limiares de água do processo principal)
+_AVANCAR, _AVANCAR_OBSERVADO, _SAIR = 0, 1, 2
+
+# Bits da coluna de eventos, preenchida quando há observadores
+_EVENTOS = ((1, "agua"), (2, "madura"), (4, "morta"))
+
+# Colunas e ladrilhos começam em múltiplos de 64 bytes (uma linha de cache)
+_ALINHAMENTO = 64
+
+
+def _disposicao(n):
+    """Deslocamento e tipo de cada coluna no bloco, e o tamanho total do bloco."""
+    colunas = {}
+    deslocamento = _ALINHAMENTO  # o início guarda a ordem para os processos
+    for nome, tipo in COLUNAS + (("eventos", np.uint8),):
+        colunas[nome] = (deslocamento, tipo)
+        deslocamento += -(-n * np.dtype(tipo).itemsize // _ALINHAMENTO) * _ALINHAMENTO
+    # Parciais dos agregados: uma linha por ladrilho possível (um a cada 64 plantas)
+    colunas["totais"] = (deslocamento, np.float64)
+    deslocamento += _maximo_ladrilhos(n) * len(CAMPOS) * 8
+    return colunas, max(deslocamento, 1)
+
+
+def _maximo_ladrilhos(n):
+    return -(-n // _ALINHAMENTO) or 1
+
+
+def _coluna(buf, n, nome):
+    deslocamento, tipo = _disposicao(n)[0][nome]
+    return np.ndarray(n, dtype=tipo, buffer=buf, offset=deslocamento)
+
+
+def _totais(buf, n):
+    deslocamento = _disposicao(n)[0]["totais"][0]
+    return np.ndarray((_maximo_ladrilhos(n), len(CAMPOS)), dtype=np.float64, buffer=buf, offset=deslocamento)
+
+
+def _ordem(buf):
+    return np.ndarray(2, dtype=np.int64, buffer=buf, offset=0)
+
+
+def _limiares(buf):
+    return np.ndarray(2, dtype=np.float64, buffer=buf, offset=16)
+
+
+def _ladrilhos(n, processos):
+    """Limites [inicio, fim) de cada ladrilho, alinhados para não dividirem linhas de cache.
+
+    O arredondamento pode deixar ladrilhos vazios; eles são descartados, então
+    podem sair menos ladrilhos que `processos` (sempre ao menos um).
+    """
+    passo = _ALINHAMENTO  # 64 plantas: múltiplo de 64 bytes em todas as colunas
+    limites = [min(n, round(n * k / processos / passo) * passo) for k in range(processos + 1)]
+    limites[-1] = n
+    return [(inicio, fim) for inicio, fim in zip(limites[:-1], limites[1:]) if fim > inicio] or [(0, n)]
+
+
+def _avancar_ladrilho(ladrilho, eventos, observado, totais=None, limiares=None):
+    mudancas = avancar(ladrilho, observado, limiares)
+    if observado:
+        cruzou, madura, morreu = mudancas
+        eventos[:] = cruzou
+        eventos[madura] |= 2
+        eventos[morreu] |= 4
+    if totais is not None:
+        totais[:] = contar(ladrilho, limiares=limiares)
+
+
+def _trabalhar(nome, n, k, inicio, fim, barreira):
+    """Laço de um processo de trabalho: avança o ladrilho `k`, [inicio, fim), a cada ciclo."""
+    memoria = shared_memory.SharedMemory(name=nome)
+    try:
+        ordem = _ordem(memoria.buf)
+        limiares = _limiares(memoria.buf)
+        ladrilho = SimpleNamespace(**{nome_coluna: _coluna(memoria.buf, n, nome_coluna)[inicio:fim]
+                                      for nome_coluna, _ in COLUNAS})
+        eventos = _coluna(memoria.buf, n, "eventos")[inicio:fim]
+        totais = _totais(memoria.buf, n)[k]
+        while True:
+            barreira.wait()
+            if ordem[0] == _SAIR:
+                break
+            _avancar_ladrilho(ladrilho, eventos, ordem[0] == _AVANCAR_OBSERVADO, totais if ordem[1] else None,
+                              tuple(limiares))
+            barreira.wait()
+    except threading.BrokenBarrierError:
+        pass  # o processo principal desistiu do passo (ou foi encerrado)
+    finally:
+        # As vistas precisam sumir antes de fechar o bloco
+        ordem = limiares = ladrilho = eventos = totais = None
+        memoria.close()
+
+
+def _encerrar(processos, barreira, memoria):
+    """Para os processos e libera o bloco; também chamado pelo coletor se `fechar` faltar."""
+    if processos:
+        try:
+            _ordem(memoria.buf)[0] = _SAIR
+            barreira.wait(5)
+        except (threading.BrokenBarrierError, ValueError):
+            barreira.abort()
+        for processo in processos:
+            processo.join(5)
+            if processo.is_alive():
+                processo.terminate()
+        processos.clear()
+    try:
+        memoria.unlink()
+    except FileNotFoundError:
+        pass
+
+
+class CampoParalelo(Campo):
+    """`Campo` em memória compartilhada, avançado por `processos` processos (ladrilhos).
+
+    `processos` inclui o principal (padrão: os núcleos disponíveis); com 1, não
+    cria nenhum processo e o passo é o do `Campo`. Se um processo não terminar
+    o ladrilho em `tempo_limite` segundos, `passo()` levanta RuntimeError.
+    Chame `fechar()` (ou use `with`) ao terminar; depois dele as colunas
+    continuam válidas e o campo volta a avançar só no processo principal.
+    """
+
+    def __init__(self, posicoes, semente=None, processos=None, tempo_limite=60.0):
+        n = len(np.asarray(posicoes).reshape(-1, 2))
+        self._memoria = shared_memory.SharedMemory(create=True, size=_disposicao(n)[1])
+        try:
+            super().__init__(posicoes, semente)
+        except BaseException:
+            self._memoria.unlink()
+            raise
+
+        self.ladrilhos = _ladrilhos(n, max(1, min(processos or os.cpu_count() or 1, _maximo_ladrilhos(n))))
+        self.processos = len(self.ladrilhos)  # um por ladrilho não vazio
+        self.tempo_limite = tempo_limite
+        self.eventos = _coluna(self._memoria.buf, n, "eventos")
+        self._totais = _totais(self._memoria.buf, n)
+        self._ordem = _ordem(self._memoria.buf)
+        self._limiares = _limiares(self._memoria.buf)
+        self._local = self._fatia(*self.ladrilhos[0])
+
+        self._processos = []
+        self._barreira = None
+        if self.processos > 1:
+            contexto = multiprocessing.get_context("spawn")  # sem herdar threads nem a janela
+            self._barreira = contexto.Barrier(self.processos)
+            for k, (inicio, fim) in enumerate(self.ladrilhos[1:], 1):
+                processo = contexto.Process(target=_trabalhar, name=f"ladrilho-{k}", daemon=True,
+                                            args=(self._memoria.name, n, k, inicio, fim, self._barreira))
+                processo.start()
+                self._processos.append(processo)
+        self._finalizador = weakref.finalize(self, _encerrar, self._processos, self._barreira, self._memoria)
+
+    @classmethod
+    def em_grade(cls, quantidade, colunas=5, semente=None, processos=None):
+        i = np.arange(quantidade)
+        posicoes = np.column_stack((80 + (i % colunas) * 130, 80 + (i // colunas) * 110))
+        return cls(posicoes, semente, processos)
+
+    def _alocar(self, nome, n, tipo):
+        return _coluna(self._memoria.buf, n, nome)
+
+    def _fatia(self, inicio, fim):
+        """Vistas das colunas (e dos eventos) das plantas [inicio, fim)."""
+        fatia = SimpleNamespace(**{nome: getattr(self, nome)[inicio:fim] for nome, _ in COLUNAS})
+        fatia.eventos = self.eventos[inicio:fim]
+        return fatia
+
+    def _esperar(self):
+        try:
+            self._barreira.wait(self.tempo_limite)
+        except threading.BrokenBarrierError:
+            vivos = sum(p.is_alive() for p in self._processos)
+            raise RuntimeError(f"processos dos ladrilhos não responderam ({vivos} de "
+                               f"{len(self._processos)} vivos)") from None
+
+    def passo(self):
+        """Avança todas as plantas um ciclo, cada ladrilho no seu processo."""
+        observado = bool(ambiente._observadores)
+        agregados = self.agregados
+        totais = self._totais[0] if agregados is not None else None
+        if self._processos:
+            self._ordem[0] = _AVANCAR_OBSERVADO if observado else _AVANCAR
+            self._ordem[1] = agregados is not None
+            self._limiares[:] = ambiente.LIMIARES_AGUA
+            self._esperar()  # libera os processos
+            _avancar_ladrilho(self._local, self._local.eventos, observado, totais)
+            self._esperar()  # todos terminaram
+        else:
+            _avancar_ladrilho(self._local, self._local.eventos, observado, totais)
+        if agregados is not None:
+            agregados.definir(self._totais[:len(self._processos) + 1].sum(axis=0))
+
+        # Avisos na mesma ordem do Campo: água, maduras e mortas, cada um por índice
+        if observado:
+            for bit, evento in _EVENTOS:
+                self._notificar(self.eventos & bit, evento)
+
+    def fechar(self):
+        """Encerra os processos e libera o nome do bloco (as colunas seguem válidas aqui)."""
+        self._finalizador()
+        self._local = self._fatia(0, len(self))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
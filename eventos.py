@@ -0,0 +1,311 @@
+"""Motor de eventos discretos: avança a fazenda de evento em evento.
+
+Entre duas ações dos agentes cada planta muda de forma linear: a maturidade
+sobe `fator_crescimento` e a água desce `fator_consumo` por ciclo. Os ciclos
+em que ela cruza um limiar de água, amadurece ou morre podem então ser
+calculados de antemão. O motor guarda esses cruzamentos em uma fila de
+prioridade e pula direto para o próximo evento ou ação de agente, sem
+executar `Planta.atualizar` ciclo a ciclo.
+
+Os valores são calculados em forma fechada (`m0 + k * fator`), enquanto o
+laço por ciclos soma o fator k vezes. As duas contas só divergem no
+arredondamento de ponto flutuante; ver benchmarks/bench_eventos.py.
+"""
+import argparse
+import heapq
+import itertools
+import math
+import random
+
+import ambiente
+import relogio
+from ambiente import Planta
+from agentes import colhedor, irrigador, sensor
+
+# Ordem dos avisos dentro de um mesmo ciclo, a mesma de Planta.atualizar
+_ORDEM = {"agua": 0, "madura": 1, "morta": 2}
+
+
+def _primeiro(estimativa, condicao):
+    """Menor j >= 1 com `condicao(j)`, partindo de uma estimativa analítica."""
+    j = max(1, estimativa)
+    while j > 1 and condicao(j - 1):
+        j -= 1
+    while not condicao(j):
+        j += 1
+    return j
+
+
+class PlantaEventos(Planta):
+    """Planta cujo estado é calculado sob demanda a partir da última base.
+
+    A base guarda maturidade, água e tempo maduro no ciclo `_base`; qualquer
+    escrita (irrigação, colheita, morte) materializa o estado atual como nova
+    base e reagenda os eventos da planta.
+    """
+
+    agregavel = False  # água e maturidade andam com o relógio, sem passar por atualizar
+
+    def __init__(self, motor, indice, x, y, rng=None):
+        self.motor = motor
+        self.indice = indice
+        self.x, self.y = x, y
+        self.rng = rng if rng is not None else random
+        self.versao = 0
+        self.resetar()
+
+    def resetar(self):
+        """Reinicia atributos da planta."""
+        # Mesmos sorteios, na mesma ordem, de Planta.resetar
+        rng = self.rng
+        self._maturidade0 = rng.uniform(0, 20)
+        self._agua0 = rng.uniform(40, 70)
+        self._coletada = False
+        self._morta = False
+        self.fator_crescimento = rng.uniform(0.2, 1.0)
+        self.fator_consumo = rng.uniform(*ambiente.FAIXA_CONSUMO)
+        self._tempo0 = 0
+        self.limite_tempo_madura_cheia = rng.randint(10, 20)
+        self._base = self.motor.aplicados
+        self.motor.agendar(self)
+        if ambiente._observadores:
+            ambiente.notificar(self, "resetada")
+
+    def atualizar(self):
+        raise TypeError("PlantaEventos é avançada pelo MotorEventos, não ciclo a ciclo")
+
+    def _vividos(self, aplicados=None):
+        if self._morta or self._coletada:
+            return 0
+        aplicados = self.motor.aplicados if aplicados is None else aplicados
+        return aplicados - self._base
+
+    def _maturidade_em(self, k):
+        return min(100, self._maturidade0 + k * self.fator_crescimento)
+
+    def _agua_em(self, k):
+        return max(0, self._agua0 - k * self.fator_consumo)
+
+    def _tempo_em(self, k):
+        if k == 0:
+            return self._tempo0
+        if self._maturidade0 >= 100:
+            return self._tempo0 + k
+        return k - self._ciclo_maturacao + 1 if k >= self._ciclo_maturacao else 0
+
+    def _rebasear(self, aplicados=None):
+        """Materializa o estado em `aplicados` ciclos e o torna a nova base."""
+        k = self._vividos(aplicados)
+        self._maturidade0, self._agua0, self._tempo0 = self._maturidade_em(k), self._agua_em(k), self._tempo_em(k)
+        self._base = self.motor.aplicados if aplicados is None else aplicados
+
+    def _alterar(self, nome, valor):
+        self._rebasear()
+        setattr(self, nome, valor)
+        self.motor.agendar(self)
+
+    maturidade = property(lambda self: self._maturidade_em(self._vividos()),
+                          lambda self, v: self._alterar("_maturidade0", v))
+    agua = property(lambda self: self._agua_em(self._vividos()),
+                    lambda self, v: self._alterar("_agua0", v))
+    tempo_madura_cheia = property(lambda self: self._tempo_em(self._vividos()),
+                                  lambda self, v: self._alterar("_tempo0", v))
+    coletada = property(lambda self: self._coletada, lambda self, v: self._alterar("_coletada", v))
+    morta = property(lambda self: self._morta, lambda self, v: self._alterar("_morta", v))
+
+
+class MotorEventos:
+    """Fila de eventos das plantas e o ciclo até o qual o campo está materializado."""
+
+    def __init__(self, posicoes, rng=None):
+        self.aplicados = 0  # quantos ciclos de atualização já valem para as plantas
+        self.fila = []  # heap de (aplicados, indice, ordem, seq, versao, tipo, planta)
+        self._seq = itertools.count()
+        self.plantas = [PlantaEventos(self, i, x, y, rng) for i, (x, y) in enumerate(posicoes)]
+
+    @classmethod
+    def em_grade(cls, quantidade, rng=None):
+        """Mesma grade de simulacao.criar_plantas (5 plantas por linha)."""
+        return cls([(80 + (i % 5) * 130, 80 + (i // 5) * 110) for i in range(quantidade)], rng)
+
+    def agendar(self, planta):
+        """Calcula os próximos cruzamentos da planta a partir da base e os põe na fila."""
+        planta.versao += 1
+        if planta._morta or planta._coletada:
+            return
+
+        m0, a0 = planta._maturidade0, planta._agua0
+        f, g = planta.fator_crescimento, planta.fator_consumo
+        limite = planta.limite_tempo_madura_cheia
+
+        # z: ciclo em que a água chega a 0; a planta morre seca no ciclo seguinte
+        z = 0 if a0 <= 0 else _primeiro(math.ceil(a0 / g), lambda j: a0 - j * g <= 0)
+
+        if m0 >= 100:
+            planta._ciclo_maturacao = None
+            morte_madura = limite + 1 - planta._tempo0
+        else:
+            planta._ciclo_maturacao = _primeiro(math.ceil((100 - m0) / f), lambda j: m0 + j * f >= 100)
+            morte_madura = planta._ciclo_maturacao + limite
+
+        if morte_madura <= z:
+            morte, tipo_morte = morte_madura, "morta"
+        else:
+            morte, tipo_morte = z + 1, "morta_seca"
+
+        eventos = [(morte, tipo_morte)]
+        cruzamentos = set()
+        for limiar in ambiente.LIMIARES_AGUA:
+            if a0 >= limiar:
+                j = _primeiro(math.floor((a0 - limiar) / g) + 1, lambda j: a0 - j * g < limiar)
+                if j <= min(z, morte) and j not in cruzamentos:
+                    cruzamentos.add(j)
+                    eventos.append((j, "agua"))
+        if planta._ciclo_maturacao is not None and planta._ciclo_maturacao <= min(z, morte):
+            eventos.append((planta._ciclo_maturacao, "madura"))
+
+        for j, tipo in eventos:
+            ordem = _ORDEM["morta" if tipo == "morta_seca" else tipo]
+            heapq.heappush(self.fila, (planta._base + j, planta.indice, ordem, next(self._seq),
+                                       planta.versao, tipo, planta))
+
+    def proximo_evento(self):
+        """Ciclo de atualização do próximo evento válido, ou None."""
+        while self.fila:
+            entrada = self.fila[0]
+            if entrada[4] == entrada[6].versao:
+                return entrada[0]
+            heapq.heappop(self.fila)
+        return None
+
+    def processar_ate(self, aplicados, relogio_virtual):
+        """Aplica, em ordem, os eventos até `aplicados` ciclos de atualização."""
+        while self.fila and self.fila[0][0] <= aplicados:
+            momento, _, _, _, versao, tipo, planta = heapq.heappop(self.fila)
+            if versao != planta.versao:
+                continue
+            # Observadores enxergam o campo e o relógio do ciclo do evento
+            self.aplicados = momento
+            relogio_virtual.ciclos = momento - 1
+            if tipo == "morta_seca":
+                # Sem água no início do ciclo: morre sem crescer nesse ciclo
+                planta._rebasear(momento - 1)
+                tipo = "morta"
+            elif tipo == "morta":
+                planta._rebasear(momento)
+            if tipo == "morta":
+                planta._morta = True
+                planta.versao += 1
+            if ambiente._observadores:
+                ambiente.notificar(planta, tipo)
+        self.aplicados = aplicados
+
+
+def _ciclo_devido(relogio_virtual, ultimo, delay, minimo):
+    """Primeiro ciclo >= minimo em que `agora - ultimo < delay` deixa de valer."""
+    if ultimo == float("-inf"):
+        return minimo
+    inicio, passo = relogio_virtual.inicio, relogio_virtual.passo
+    ciclo = max(minimo, math.ceil((ultimo + delay - inicio) / passo) - 2)
+    while inicio + ciclo * passo - ultimo < delay:
+        ciclo += 1
+    return ciclo
+
+
+def executar_por_eventos(ciclos, motor, simulacao=None, relogio_virtual=None):
+    """Equivalente a `simulacao.executar_sem_interface`, pulando os ciclos sem nada a fazer.
+
+    Os agentes são chamados de verdade em todo ciclo com evento de planta e sempre
+    que algum deles tem trabalho (leitura com mudanças, planta a irrigar, alvo a
+    colher). Nos ciclos pulados eles estariam ociosos; só o controle de intervalo
+    deles é atualizado.
+    """
+    from simulacao import Simulacao
+
+    relogio_virtual = relogio_virtual if relogio_virtual is not None else relogio.RelogioVirtual()
+    anterior = relogio.usar(relogio_virtual)
+    try:
+        simulacao = simulacao if simulacao is not None else Simulacao(motor.plantas)
+        simulacao.iniciar_agentes()
+        agente = irrigador.agente_global
+        if agente.limiar_preventivo not in ambiente.LIMIARES_AGUA:
+            raise ValueError("O limiar preventivo do irrigador precisa estar em ambiente.LIMIARES_AGUA")
+
+        ciclo = relogio_virtual.ciclos
+        fim = ciclo + ciclos
+        while ciclo < fim:
+            # Eventos das atualizações deste ciclo, depois os agentes (como em Simulacao.passo)
+            motor.processar_ate(ciclo + 1, relogio_virtual)
+            relogio_virtual.ciclos = ciclo
+            simulacao.acionar_agentes()
+
+            # Próxima parada: evento de planta ou agente com trabalho
+            seguinte = ciclo + 1
+            paradas = [fim - 1]
+            evento = motor.proximo_evento()
+            if evento is not None:
+                paradas.append(evento - 1)
+            sensor_ocioso = not sensor.tem_leitura_pendente(simulacao.plantas)
+            irrigador_ocioso = not agente.tem_trabalho(simulacao.candidatos_irrigador())
+            colhedor_ocioso = not colhedor.tem_alvo(simulacao.candidatos_colhedor())
+            if not sensor_ocioso:
+                paradas.append(_ciclo_devido(relogio_virtual, sensor.ultimo_tempo, sensor.delay, seguinte))
+            if not irrigador_ocioso:
+                paradas.append(_ciclo_devido(relogio_virtual, agente.ultimo_tempo, agente.delay, seguinte))
+            if not colhedor_ocioso:
+                paradas.append(_ciclo_devido(relogio_virtual, colhedor.ultimo_tempo, colhedor.delay, seguinte))
+            proximo = max(seguinte, min(paradas))
+
+            # Chamadas ociosas nos ciclos pulados só teriam marcado o horário da ação
+            if sensor_ocioso:
+                sensor.ultimo_tempo = _ultima_chamada(relogio_virtual, sensor.ultimo_tempo, sensor.delay,
+                                                      seguinte, proximo)
+            if irrigador_ocioso:
+                agente.ultimo_tempo = _ultima_chamada(relogio_virtual, agente.ultimo_tempo, agente.delay,
+                                                      seguinte, proximo)
+            if colhedor_ocioso:
+                colhedor.ultimo_tempo = _ultima_chamada(relogio_virtual, colhedor.ultimo_tempo, colhedor.delay,
+                                                        seguinte, proximo)
+            ciclo = proximo
+
+        relogio_virtual.ciclos = fim
+    finally:
+        relogio.usar(anterior)
+        irrigador.agente_global.historico.fechar()
+    return simulacao
+
+
+def _ultima_chamada(relogio_virtual, ultimo, delay, inicio, fim):
+    """Horário da última chamada fora do intervalo nos ciclos [inicio, fim)."""
+    agora = lambda ciclo: relogio_virtual.inicio + ciclo * relogio_virtual.passo  # noqa: E731
+    ciclo = _ciclo_devido(relogio_virtual, ultimo, delay, inicio)
+    if delay <= 0 and ciclo < fim:
+        # Sem intervalo, todo ciclo chama o agente: vale o último
+        return agora(fim - 1)
+    while ciclo < fim:
+        ultimo = agora(ciclo)
+        ciclo = _ciclo_devido(relogio_virtual, ultimo, delay, ciclo + 1)
+    return ultimo
+
+
+def main(argv=None):
+    from simulacao import Simulacao
+
+    parser = argparse.ArgumentParser(description="Simulação sem interface pelo motor de eventos")
+    parser.add_argument("--ciclos", type=int, default=12 * 3600 * 24 * 7,
+                        help="quantidade de ciclos (padrão: uma semana simulada)")
+    parser.add_argument("--plantas", type=int, default=20, help="quantidade de plantas no campo")
+    parser.add_argument("--irrigador", choices=("limiar", "prazo"), default="limiar")
+    parser.add_argument("--colhedor", choices=("proximidade", "prazo"), default="proximidade")
+    parser.add_argument("--semente", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    motor = MotorEventos.em_grade(args.plantas, random.Random(args.semente))
+    simulacao = Simulacao(motor.plantas, modo_irrigador=args.irrigador, politica_colhedor=args.colhedor)
+    relogio_virtual = relogio.RelogioVirtual()
+    executar_por_eventos(args.ciclos, motor, simulacao, relogio_virtual)
+    simulacao.imprimir_relatorio_final(int(relogio_virtual.agora() - relogio_virtual.inicio))
+
+
+if __name__ == "__main__":
+    main()
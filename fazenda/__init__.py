@@ -0,0 +1,23 @@
+"""Núcleo da simulação da fazenda, importável sem pygame.
+
+Reúne o que lotes, benchmarks e scripts usam (plantas, agentes, relógio, campo
+NumPy e o laço da simulação) sem tocar na interface: nada aqui importa pygame
+nem abre janela. Os módulos continuam na raiz do projeto, então `python
+simulacao.py` e os demais comandos seguem valendo; a interface gráfica
+(main.py e visual.py) só é carregada por `python -m fazenda interface`.
+
+Por isso o pacote não funciona sozinho (não há instalação): a raiz do projeto
+precisa estar no sys.path, o que acontece ao rodar de dentro dela ou com
+PYTHONPATH apontando para ela.
+"""
+import relogio
+from agentes import colhedor, irrigador, sensor
+from agregados import Agregados
+from ambiente import Planta
+from campo import Campo
+from simulacao import Simulacao, criar_plantas, executar_sem_interface, reiniciar_agentes
+
+__all__ = [
+    "Agregados", "Campo", "Planta", "Simulacao", "colhedor", "criar_plantas", "executar_sem_interface",
+    "irrigador", "reiniciar_agentes", "relogio", "sensor",
+]
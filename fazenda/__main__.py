@@ -0,0 +1,33 @@
+"""Ponto de entrada: python -m fazenda [comando] [opções do comando]
+
+Comandos (cada um aceita --help):
+  interface  janela pygame, o padrão (main.py)
+  simular    simulação sem interface, relógio virtual (simulacao.py)
+  eventos    motor de eventos, avanço rápido (eventos.py)
+  lote       episódios Monte Carlo em vários núcleos (lote.py)
+  ajuste     busca de limiares e intervalos dos agentes (ajuste.py)
+  registro   resumo e reprodução de um registro de eventos (registro.py)
+
+Só o módulo do comando escolhido é importado: os comandos sem interface
+nunca carregam o pygame. Os comandos são os módulos da raiz do projeto: rode
+de dentro dela (ou com PYTHONPATH=<raiz>).
+"""
+import importlib
+import sys
+
+COMANDOS = {"interface": "main", "simular": "simulacao", "eventos": "eventos", "lote": "lote", "ajuste": "ajuste",
+            "registro": "registro"}
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv and argv[0] in ("-h", "--help"):
+        print(__doc__.strip())
+        return 0
+    comando = argv.pop(0) if argv and argv[0] in COMANDOS else "interface"
+    sys.argv[0] = f"python -m fazenda {comando}"  # nome mostrado pelo argparse do comando
+    return importlib.import_module(COMANDOS[comando]).main(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,173 @@
+"""Executa muitos episódios sem interface em paralelo e agrega os resultados.
+
+Cada episódio tem o próprio gerador de números aleatórios, derivado da semente
+base e do número do episódio, então qualquer episódio pode ser reproduzido
+isoladamente. Os resultados são gravados (JSON Lines) à medida que terminam.
+
+Uso: python lote.py --episodios 1000 --ciclos 43200 --saida resultados.jsonl
+"""
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import time
+
+import ambiente
+import relogio
+from agentes import sensor
+from simulacao import Simulacao, criar_plantas, executar_sem_interface
+
+METRICAS = ("colhidas", "mortas", "taxa_sucesso")
+
+
+def semente_do_episodio(semente_base, episodio):
+    """Semente determinística e distinta para cada episódio."""
+    return (semente_base << 32) + episodio
+
+
+def criar_simulacao(config, semente):
+    """Monta a simulação do episódio conforme o motor escolhido."""
+    parametros = config.get("parametros") or {}
+    opcoes = dict(
+        modo_irrigador=config["irrigador"],
+        politica_colhedor=config["colhedor"],
+        colhedor_indexado=config.get("colhedor_indexado", False),
+        parametros_agentes=parametros,
+    )
+    # Tipo de lavoura e faixas do sensor valem desde o plantio (os processos do pool são reaproveitados)
+    ambiente.definir_faixa_consumo(*config.get("consumo") or ())
+    sensor.configurar(**parametros.get("sensor", {}))
+    motor = config.get("motor", "ciclos")
+    if motor == "vetorizado":
+        from campo import Campo
+        return Simulacao(campo=Campo.em_grade(config["plantas"], semente=semente), **opcoes), None
+    if motor == "eventos":
+        from eventos import MotorEventos
+        motor_eventos = MotorEventos.em_grade(config["plantas"], random.Random(semente))
+        return Simulacao(motor_eventos.plantas, **opcoes), motor_eventos
+    return Simulacao(criar_plantas(config["plantas"], random.Random(semente)), **opcoes), None
+
+
+def executar_episodio(tarefa):
+    """Roda um episódio completo; executado nos processos do pool."""
+    episodio, semente, config = tarefa
+    inicio = time.perf_counter()
+    simulacao, motor_eventos = criar_simulacao(config, semente)
+    relogio_virtual = relogio.RelogioVirtual()
+    if motor_eventos is not None:
+        from eventos import executar_por_eventos
+        executar_por_eventos(config["ciclos"], motor_eventos, simulacao, relogio_virtual)
+    else:
+        executar_sem_interface(config["ciclos"], simulacao, relogio_virtual)
+
+    colhidas, mortas = simulacao.plantas_colhidas, simulacao.plantas_mortas
+    return {
+        "episodio": episodio,
+        "semente": semente,
+        "colhidas": colhidas,
+        "mortas": mortas,
+        "vivas": simulacao.plantas_vivas(),
+        "taxa_sucesso": colhidas / (colhidas + mortas) * 100 if colhidas + mortas else None,
+        "segundos": time.perf_counter() - inicio,
+    }
+
+
+def resumir(valores, nivel=0.95):
+    """Média, desvio padrão e intervalo de confiança (aproximação normal) da média."""
+    valores = [v for v in valores if v is not None]
+    n = len(valores)
+    if n == 0:
+        return {"n": 0, "media": None, "desvio": None, "ic": None}
+    media = statistics.fmean(valores)
+    desvio = statistics.stdev(valores) if n > 1 else 0.0
+    z = statistics.NormalDist().inv_cdf(0.5 + nivel / 2)
+    margem = z * desvio / math.sqrt(n)
+    return {"n": n, "media": media, "desvio": desvio, "ic": (media - margem, media + margem)}
+
+
+def executar_lote(config, episodios, processos=None, saida=None, semente_base=0, ao_terminar=None):
+    """Distribui os episódios pelo pool e devolve o resumo de cada métrica.
+
+    `saida`, se informado, recebe uma linha JSON por episódio assim que ele termina.
+    """
+    tarefas = [(e, semente_do_episodio(semente_base, e), config) for e in range(episodios)]
+    resultados = {metrica: [] for metrica in METRICAS}
+    arquivo = open(saida, "w", encoding="utf-8") if saida else None
+    try:
+        with multiprocessing.Pool(processos) as pool:
+            for resultado in pool.imap_unordered(executar_episodio, tarefas, chunksize=1):
+                for metrica in METRICAS:
+                    resultados[metrica].append(resultado[metrica])
+                if arquivo is not None:
+                    arquivo.write(json.dumps(resultado) + "\n")
+                    arquivo.flush()
+                if ao_terminar is not None:
+                    ao_terminar(resultado)
+    finally:
+        if arquivo is not None:
+            arquivo.close()
+    return {metrica: resumir(valores) for metrica, valores in resultados.items()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--episodios", type=int, default=100)
+    parser.add_argument("--ciclos", type=int, default=12 * 3600, help="ciclos por episódio (12 = 1 s simulado)")
+    parser.add_argument("--plantas", type=int, default=20)
+    parser.add_argument("--irrigador", choices=("limiar", "prazo"), default="limiar")
+    parser.add_argument("--colhedor", choices=("proximidade", "prazo"), default="proximidade")
+    parser.add_argument("--colhedor-indexado", action="store_true")
+    parser.add_argument("--motor", choices=("ciclos", "vetorizado", "eventos"), default="ciclos")
+    parser.add_argument("--processos", type=int, default=None, help="padrão: todos os núcleos")
+    parser.add_argument("--semente-base", type=int, default=0)
+    parser.add_argument("--saida", default=None, help="arquivo JSON Lines com um resultado por episódio")
+    parser.add_argument("--consumo", type=float, nargs=2, metavar=("MIN", "MAX"), default=None,
+                        help="faixa do fator_consumo sorteado para as plantas (padrão: 0.3 1.0)")
+    parser.add_argument("--parametros", metavar="ARQUIVO", default=None,
+                        help="parâmetros dos agentes gravados por python ajuste.py --saida")
+    args = parser.parse_args(argv)
+
+    config = {
+        "ciclos": args.ciclos,
+        "plantas": args.plantas,
+        "irrigador": args.irrigador,
+        "colhedor": args.colhedor,
+        "colhedor_indexado": args.colhedor_indexado,
+        "motor": args.motor,
+        "consumo": args.consumo,
+    }
+    if args.parametros:
+        with open(args.parametros, encoding="utf-8") as arquivo:
+            config["parametros"] = json.load(arquivo)["parametros"]
+    processos = args.processos or os.cpu_count()
+    print(f"{args.episodios} episódios de {args.ciclos} ciclos em {processos} processos...")
+
+    concluidos = 0
+
+    def progresso(_):
+        nonlocal concluidos
+        concluidos += 1
+        if concluidos % max(1, args.episodios // 20) == 0 or concluidos == args.episodios:
+            print(f"  {concluidos}/{args.episodios}", file=sys.stderr)
+
+    inicio = time.perf_counter()
+    resumo = executar_lote(config, args.episodios, processos, args.saida, args.semente_base, progresso)
+    print(f"Concluído em {time.perf_counter() - inicio:.1f}s")
+
+    print("=" * 50)
+    for metrica in METRICAS:
+        r = resumo[metrica]
+        if r["n"] == 0:
+            print(f"{metrica}: sem dados")
+            continue
+        print(f"{metrica}: média {r['media']:.2f} ± {r['ic'][1] - r['media']:.2f} "
+              f"(IC 95% {r['ic'][0]:.2f} – {r['ic'][1]:.2f}, desvio {r['desvio']:.2f}, n={r['n']})")
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    main()
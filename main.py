@@ -1,153 +1,232 @@
-import pygame
+import argparse
 import time
-from ambiente import Planta
-from visual import (
-    CORES,
-    criar_fontes,
-    desenhar_grid_fundo,
-    desenhar_planta_melhorada,
-    desenhar_agente_melhorado,
-    desenhar_hud_melhorado,
-    desenhar_estatisticas_tempo_real,
-    obter_tempo_pygame,
-)
-from agentes.irrigador import agir_irrigador
-from agentes.colhedor import agir_colhedor
-from agentes import sensor
-
-# Inicialização do Pygame
-pygame.init()
-LARGURA, ALTURA = 1000, 600
-tela = pygame.display.set_mode((LARGURA, ALTURA))
-pygame.display.set_caption("Sistema de Agricultura Automatizada - IA Competitiva")
-
-# Fontes e tempo
-fonte_principal, fonte_pequena = criar_fontes()
-TEMPO_INICIAL = time.time()
-relogio = pygame.time.Clock()
-
-# Inicialização das plantas
-plantas = [Planta(80 + (i % 5) * 130, 80 + (i // 5) * 110) for i in range(20)]
-
-# Estados iniciais dos agentes
-pos_irrigador = (0, 0)
-pos_colhedor = (0, 0)
-ultima_acao_irrigador = "Inicializando..."
-ultima_acao_colhedor = "Inicializando..."
-ultimas_leituras_sensor = "Coletando dados..."
-irrigador_ativo = False
-colhedor_ativo = False
-
-# Contadores e controle de relatórios
-plantas_colhidas = plantas_mortas = 0
-plantas_colhidas_anterior = plantas_mortas_anterior = 0
-ultimo_relatorio = -1
-
-rodando = True
-
-print("Sistema de Agricultura Automatizada Iniciado!")
-print("Monitoramento visual melhorado ativo")
-print("Agentes IA: Irrigador, Colhedor e Sensor")
-print("-" * 50)
-
-while rodando:
-    for evento in pygame.event.get():
-        if evento.type == pygame.QUIT:
-            rodando = False
-        elif evento.type == pygame.KEYDOWN:
-            if evento.key == pygame.K_SPACE:
-                print(f"Pausado - Tempo: {int(time.time() - TEMPO_INICIAL)}s")
-                pygame.time.wait(1000)
-            elif evento.key == pygame.K_r:
-                plantas = [Planta(80 + (i % 5) * 130, 80 + (i // 5) * 110) for i in range(20)]
-                plantas_colhidas = plantas_mortas = 0
-                plantas_colhidas_anterior = plantas_mortas_anterior = 0
-                ultima_acao_irrigador = ultima_acao_colhedor = "Inicializando..."
-                ultimas_leituras_sensor = "Coletando dados..."
-                ultimo_relatorio = -1
-                print("Sistema reiniciado!")
-
-    tela.fill(CORES['BRANCO'])
-    desenhar_grid_fundo(tela, 780, ALTURA)
-
-    for planta in plantas:
-        planta.atualizar()
-
-    # Sensor: deve ser chamado antes dos demais agentes
-    ultimas_leituras_sensor = sensor.agir_sensor(plantas)
-
-    # Irrigador depende exclusivamente das listas do sensor
-    nova_pos_irrig, acao_irrig = agir_irrigador(sensor.plantas_criticas + sensor.plantas_preventivas)
-    if tuple(nova_pos_irrig) != (0, 0):
-        pos_irrigador = tuple(nova_pos_irrig)
-    ultima_acao_irrigador = acao_irrig
-    irrigador_ativo = "Irrigou" in acao_irrig
-
-    # Colhedor depende exclusivamente das listas do sensor
-    nova_pos_colh, acao_colh, colhida, morta = agir_colhedor(sensor.plantas_maduras + sensor.plantas_mortas, pos_colhedor)
-    if tuple(nova_pos_colh) != (0, 0):
-        pos_colhedor = tuple(nova_pos_colh)
-    ultima_acao_colhedor = acao_colh
-    colhedor_ativo = "Colheu" in acao_colh
-    plantas_colhidas += colhida
-    plantas_mortas += morta
-
-    tempo_atual = obter_tempo_pygame()
-    tempo_passado = int(time.time() - TEMPO_INICIAL)
-
-    for planta in plantas:
-        desenhar_planta_melhorada(tela, planta, fonte_pequena, tempo_atual)
-
-    desenhar_agente_melhorado(tela, pos_irrigador, "irrigador", irrigador_ativo, fonte_pequena)
-    desenhar_agente_melhorado(tela, pos_colhedor, "colhedor", colhedor_ativo, fonte_pequena)
-
-    desenhar_hud_melhorado(
-        tela, fonte_principal, fonte_pequena,
-        ultima_acao_irrigador, ultima_acao_colhedor, ultimas_leituras_sensor,
-        plantas_colhidas, plantas_mortas, tempo_passado, len(plantas), plantas_vivas=sum(1 for p in plantas if not p.morta and not p.coletada)
+
+from passo_fixo import VELOCIDADES, ExecutorPassoFixo, interpolar
+from perfil import Captura, PerfilQuadros
+from registro import RegistroEventos
+from restauracao import PontosRestauracao
+from simulacao import Simulacao, criar_plantas
+
+parser = argparse.ArgumentParser(description="Sistema de Agricultura Automatizada")
+parser.add_argument("--quadro-completo", action="store_true",
+                    help="redesenha a tela inteira a cada quadro em vez de só as regiões alteradas")
+parser.add_argument("--trace", metavar="ARQUIVO",
+                    help="ao sair, grava o tempo de cada fase como trace do Chrome (.json) ou CSV (.csv)")
+parser.add_argument("--registro", metavar="ARQUIVO",
+                    help="grava as transições de estado das plantas (ver python registro.py)")
+parser.add_argument("--quadros-captura", type=int, default=300,
+                    help="quadros capturados por cProfile/tracemalloc ao apertar C")
+parser.add_argument("--pontos", metavar="ARQUIVO", default="pontos_restauracao.bin",
+                    help="arquivo dos pontos de restauração (F5 salva, F9 restaura o último, F8 volta mais um)")
+parser.add_argument("--pontos-k", type=int, default=8, help="quantos pontos de restauração manter")
+parser.add_argument("--fps", type=int, default=30, help="quadros desenhados por segundo (a simulação roda a 12 ciclos/s)")
+parser.add_argument("--velocidade", type=int, choices=VELOCIDADES, default=1,
+                    help="tempo simulado por segundo real; as teclas 1, 2 e 3 trocam entre 1x, 10x e 100x")
+parser.add_argument("--irrigadores", type=int, default=1, help="quantidade de irrigadores")
+parser.add_argument("--colhedores", type=int, default=1, help="quantidade de colhedores")
+parser.add_argument("--despacho", choices=("hungaro", "guloso"), default=None,
+                    help="como a frota escolhe os alvos (padrão com mais de um agente: hungaro)")
+parser.add_argument("--agentes-processos", action="store_true",
+                    help="roda irrigador e colhedor em processos próprios, lendo a lousa do sensor")
+parser.add_argument("--sem-interpolacao", action="store_true",
+                    help="desenha o último instantâneo como está, sem interpolar entre os dois últimos")
+parser.add_argument("--plantas", type=int, default=20, help="quantidade de plantas (5 por linha)")
+parser.add_argument("--detalhe", choices=("auto", "plantas", "mapa"), default="auto",
+                    help="plantas uma a uma ou mapa de calor; auto usa o mapa quando elas não cabem legíveis "
+                         "na tela (a tecla M alterna)")
+parser.add_argument("--camada", choices=("estado", "agua", "maturidade"), default="estado",
+                    help="o que o mapa de calor colore (a tecla H alterna)")
+parser.add_argument("--conferir-agregados", action="store_true",
+                    help="confere os totais do HUD com uma recontagem completa a cada leitura (depuração, lento)")
+
+
+def main(argv=None):
+    args = parser.parse_args(argv)
+
+    # A interface é o único lugar que usa pygame: importada só aqui, então importar
+    # este módulo (como fazem os processos filhos com spawn) não inicia o SDL
+    import pygame
+
+    from visual import (
+        QuadroIncremental,
+        cache_texto,
+        criar_fontes,
+        desenhar_perfil,
+        desenhar_quadro,
+        mapa_calor,
+        obter_tempo_pygame,
     )
 
-    desenhar_estatisticas_tempo_real(tela, fonte_pequena, plantas)
-
-    if plantas_colhidas != plantas_colhidas_anterior:
-        print(f"Planta colhida! Total: {plantas_colhidas}")
-        plantas_colhidas_anterior = plantas_colhidas
-    if plantas_mortas != plantas_mortas_anterior:
-        print(f"Planta morreu! Total: {plantas_mortas}")
-        plantas_mortas_anterior = plantas_mortas
-
-    if tempo_passado % 30 == 0 and tempo_passado != ultimo_relatorio and tempo_passado > 0:
-        vivas = sum(1 for p in plantas if not p.morta and not p.coletada)
-        if vivas > 0:
-            agua_media = sum(p.agua for p in plantas if not p.morta and not p.coletada) / vivas
-            maturidade_media = sum(p.maturidade for p in plantas if not p.morta and not p.coletada) / vivas
-            print(f"Relatório {tempo_passado}s - Vivas: {vivas}, Água: {agua_media:.1f}%, Maturidade: {maturidade_media:.1f}%")
-        ultimo_relatorio = tempo_passado
-
-    pygame.display.flip()
-    relogio.tick(12)
-
-print("\n" + "="*50)
-print("RELATÓRIO FINAL DO SISTEMA")
-print("="*50)
-print(f"Tempo total de execução: {tempo_passado} segundos")
-print(f"Total de plantas: {len(plantas)}")
-print(f"Plantas colhidas: {plantas_colhidas}")
-print(f"Plantas mortas: {plantas_mortas}")
-vivas_final = sum(1 for p in plantas if not p.morta and not p.coletada)
-print(f"Plantas ainda vivas: {vivas_final}")
-
-if plantas_colhidas + plantas_mortas > 0:
-    taxa_sucesso = plantas_colhidas / (plantas_colhidas + plantas_mortas) * 100
-    print(f"Taxa de sucesso: {taxa_sucesso:.1f}%")
-    if taxa_sucesso >= 80:
-        print("EXCELENTE! Sistema altamente eficiente!")
-    elif taxa_sucesso >= 60:
-        print("BOM! Sistema funcionando adequadamente")
-    elif taxa_sucesso >= 40:
-        print("REGULAR. Sistema precisa de ajustes")
-    else:
-        print("CRÍTICO! Sistema requer revisão urgente")
-print("=" * 50)
-
-pygame.quit()
\ No newline at end of file
+    # Inicialização do Pygame
+    pygame.init()
+    LARGURA, ALTURA = 1000, 600
+    tela = pygame.display.set_mode((LARGURA, ALTURA))
+    pygame.display.set_caption("Sistema de Agricultura Automatizada - IA Competitiva")
+
+    # Fontes e tempo
+    fonte_principal, fonte_pequena = criar_fontes()
+    relogio = pygame.time.Clock()
+    quadro = None if args.quadro_completo else QuadroIncremental(tela, fonte_principal, fonte_pequena)
+    mapa_calor.modo = args.detalhe
+    mapa_calor.camada = args.camada
+
+    # Instrumentação: P mostra os percentis por fase, C liga/desliga cProfile + tracemalloc
+    perfil = PerfilQuadros()
+    captura = Captura(quadros=args.quadros_captura)
+    mostrar_perfil = False
+
+    # Plantas, agentes e contadores ficam no estado da simulação, que avança na
+    # própria thread em passos fixos; a interface só lê os instantâneos publicados
+    opcoes_agentes = dict(irrigadores=args.irrigadores, colhedores=args.colhedores, despacho=args.despacho,
+                          agentes_em_processos=args.agentes_processos, conferir_agregados=args.conferir_agregados,
+                          esperar_agentes=False)
+    simulacao = Simulacao(criar_plantas(args.plantas), **opcoes_agentes)
+    simulacao.perfil = perfil
+    executor = ExecutorPassoFixo(simulacao, args.velocidade, verboso=True)
+    anterior = atual = executor.instantaneo
+
+    # Registro binário opcional das transições das plantas (gravado em segundo plano)
+    registro = None
+    if args.registro:
+        registro = RegistroEventos(args.registro)
+        registro.acompanhar(simulacao.plantas)
+
+    # Pontos de restauração: o arquivo só é criado no primeiro uso de F5/F8/F9
+    pontos = None
+    voltar = 0  # quantos pontos atrás está o último restaurado
+
+    def abrir_pontos():
+        nonlocal pontos
+        if pontos is None:
+            pontos = PontosRestauracao(args.pontos, len(simulacao.plantas), args.pontos_k)
+        return pontos
+
+    rodando = True
+
+    print("Sistema de Agricultura Automatizada Iniciado!")
+    print("Monitoramento visual melhorado ativo")
+    print("Agentes IA: Irrigador, Colhedor e Sensor")
+    print("-" * 50)
+
+    executor.start()
+    while rodando:
+        # Tudo o que o quadro faz, menos a espera do relógio
+        with perfil.fase("quadro"):
+            with perfil.fase("eventos"):
+                for evento in pygame.event.get():
+                    if evento.type == pygame.QUIT:
+                        rodando = False
+                    elif evento.type == pygame.KEYDOWN:
+                        if evento.key == pygame.K_SPACE:
+                            print(f"Pausado - Tempo: {int(atual.tempo)}s")
+                            with executor.trava:
+                                pygame.time.wait(1000)
+                        elif evento.key == pygame.K_r:
+                            with executor.trava:
+                                simulacao.encerrar_agentes()
+                                simulacao = Simulacao(criar_plantas(args.plantas), **opcoes_agentes)
+                                simulacao.perfil = perfil
+                                executor.trocar(simulacao)
+                                if registro is not None:
+                                    registro.acompanhar(simulacao.plantas)
+                            print("Sistema reiniciado!")
+                        elif evento.key in (pygame.K_1, pygame.K_2, pygame.K_3):
+                            executor.velocidade = VELOCIDADES[evento.key - pygame.K_1]
+                            print(f"Velocidade da simulação: {executor.velocidade}x")
+                        elif evento.key == pygame.K_F5:
+                            with executor.trava:
+                                print(f"Ponto de restauração {abrir_pontos().salvar(simulacao)} salvo")
+                            voltar = 0
+                        elif evento.key in (pygame.K_F9, pygame.K_F8):
+                            alvo = 0 if evento.key == pygame.K_F9 else voltar + 1
+                            try:
+                                with executor.trava:
+                                    ciclo = abrir_pontos().restaurar(simulacao, alvo)
+                                    executor.publicar()
+                                    if registro is not None:
+                                        registro.acompanhar(simulacao.plantas)
+                            except IndexError as erro:
+                                print(f"Nada a restaurar: {erro}")
+                            else:
+                                voltar = alvo
+                                atras = f" ({alvo} antes do mais recente)" if alvo else ""
+                                print(f"Restaurado o ponto do ciclo {ciclo}{atras}")
+                        elif evento.key == pygame.K_m:
+                            print(f"Nível de detalhe: {mapa_calor.alternar_modo()}")
+                        elif evento.key == pygame.K_h:
+                            print(f"Mapa de calor: {mapa_calor.alternar_camada()}")
+                        elif evento.key == pygame.K_p:
+                            mostrar_perfil = not mostrar_perfil
+                        elif evento.key == pygame.K_c:
+                            if not captura.ativa:
+                                print(f"Captura cProfile/tracemalloc iniciada ({captura.quadros} quadros)")
+                            for arquivo in captura.alternar():
+                                print(f"Captura gravada em {arquivo}")
+
+            with perfil.fase("instantaneo"):
+                novo = executor.instantaneo
+                if novo is not atual:
+                    anterior, atual = atual, novo
+                if args.sem_interpolacao:
+                    estado = atual
+                else:
+                    # Desenha entre os dois últimos instantâneos, um intervalo de publicação atrasado
+                    intervalo = atual.publicado - anterior.publicado
+                    alfa = (time.perf_counter() - atual.publicado) / intervalo if intervalo > 0 else 1.0
+                    estado = interpolar(anterior, atual, alfa)
+
+            tempo_atual = obter_tempo_pygame()
+            tempo_passado = int(atual.tempo)
+
+            with perfil.fase("desenhar"):
+                if quadro is None:
+                    desenhar_quadro(tela, fonte_principal, fonte_pequena, estado, tempo_atual, tempo_passado, perfil)
+                    regioes = None
+                else:
+                    regioes = quadro.desenhar(estado, tempo_atual, tempo_passado, perfil)
+
+                if mostrar_perfil:
+                    area_perfil = desenhar_perfil(tela, fonte_pequena, perfil.resumo())
+                    # Agendador: quanto cada agente esperou no ciclo, a execução mais longa e os estouros
+                    area_agentes = desenhar_perfil(tela, fonte_pequena, simulacao.agendador.resumo(),
+                                                   pos=(10, area_perfil.bottom + 6),
+                                                   cabecalho=("agente (ms)", "atraso", "máx", "estouros"))
+                    if quadro is not None:
+                        # A sobreposição não faz parte do quadro: é apagada no próximo
+                        for area in (area_perfil, area_agentes):
+                            regioes.append(area)
+                            quadro.invalidar(area)
+
+            with perfil.fase("apresentar"):
+                if regioes is None:
+                    pygame.display.flip()
+                else:
+                    # Envia para a janela só os retângulos que mudaram
+                    pygame.display.update(regioes)
+
+        for arquivo in captura.quadro_concluido():
+            print(f"Captura gravada em {arquivo}")
+
+        with perfil.fase("espera"):
+            relogio.tick(args.fps)
+
+    executor.parar()
+    simulacao.encerrar_agentes()
+    for arquivo in captura.parar():
+        print(f"Captura gravada em {arquivo}")
+    simulacao.imprimir_relatorio_final(tempo_passado)
+    print(f"Cache de texto: {cache_texto.taxa_acerto():.1%} de acertos")
+    if pontos is not None:
+        pontos.fechar()
+    if registro is not None:
+        registro.fechar()
+        print(f"Registro de eventos gravado em {args.registro}")
+    if args.trace:
+        perfil.exportar(args.trace)
+        print(f"Trace das fases gravado em {args.trace}")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
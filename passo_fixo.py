@@ -0,0 +1,176 @@
+"""Simulação em passo fixo numa thread própria, publicando instantâneos para a interface.
+
+`ExecutorPassoFixo` avança a simulação com um relógio virtual: a cada rodada
+calcula quantos passos de `relogio.PASSO_PADRAO` a `velocidade` pede desde a
+rodada anterior, roda todos e publica um `Instantaneo` imutável. A interface
+desenha o instantâneo mais recente no próprio ritmo (ver `interpolar`), então um
+quadro lento não atrasa o tempo simulado e a simulação pode andar mais rápido do
+que a tela consegue desenhar.
+
+Quem precisar mexer na simulação de fora (reiniciar, restaurar um ponto) usa
+`with executor.trava:`; a thread só avança passos com a trava em mãos. A trava
+é reentrante, então `trocar` e `publicar` podem ser chamados dentro dela.
+"""
+import threading
+import time
+from collections import namedtuple
+
+import relogio
+
+VELOCIDADES = (1, 10, 100)
+
+EstadoPlanta = namedtuple("EstadoPlanta", "x y agua maturidade morta coletada")
+
+
+class Instantaneo(namedtuple("Instantaneo", (
+    "plantas", "plantas_origem", "agentes", "pos_irrigador", "pos_colhedor", "irrigador_ativo", "colhedor_ativo",
+    "ultima_acao_irrigador", "ultima_acao_colhedor", "ultimas_leituras_sensor",
+    "plantas_colhidas", "plantas_mortas", "ciclo", "tempo", "publicado", "estatisticas",
+))):
+    """Cópia imutável do que a interface desenha, com a mesma interface de `Simulacao`.
+
+    `plantas_origem` é a lista de plantas da simulação copiada: instantâneos do
+    mesmo campo têm a mesma origem. `tempo` é o tempo simulado (s) e `publicado`
+    o instante (time.perf_counter) em que o instantâneo foi criado;
+    `estatisticas` é o `resumo_estatisticas()` da simulação naquele ciclo.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def de(cls, simulacao, relogio_virtual):
+        plantas = tuple(EstadoPlanta(p.x, p.y, p.agua, p.maturidade, p.morta, p.coletada)
+                        for p in simulacao.plantas)
+        return cls(
+            plantas, simulacao.plantas, tuple(simulacao.agentes), simulacao.pos_irrigador, simulacao.pos_colhedor,
+            simulacao.irrigador_ativo, simulacao.colhedor_ativo, simulacao.ultima_acao_irrigador,
+            simulacao.ultima_acao_colhedor, simulacao.ultimas_leituras_sensor,
+            simulacao.plantas_colhidas, simulacao.plantas_mortas, relogio_virtual.ciclos,
+            relogio_virtual.agora() - relogio_virtual.inicio, time.perf_counter(), simulacao.resumo_estatisticas(),
+        )
+
+    def resumo_estatisticas(self):
+        return self.estatisticas
+
+    def plantas_vivas(self):
+        return self.estatisticas[1]
+
+
+def _misturar(a, b, alfa):
+    return a + (b - a) * alfa
+
+
+def interpolar(anterior, atual, alfa):
+    """Estado intermediário entre dois instantâneos (alfa 0 = `anterior`, 1 = `atual`).
+
+    Só água, maturidade e posição dos agentes são interpoladas; plantas que
+    mudaram de situação (morreram, foram colhidas ou replantadas) aparecem
+    direto como em `atual`, assim como tudo o que é texto ou contador.
+    """
+    if anterior is None or alfa >= 1 or anterior.plantas_origem is not atual.plantas_origem:
+        return atual
+    alfa = max(0.0, alfa)
+    plantas = tuple(
+        b if (a.morta, a.coletada) != (b.morta, b.coletada) or b.maturidade < a.maturidade
+        else b._replace(agua=_misturar(a.agua, b.agua, alfa), maturidade=_misturar(a.maturidade, b.maturidade, alfa))
+        for a, b in zip(anterior.plantas, atual.plantas)
+    )
+
+    def posicao(a, b):
+        return round(_misturar(a[0], b[0], alfa)), round(_misturar(a[1], b[1], alfa))
+
+    agentes = atual.agentes
+    if len(anterior.agentes) == len(agentes):
+        agentes = tuple((tipo, posicao(a[1], pos), ativo) for a, (tipo, pos, ativo) in zip(anterior.agentes, agentes))
+
+    # Médias interpoladas só se as contagens são as mesmas nos dois instantâneos
+    estatisticas = atual.estatisticas
+    if anterior.estatisticas[:4] == estatisticas[:4]:
+        estatisticas = estatisticas[:4] + tuple(_misturar(a, b, alfa)
+                                                for a, b in zip(anterior.estatisticas[4:], estatisticas[4:]))
+    return atual._replace(
+        plantas=plantas,
+        agentes=agentes,
+        estatisticas=estatisticas,
+        pos_irrigador=posicao(anterior.pos_irrigador, atual.pos_irrigador),
+        pos_colhedor=posicao(anterior.pos_colhedor, atual.pos_colhedor),
+    )
+
+
+class ExecutorPassoFixo(threading.Thread):
+    """Roda `simulacao` em passos fixos de tempo simulado, `velocidade` vezes o tempo real.
+
+    Se uma rodada ficar mais de `max_atraso` segundos (de parede) para trás, o
+    atraso é descartado em vez de acumulado: a simulação fica mais lenta que o
+    pedido, mas não entra numa espiral de rodadas cada vez maiores.
+    """
+
+    def __init__(self, simulacao, velocidade=1, passo=relogio.PASSO_PADRAO, max_atraso=0.25, verboso=False):
+        super().__init__(name="simulacao", daemon=True)
+        self.simulacao = simulacao
+        self.velocidade = velocidade
+        self.passo = passo
+        self.max_atraso = max_atraso
+        self.verboso = verboso
+        self.trava = threading.RLock()
+        self.relogio = relogio.RelogioVirtual(passo)
+        self.passos_descartados = 0
+        self.velocidade_efetiva = 0.0
+        self._parar = threading.Event()
+
+        # Os agentes consultam o relógio global: a partir daqui, o tempo é o simulado
+        self._relogio_anterior = relogio.usar(self.relogio)
+        simulacao.iniciar_agentes()
+        self.instantaneo = Instantaneo.de(simulacao, self.relogio)
+
+    def trocar(self, simulacao):
+        """Passa a rodar outra simulação (ex.: reinício com plantas novas)."""
+        with self.trava:
+            self.simulacao = simulacao
+            simulacao.iniciar_agentes()
+            self.publicar()
+
+    def publicar(self):
+        """Publica o estado atual como um novo instantâneo."""
+        with self.trava:
+            self.instantaneo = Instantaneo.de(self.simulacao, self.relogio)
+
+    def run(self):
+        devido = 0.0  # tempo simulado ainda não executado
+        anterior = medicao = time.perf_counter()
+        ciclos_medicao = self.relogio.ciclos
+        while not self._parar.is_set():
+            agora = time.perf_counter()
+            devido += (agora - anterior) * self.velocidade
+            anterior = agora
+
+            passos = int(devido / self.passo)
+            limite = max(1, int(self.max_atraso * self.velocidade / self.passo))
+            if passos > limite:
+                self.passos_descartados += passos - limite
+                passos = limite
+                devido = 0.0
+            else:
+                devido -= passos * self.passo
+
+            if passos:
+                with self.trava:
+                    for _ in range(passos):
+                        self.simulacao.passo()
+                        if self.verboso:
+                            self.simulacao.imprimir_progresso(int(self.relogio.agora() - self.relogio.inicio))
+                    self.publicar()
+
+            if agora - medicao >= 1.0:
+                self.velocidade_efetiva = (self.relogio.ciclos - ciclos_medicao) * self.passo / (agora - medicao)
+                medicao, ciclos_medicao = agora, self.relogio.ciclos
+
+            # Dorme até o próximo passo ficar devido
+            self._parar.wait(max(0.0, (self.passo - devido) / self.velocidade))
+
+    def parar(self):
+        """Encerra a thread e devolve o relógio global ao anterior."""
+        self._parar.set()
+        if self.is_alive():
+            self.join()
+        relogio.usar(self._relogio_anterior)
@@ -0,0 +1,174 @@
+"""Instrumentação do laço principal: tempo de cada fase, percentis móveis e trace.
+
+`PerfilQuadros.fase(nome)` mede um trecho com `time.perf_counter_ns`. As últimas
+`janela` medidas de cada fase alimentam p50/p95/p99, e todas as medidas (até
+`max_eventos`) podem ser exportadas como trace do Chrome (chrome://tracing,
+Perfetto) ou CSV. `NULO` tem a mesma interface e não mede nada.
+
+`Captura` liga cProfile e tracemalloc durante alguns quadros e grava os resultados.
+"""
+import csv
+import io
+import json
+import time
+from collections import deque
+
+
+class _FaseNula:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        return False
+
+
+_FASE_NULA = _FaseNula()
+
+
+class PerfilNulo:
+    """Perfil desligado: `fase` devolve sempre o mesmo contexto vazio."""
+
+    def fase(self, nome):
+        return _FASE_NULA
+
+
+NULO = PerfilNulo()
+
+
+class _Fase:
+    __slots__ = ("perfil", "nome", "inicio")
+
+    def __init__(self, perfil, nome):
+        self.perfil = perfil
+        self.nome = nome
+
+    def __enter__(self):
+        self.inicio = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *excecao):
+        self.perfil.registrar(self.nome, self.inicio, time.perf_counter_ns())
+        return False
+
+
+class PerfilQuadros:
+    """Tempo por fase com janela móvel de percentis e registro para exportação."""
+
+    def __init__(self, janela=600, max_eventos=500_000):
+        self.janela = janela
+        self.duracoes = {}  # fase -> últimas durações (ns)
+        self.eventos = deque(maxlen=max_eventos)  # (fase, início, duração) em ns
+        self.origem = time.perf_counter_ns()
+
+    def fase(self, nome):
+        return _Fase(self, nome)
+
+    def registrar(self, nome, inicio, fim):
+        duracoes = self.duracoes.get(nome)
+        if duracoes is None:
+            duracoes = self.duracoes[nome] = deque(maxlen=self.janela)
+        duracoes.append(fim - inicio)
+        self.eventos.append((nome, inicio - self.origem, fim - inicio))
+
+    def percentis(self, nome, niveis=(50, 95, 99)):
+        """Percentis (ms) das últimas medidas da fase, pelo método do posto mais próximo."""
+        ordenadas = sorted(self.duracoes.get(nome, ()))
+        if not ordenadas:
+            return tuple(0.0 for _ in niveis)
+        n = len(ordenadas)
+        return tuple(ordenadas[min(n - 1, max(0, -(-nivel * n // 100) - 1))] / 1e6 for nivel in niveis)
+
+    def resumo(self):
+        """[(fase, p50, p95, p99)] em ms, na ordem em que as fases apareceram."""
+        # Cópia das chaves: outra thread (passo_fixo) pode registrar uma fase nova enquanto isso
+        return [(nome, *self.percentis(nome)) for nome in list(self.duracoes)]
+
+    def exportar(self, caminho):
+        """Grava as medidas como trace do Chrome (.json) ou CSV (.csv)."""
+        if caminho.endswith(".csv"):
+            with open(caminho, "w", newline="", encoding="utf-8") as arquivo:
+                escritor = csv.writer(arquivo)
+                escritor.writerow(("fase", "inicio_us", "duracao_us"))
+                for nome, inicio, duracao in self.eventos:
+                    escritor.writerow((nome, inicio / 1e3, duracao / 1e3))
+            return
+
+        eventos = [
+            {"name": nome, "ph": "X", "ts": inicio / 1e3, "dur": duracao / 1e3, "pid": 1, "tid": 1}
+            for nome, inicio, duracao in self.eventos
+        ]
+        with open(caminho, "w", encoding="utf-8") as arquivo:
+            json.dump({"traceEvents": eventos, "displayTimeUnit": "ms"}, arquivo)
+
+
+class Captura:
+    """Liga cProfile e tracemalloc por `quadros` quadros e grava `<prefixo>_<n>.prof/.txt`."""
+
+    def __init__(self, prefixo="captura", quadros=300):
+        self.prefixo = prefixo
+        self.quadros = quadros
+        self.perfilador = None
+        self.restantes = 0
+        self.numero = 0
+
+    @property
+    def ativa(self):
+        return self.perfilador is not None
+
+    def iniciar(self):
+        if self.ativa:
+            return
+        # Só carregados quando alguém captura: a simulação sem interface não paga por eles
+        import cProfile
+        import tracemalloc
+
+        self.numero += 1
+        self.restantes = self.quadros
+        self.memoria_ja_ativa = tracemalloc.is_tracing()
+        if not self.memoria_ja_ativa:
+            tracemalloc.start()
+        self.memoria_inicial = tracemalloc.take_snapshot()
+        self.perfilador = cProfile.Profile()
+        self.perfilador.enable()
+
+    def parar(self):
+        """Encerra a captura e devolve os arquivos gravados."""
+        if not self.ativa:
+            return []
+        import pstats
+        import tracemalloc
+
+        self.perfilador.disable()
+        memoria_final = tracemalloc.take_snapshot()
+        if not self.memoria_ja_ativa:
+            tracemalloc.stop()
+
+        base = f"{self.prefixo}_{self.numero}"
+        self.perfilador.dump_stats(base + ".prof")
+
+        texto = io.StringIO()
+        pstats.Stats(self.perfilador, stream=texto).sort_stats("cumulative").print_stats(30)
+        texto.write("\nMaiores diferenças de memória (tracemalloc)\n")
+        for estatistica in memoria_final.compare_to(self.memoria_inicial, "lineno")[:20]:
+            texto.write(f"{estatistica}\n")
+        with open(base + ".txt", "w", encoding="utf-8") as arquivo:
+            arquivo.write(texto.getvalue())
+
+        self.perfilador = None
+        return [base + ".prof", base + ".txt"]
+
+    def alternar(self):
+        """Inicia ou encerra a captura; devolve os arquivos gravados ao encerrar."""
+        if self.ativa:
+            return self.parar()
+        self.iniciar()
+        return []
+
+    def quadro_concluido(self):
+        """Conta um quadro; encerra sozinha ao fim da janela e devolve os arquivos gravados."""
+        if not self.ativa:
+            return []
+        self.restantes -= 1
+        if self.restantes <= 0:
+            return self.parar()
+        return []
@@ -0,0 +1,284 @@
+"""Registro binário das transições de estado das plantas, com resumo e reprodução.
+
+`RegistroEventos` ouve os avisos das plantas (ambiente.registrar_observador) e
+grava um registro por transição: plantada, madura, água baixa/crítica, irrigada,
+morta, colhida, removida e replantada, com id da planta, ciclo, posição, água e
+maturidade. Os registros são acumulados em memória e entregues em blocos a uma
+thread de escrita, então a simulação nunca espera pelo disco.
+
+Formato: MAGICO, tamanho (uint32) + cabeçalho JSON, e registros com um byte de
+tamanho seguido dos campos de `_REGISTRO` (little-endian).
+
+Uso:
+  python registro.py resumo execucao.reg [--janela 60]
+  python registro.py reproduzir execucao.reg [--ciclos-por-quadro 120]
+"""
+import argparse
+import json
+import queue
+import struct
+import sys
+import threading
+
+import numpy as np
+
+import ambiente
+import relogio
+
+TIPOS = (
+    "plantada", "madura", "agua_baixa", "agua_critica", "irrigada",
+    "morta", "colhida", "removida", "replantada", "reinicio",
+)
+CODIGO = {tipo: codigo for codigo, tipo in enumerate(TIPOS)}
+
+MAGICO = b"REGEV1\n"
+_TAMANHO = struct.Struct("<I")
+# tipo, ciclo, planta, x, y, água, maturidade
+_REGISTRO = struct.Struct("<BQIiiff")
+DTYPE = np.dtype([
+    ("tamanho", "u1"), ("tipo", "u1"), ("ciclo", "<u8"), ("planta", "<u4"),
+    ("x", "<i4"), ("y", "<i4"), ("agua", "<f4"), ("maturidade", "<f4"),
+])
+
+
+class _Escritor(threading.Thread):
+    """Thread que grava no arquivo os blocos de bytes recebidos pela fila."""
+
+    def __init__(self, arquivo):
+        super().__init__(name="registro-eventos", daemon=True)
+        self.arquivo = arquivo
+        self.fila = queue.SimpleQueue()  # sem limite: quem registra nunca espera
+        self.erro = None
+        self.start()
+
+    def run(self):
+        try:
+            while True:
+                bloco = self.fila.get()
+                if bloco is None:
+                    break
+                self.arquivo.write(bloco)
+        except OSError as erro:
+            self.erro = erro
+        finally:
+            self.arquivo.close()
+
+    def fechar(self):
+        self.fila.put(None)
+        self.join()
+        if self.erro is not None:
+            raise self.erro
+
+
+class RegistroEventos:
+    """Observador das plantas que grava cada transição de estado em `caminho`."""
+
+    def __init__(self, caminho, tamanho_bloco=64 * 1024):
+        self.caminho = caminho
+        self.tamanho_bloco = tamanho_bloco
+        self.buffer = bytearray()
+        self.ids = {}
+        self.mortas = set()  # ids mortos: o próximo replantio é uma remoção, não uma colheita
+        self.total = 0
+
+        arquivo = open(caminho, "wb")
+        cabecalho = json.dumps({"tipos": TIPOS, "passo": relogio.PASSO_PADRAO}).encode()
+        arquivo.write(MAGICO + _TAMANHO.pack(len(cabecalho)) + cabecalho)
+        self.escritor = _Escritor(arquivo)
+        ambiente.registrar_observador(self)
+
+    def acompanhar(self, plantas):
+        """Numera as plantas (ids = posição na lista) e grava o estado inicial de cada uma."""
+        if self.ids:
+            self._gravar(CODIGO["reinicio"], 0, 0, 0, 0.0, 0.0)
+        self.ids = {planta: i for i, planta in enumerate(plantas)}
+        self.mortas = set()
+        for planta in plantas:
+            self.registrar("plantada", planta)
+
+    def registrar(self, tipo, planta):
+        self._gravar(CODIGO[tipo], self.ids[planta], planta.x, planta.y, planta.agua, planta.maturidade)
+
+    def _gravar(self, codigo, planta_id, x, y, agua, maturidade):
+        self.buffer.append(_REGISTRO.size)
+        self.buffer += _REGISTRO.pack(codigo, relogio.ciclo(), planta_id, x, y, agua, maturidade)
+        self.total += 1
+        if len(self.buffer) >= self.tamanho_bloco:
+            self.escritor.fila.put(bytes(self.buffer))
+            self.buffer.clear()
+
+    def __call__(self, planta, evento):
+        if planta not in self.ids:
+            return
+        if evento == "agua":
+            self.registrar("agua_critica" if planta.agua < ambiente.LIMIARES_AGUA[0] else "agua_baixa", planta)
+        elif evento == "morta":
+            self.mortas.add(self.ids[planta])
+            self.registrar("morta", planta)
+        elif evento == "resetada":
+            # Só o colhedor replanta durante a execução
+            planta_id = self.ids[planta]
+            if planta_id in self.mortas:
+                self.mortas.discard(planta_id)
+                self.registrar("removida", planta)
+            else:
+                self.registrar("colhida", planta)
+            self.registrar("replantada", planta)
+        elif evento in ("madura", "irrigada"):
+            self.registrar(evento, planta)
+
+    def fechar(self):
+        """Para de ouvir as plantas, grava o que falta e encerra a thread."""
+        if self.escritor is None:
+            return
+        ambiente.remover_observador(self)
+        if self.buffer:
+            self.escritor.fila.put(bytes(self.buffer))
+            self.buffer.clear()
+        self.escritor.fechar()
+        self.escritor = None
+
+
+def ler(caminho):
+    """Lê o registro inteiro em um array estruturado (campos de DTYPE)."""
+    with open(caminho, "rb") as arquivo:
+        dados = arquivo.read()
+    if not dados.startswith(MAGICO):
+        raise ValueError(f"{caminho} não é um registro de eventos")
+    inicio = len(MAGICO)
+    (tamanho,) = _TAMANHO.unpack_from(dados, inicio)
+    corpo = memoryview(dados)[inicio + _TAMANHO.size + tamanho:]
+
+    # Todos os registros desta versão têm o mesmo tamanho: leitura direta
+    if len(corpo) % DTYPE.itemsize == 0:
+        eventos = np.frombuffer(corpo, dtype=DTYPE)
+        if (eventos["tamanho"] == _REGISTRO.size).all():
+            return eventos
+
+    # Registros de tamanhos diferentes: lê um a um, ignorando campos desconhecidos
+    linhas = []
+    posicao = 0
+    while posicao < len(corpo):
+        tamanho = corpo[posicao]
+        linhas.append((tamanho,) + _REGISTRO.unpack_from(corpo, posicao + 1))
+        posicao += 1 + tamanho
+    return np.array(linhas, dtype=DTYPE)
+
+
+def resumir(eventos, janela_ciclos):
+    """Contagem por tipo e, por janela de ciclos, colhidas, mortas e irrigações."""
+    contagens = np.bincount(eventos["tipo"], minlength=len(TIPOS))
+    janelas = (eventos["ciclo"] // janela_ciclos).astype(np.int64)
+    n = int(janelas.max()) + 1 if len(janelas) else 0
+    por_janela = {
+        tipo: np.bincount(janelas[eventos["tipo"] == CODIGO[tipo]], minlength=n)
+        for tipo in ("colhida", "morta", "irrigada")
+    }
+    return dict(zip(TIPOS, contagens.tolist())), por_janela
+
+
+class _EstadoPlanta:
+    """Última leitura conhecida de uma planta, com a interface que visual.py desenha."""
+
+    __slots__ = ("x", "y", "agua", "maturidade", "morta", "coletada")
+
+    def __init__(self, x, y, agua, maturidade):
+        self.x, self.y = x, y
+        self.agua, self.maturidade = agua, maturidade
+        self.morta = self.coletada = False
+
+
+def reproduzir(eventos, ciclos_por_quadro=120, fps=30, quadros=None):
+    """Redesenha a execução gravada, `ciclos_por_quadro` ciclos a cada quadro."""
+    import pygame
+
+    import visual
+
+    pygame.init()
+    tela = pygame.display.set_mode((1000, 600))
+    pygame.display.set_caption("Reprodução do registro de eventos")
+    fonte, fonte_pequena = visual.criar_fontes()
+    relogio_tela = pygame.time.Clock()
+
+    plantas = {}
+    contagem = {tipo: 0 for tipo in TIPOS}
+    proximo = 0
+    ciclo = 0
+    quadro = 0
+    ultimo_ciclo = int(eventos["ciclo"][-1]) if len(eventos) else 0
+    rodando = True
+    while rodando and ciclo <= ultimo_ciclo and (quadros is None or quadro < quadros):
+        for evento in pygame.event.get():
+            if evento.type == pygame.QUIT:
+                rodando = False
+
+        # Aplica todos os eventos até o fim deste quadro
+        ciclo += ciclos_por_quadro
+        fim = int(np.searchsorted(eventos["ciclo"], ciclo, side="right"))
+        for e in eventos[proximo:fim]:
+            tipo = TIPOS[e["tipo"]]
+            contagem[tipo] += 1
+            if tipo == "reinicio":
+                plantas.clear()
+                continue
+            planta = plantas.get(int(e["planta"]))
+            if planta is None or tipo == "plantada":
+                planta = plantas[int(e["planta"])] = _EstadoPlanta(int(e["x"]), int(e["y"]), 0.0, 0.0)
+            planta.agua, planta.maturidade = float(e["agua"]), float(e["maturidade"])
+            planta.morta = tipo == "morta"
+        proximo = fim
+
+        tela.fill(visual.CORES['BRANCO'])
+        visual.desenhar_grid_fundo(tela, 780, 600)
+        tempo_ms = ciclo * 1000 // 12
+        for planta in plantas.values():
+            visual.desenhar_planta_melhorada(tela, planta, fonte_pequena, tempo_ms)
+        linhas = [f"Ciclo {ciclo} ({ciclo // 12 // 60:02d}:{ciclo // 12 % 60:02d} simulado)"]
+        linhas += [f"{tipo}: {contagem[tipo]}" for tipo in ("colhida", "morta", "removida", "irrigada", "agua_critica")]
+        pygame.draw.rect(tela, visual.CORES['CINZA_CLARO'], (780, 0, 220, 600))
+        for i, linha in enumerate(linhas):
+            tela.blit(visual.renderizar_texto(fonte, linha, visual.CORES['PRETO']), (790, 15 + 22 * i))
+        pygame.display.flip()
+        relogio_tela.tick(fps)
+        quadro += 1
+    pygame.quit()
+    return contagem
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Resumo e reprodução de um registro de eventos")
+    comandos = parser.add_subparsers(dest="comando", required=True)
+
+    p_resumo = comandos.add_parser("resumo", help="contagens por tipo e por janela de tempo")
+    p_resumo.add_argument("arquivo")
+    p_resumo.add_argument("--janela", type=float, default=60.0, help="janela em segundos simulados")
+
+    p_reproduzir = comandos.add_parser("reproduzir", help="redesenha a execução gravada")
+    p_reproduzir.add_argument("arquivo")
+    p_reproduzir.add_argument("--ciclos-por-quadro", type=int, default=120,
+                              help="ciclos simulados por quadro (120 a 30 FPS = 300x o tempo real)")
+    p_reproduzir.add_argument("--fps", type=int, default=30)
+    p_reproduzir.add_argument("--quadros", type=int, default=None, help="para após este número de quadros")
+    args = parser.parse_args(argv)
+
+    eventos = ler(args.arquivo)
+    if args.comando == "reproduzir":
+        reproduzir(eventos, args.ciclos_por_quadro, args.fps, args.quadros)
+        return
+
+    janela_ciclos = max(1, round(args.janela * 12))
+    contagens, por_janela = resumir(eventos, janela_ciclos)
+    print(f"{len(eventos)} eventos em {int(eventos['ciclo'].max()) + 1 if len(eventos) else 0} ciclos")
+    for tipo, quantidade in contagens.items():
+        print(f"  {tipo:>13}: {quantidade}")
+    finalizadas = contagens["colhida"] + contagens["removida"]
+    if finalizadas:
+        print(f"Taxa de sucesso: {contagens['colhida'] / finalizadas * 100:.1f}%")
+    print(f"\n{'janela (s)':>12} {'colhidas':>9} {'mortas':>7} {'irrigações':>11}")
+    for i in range(len(por_janela["colhida"])):
+        print(f"{i * args.janela:>12.0f} {por_janela['colhida'][i]:>9} {por_janela['morta'][i]:>7} "
+              f"{por_janela['irrigada'][i]:>11}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+import time
+
+# Cada ciclo da simulação corresponde a um quadro da interface (12 FPS)
+PASSO_PADRAO = 1 / 12
+
+
+class RelogioReal:
+    """Relógio de parede, usado pela interface em tempo real."""
+
+    def __init__(self):
+        self.ciclos = 0
+
+    def agora(self):
+        return time.time()
+
+    def avancar(self, ciclos=1):
+        self.ciclos += ciclos
+
+
+class RelogioVirtual:
+    """Relógio simulado: o tempo só anda quando a simulação avança um ciclo."""
+
+    def __init__(self, passo=PASSO_PADRAO, inicio=0.0):
+        self.passo = passo
+        self.inicio = inicio
+        self.ciclos = 0
+
+    def agora(self):
+        # Multiplicação em vez de soma acumulada evita deriva de ponto flutuante
+        return self.inicio + self.ciclos * self.passo
+
+    def avancar(self, ciclos=1):
+        self.ciclos += ciclos
+
+
+# Relógio consultado pelos agentes; a interface usa o relógio de parede
+_relogio = RelogioReal()
+
+
+def agora():
+    """Retorna o tempo atual (em segundos) do relógio em uso."""
+    return _relogio.agora()
+
+
+def ciclo():
+    """Retorna quantos ciclos de simulação já se passaram."""
+    return _relogio.ciclos
+
+
+def atual():
+    """Retorna o relógio em uso."""
+    return _relogio
+
+
+def usar(relogio):
+    """Troca o relógio consultado pelos agentes e retorna o anterior."""
+    global _relogio
+    anterior = _relogio
+    _relogio = relogio
+    return anterior
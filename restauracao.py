@@ -0,0 +1,297 @@
+"""Pontos de restauração do estado completo da fazenda em um arquivo mapeado em memória.
+
+O arquivo guarda um anel com os últimos `k` pontos. Cada ponto tem os atributos
+das plantas em colunas (um array por atributo, como no `Campo`), as listas do
+sensor como índices de plantas e um cabeçalho serializado com o resto: posições,
+mensagens e contadores da simulação, intervalos dos agentes, contador de
+emergências do irrigador, ciclo do relógio e estado dos geradores aleatórios.
+
+Com um `Campo`, salvar e restaurar são cópias diretas entre os arrays e o mapa;
+com objetos `Planta`, os atributos são lidos e escritos planta a planta. As
+estruturas derivadas (fila do irrigador por prazo, índice do colhedor) são
+reconstruídas a partir das plantas restauradas.
+"""
+import contextlib
+import gc
+import mmap
+import operator
+import os
+import pickle
+import struct
+
+import numpy as np
+
+import relogio
+from agentes import colhedor, irrigador, sensor
+
+COLUNAS = (
+    ("x", np.int64),
+    ("y", np.int64),
+    ("maturidade", np.float64),
+    ("agua", np.float64),
+    ("fator_crescimento", np.float64),
+    ("fator_consumo", np.float64),
+    ("tempo_madura_cheia", np.int64),
+    ("limite_tempo_madura_cheia", np.int64),
+    ("coletada", np.bool_),
+    ("morta", np.bool_),
+)
+# Entrada de cada planta na fila do irrigador por prazo (modo "prazo")
+COLUNAS_FILA = (("prazo_irrigacao", np.float64), ("seq_irrigacao", np.int64))
+LISTAS_SENSOR = ("plantas_criticas", "plantas_preventivas", "plantas_maduras", "plantas_mortas")
+ESTADO_SIMULACAO = (
+    "pos_irrigador", "pos_colhedor", "ultima_acao_irrigador", "ultima_acao_colhedor",
+    "ultimas_leituras_sensor", "irrigador_ativo", "colhedor_ativo", "plantas_colhidas",
+    "plantas_mortas", "plantas_colhidas_anterior", "plantas_mortas_anterior", "ultimo_relatorio", "agentes",
+)
+
+MAGICO = b"FAZPR01\n"
+_ARQUIVO = struct.Struct("<8sQQQ")  # mágico, k, plantas, tamanho de cada ponto
+_PONTO = struct.Struct("<QqQI")  # número (0 = vazio), ciclo, índices do sensor, tamanho do cabeçalho
+_INICIO = 4096  # os pontos começam na segunda página do arquivo
+_RESERVA_CABECALHO = 64 * 1024
+
+
+def _alinhar(tamanho, alinhamento=8):
+    return -(-tamanho // alinhamento) * alinhamento
+
+
+class PontosRestauracao:
+    """Anel dos últimos `k` pontos de restauração de uma fazenda com `quantidade` plantas.
+
+    Se `caminho` já tiver pontos gravados para o mesmo tamanho de fazenda, eles
+    continuam disponíveis (o arquivo sobrevive ao fim do programa).
+    """
+
+    def __init__(self, caminho, quantidade, k=8):
+        self.caminho = caminho
+        self.quantidade = quantidade
+        self.k = k
+
+        # Posição de cada coluna dentro de um ponto
+        self.deslocamentos = {}
+        posicao = _alinhar(_PONTO.size) + _RESERVA_CABECALHO
+        for nome, tipo in COLUNAS + COLUNAS_FILA:
+            self.deslocamentos[nome] = posicao
+            posicao += _alinhar(quantidade * np.dtype(tipo).itemsize)
+        # Índices do sensor: as quatro listas somam no máximo 2 por planta (crítica e
+        # preventiva se excluem, assim como madura e morta), mais as alteradas pendentes
+        self.deslocamento_indices = posicao
+        posicao += 3 * quantidade * 8
+        self.tamanho_ponto = _alinhar(posicao, mmap.PAGESIZE)
+
+        cabecalho = _ARQUIVO.pack(MAGICO, k, quantidade, self.tamanho_ponto)
+        tamanho = _INICIO + k * self.tamanho_ponto
+        existente = os.path.exists(caminho) and os.path.getsize(caminho) == tamanho
+        with open(caminho, "r+b" if existente else "w+b") as arquivo:
+            if existente and arquivo.read(_ARQUIVO.size) != cabecalho:
+                existente = False
+            if not existente:
+                arquivo.truncate(0)
+                arquivo.truncate(tamanho)  # esparso: só os pontos gravados ocupam disco
+                arquivo.write(cabecalho)
+                arquivo.flush()
+            self.mapa = mmap.mmap(arquivo.fileno(), tamanho)
+
+        self.numero = max((numero for numero, _ in self.listar()), default=0)
+
+    def _base(self, numero):
+        return _INICIO + (numero - 1) % self.k * self.tamanho_ponto
+
+    def _coluna(self, base, nome, tipo):
+        return np.ndarray(self.quantidade, dtype=tipo, buffer=self.mapa, offset=base + self.deslocamentos[nome])
+
+    def _indices(self, base, quantidade):
+        return np.ndarray(quantidade, dtype=np.int64, buffer=self.mapa, offset=base + self.deslocamento_indices)
+
+    def listar(self):
+        """[(número, ciclo)] dos pontos gravados, do mais recente para o mais antigo."""
+        pontos = []
+        for i in range(self.k):
+            numero, ciclo, _, _ = _PONTO.unpack_from(self.mapa, _INICIO + i * self.tamanho_ponto)
+            if numero:
+                pontos.append((numero, ciclo))
+        return sorted(pontos, reverse=True)
+
+    def salvar(self, simulacao):
+        """Grava o estado atual de `simulacao` no lugar do ponto mais antigo; devolve o número do ponto."""
+        with _sem_coleta():
+            return self._salvar(simulacao)
+
+    def _salvar(self, simulacao):
+        plantas = simulacao.plantas
+        if len(plantas) != self.quantidade:
+            raise ValueError(f"a fazenda tem {len(plantas)} plantas, o arquivo espera {self.quantidade}")
+        agora = relogio.agora()
+        listas = [getattr(sensor, nome) for nome in LISTAS_SENSOR]
+        pendentes = sensor.alteradas_pendentes()
+        agente = irrigador.agente_global
+        entradas, proximo_seq = agente.estado_fila() if agente.modo == "prazo" else ([], None)
+        cabecalho = pickle.dumps({
+            "simulacao": {nome: getattr(simulacao, nome) for nome in ESTADO_SIMULACAO},
+            # Intervalos guardados em relação ao relógio, que pode ser o de parede
+            "sensor": {"ultimo_tempo": sensor.ultimo_tempo - agora, "tamanhos": [len(l) for l in listas],
+                       "acompanhando": pendentes is not None},
+            "irrigador": {"ultimo_tempo": agente.ultimo_tempo - agora,
+                          "contador_emergencia": agente.contador_emergencia,
+                          "proximo_seq": proximo_seq},
+            "colhedor": {"ultimo_tempo": colhedor.ultimo_tempo - agora},
+            "frota": simulacao.frota.estado(agora) if simulacao.frota is not None else None,
+            "geradores": [_ler_gerador(g) for g in _geradores(simulacao)],
+        }, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(cabecalho) > _RESERVA_CABECALHO:
+            raise ValueError("estado dos agentes grande demais para o ponto de restauração")
+
+        numero = self.numero + 1
+        base = self._base(numero)
+        # Invalida o ponto antes de sobrescrever: uma gravação interrompida não vira um ponto válido
+        _PONTO.pack_into(self.mapa, base, 0, 0, 0, 0)
+
+        campo = simulacao.campo
+        for nome, tipo in COLUNAS:
+            destino = self._coluna(base, nome, tipo)
+            if campo is not None:
+                destino[:] = getattr(campo, nome)
+            else:
+                destino[:] = np.fromiter((getattr(p, nome) for p in plantas), tipo, self.quantidade)
+
+        # Plantas referenciadas pelos agentes viram posições na lista de plantas
+        if campo is not None:
+            posicao = operator.attrgetter("indice")
+        else:
+            posicao = {planta: i for i, planta in enumerate(plantas)}.__getitem__
+
+        prazos = self._coluna(base, "prazo_irrigacao", np.float64)
+        seqs = self._coluna(base, "seq_irrigacao", np.int64)
+        prazos[:] = np.nan
+        seqs[:] = -1
+        if entradas:
+            linhas = np.fromiter((posicao(planta) for planta, _, _ in entradas), np.int64, len(entradas))
+            prazos[linhas] = [prazo for _, prazo, _ in entradas]
+            seqs[linhas] = [seq for _, _, seq in entradas]
+
+        listas.append(pendentes or [])
+        indices = np.fromiter((posicao(p) for lista in listas for p in lista), np.int64)
+        self._indices(base, len(indices))[:] = indices
+
+        inicio = base + _alinhar(_PONTO.size)
+        self.mapa[inicio:inicio + len(cabecalho)] = cabecalho
+        _PONTO.pack_into(self.mapa, base, numero, relogio.ciclo(), len(indices), len(cabecalho))
+        self.numero = numero
+        return numero
+
+    def restaurar(self, simulacao, voltar=0):
+        """Volta `simulacao` e os agentes ao ponto `voltar` (0 = o mais recente); devolve o ciclo restaurado."""
+        with _sem_coleta():
+            return self._restaurar(simulacao, voltar)
+
+    def _restaurar(self, simulacao, voltar):
+        pontos = self.listar()
+        if voltar >= len(pontos):
+            raise IndexError(f"só há {len(pontos)} ponto(s) de restauração")
+        plantas = simulacao.plantas
+        if len(plantas) != self.quantidade:
+            raise ValueError(f"a fazenda tem {len(plantas)} plantas, o arquivo espera {self.quantidade}")
+
+        base = self._base(pontos[voltar][0])
+        _, ciclo, quantidade_indices, tamanho = _PONTO.unpack_from(self.mapa, base)
+        inicio = base + _alinhar(_PONTO.size)
+        estado = pickle.loads(self.mapa[inicio:inicio + tamanho])
+
+        relogio.atual().ciclos = ciclo
+        agora = relogio.agora()
+
+        campo = simulacao.campo
+        for nome, tipo in COLUNAS:
+            origem = self._coluna(base, nome, tipo)
+            if campo is not None:
+                getattr(campo, nome)[:] = origem
+            else:
+                for planta, valor in zip(plantas, origem.tolist()):
+                    setattr(planta, nome, valor)
+        if simulacao.agregados is not None:
+            simulacao.agregados.recontar()  # as colunas foram escritas por fora dos agregados
+        for gerador, valor in zip(_geradores(simulacao), estado["geradores"]):
+            _escrever_gerador(gerador, valor)
+
+        for nome, valor in estado["simulacao"].items():
+            setattr(simulacao, nome, valor)
+
+        # Sensor: listas da última leitura e, depois delas, as plantas alteradas desde então
+        indices = self._indices(base, quantidade_indices).tolist()
+        listas = []
+        inicio = 0
+        for n in estado["sensor"]["tamanhos"]:
+            listas.append([plantas[i] for i in indices[inicio:inicio + n]])
+            inicio += n
+        alteradas = [plantas[i] for i in indices[inicio:]] if estado["sensor"]["acompanhando"] else None
+        sensor.retomar(plantas, listas, alteradas, agora + estado["sensor"]["ultimo_tempo"])
+
+        agente = irrigador.agente_global
+        agente.ultimo_tempo = agora + estado["irrigador"]["ultimo_tempo"]
+        agente.contador_emergencia = estado["irrigador"]["contador_emergencia"]
+        if agente.modo == "prazo":
+            proximo = estado["irrigador"]["proximo_seq"]
+            if proximo is None:
+                # Ponto salvo com o irrigador em outro modo: monta a fila do zero
+                agente.preparar_fila(plantas)
+            else:
+                seqs = self._coluna(base, "seq_irrigacao", np.int64)
+                linhas = np.flatnonzero(seqs >= 0)
+                prazos = self._coluna(base, "prazo_irrigacao", np.float64)[linhas]
+                agente.retomar_fila([(plantas[i], prazo, seq) for i, prazo, seq
+                                     in zip(linhas.tolist(), prazos.tolist(), seqs[linhas].tolist())], proximo)
+
+        colhedor.ultimo_tempo = agora + estado["colhedor"]["ultimo_tempo"]
+        # O relógio voltou: tarefas que guardam o próprio horário (frota, processos) rodariam só depois dele
+        simulacao.agendador.reiniciar_horarios()
+        if simulacao.processos is not None:
+            simulacao.reiniciar_processos()
+        if simulacao.frota is not None and estado["frota"] is not None:
+            simulacao.frota.retomar(estado["frota"], agora)
+        if colhedor.indice is not None:
+            tamanho_celula = colhedor.indice.maduras.tamanho_celula
+            if isinstance(colhedor.indice, colhedor.FilaColheita):
+                colhedor.usar_fila_prazo(plantas, tamanho_celula)
+            else:
+                colhedor.usar_indice_espacial(plantas, tamanho_celula)
+        return ciclo
+
+    def fechar(self):
+        self.mapa.flush()
+        self.mapa.close()
+
+
+@contextlib.contextmanager
+def _sem_coleta():
+    """Suspende o coletor de lixo: salvar e restaurar criam milhões de tuplas de uma vez."""
+    ativo = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if ativo:
+            gc.enable()
+
+
+def _geradores(simulacao):
+    """Geradores aleatórios usados pelas plantas, sem repetição e em ordem estável."""
+    if simulacao.campo is not None:
+        return [simulacao.campo.rng]
+    geradores = {}
+    for planta in simulacao.plantas:
+        geradores.setdefault(id(planta.rng), planta.rng)
+    return list(geradores.values())
+
+
+def _ler_gerador(gerador):
+    if hasattr(gerador, "bit_generator"):
+        return gerador.bit_generator.state
+    return gerador.getstate()  # random.Random ou o próprio módulo random
+
+
+def _escrever_gerador(gerador, estado):
+    if hasattr(gerador, "bit_generator"):
+        gerador.bit_generator.state = estado
+    else:
+        gerador.setstate(estado)
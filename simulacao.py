@@ -0,0 +1,415 @@
+import argparse
+import random
+
+import perfil
+import relogio
+from agendador import Agendador
+from agregados import Agregados
+from ambiente import Planta
+from agentes import colhedor, irrigador, sensor
+from agentes.frota import Frota
+
+
+def criar_plantas(quantidade=20, rng=None):
+    """Cria as plantas dispostas em grade, 5 por linha."""
+    return [Planta(80 + (i % 5) * 130, 80 + (i // 5) * 110, rng) for i in range(quantidade)]
+
+
+def reiniciar_agentes():
+    """Recoloca os três agentes no estado inicial."""
+    sensor.reiniciar()
+    irrigador.reiniciar()
+    colhedor.reiniciar()
+
+
+class Simulacao:
+    """Estado da fazenda e um ciclo de simulação, sem nenhuma dependência gráfica."""
+
+    def __init__(self, plantas=None, campo=None, colhedor_indexado=False, modo_irrigador="limiar",
+                 politica_colhedor="proximidade", arquivo_historico=None, irrigadores=1, colhedores=1,
+                 despacho=None, agentes_em_processos=False, conferir_agregados=False, parametros_agentes=None,
+                 esperar_agentes=True):
+        # Com um `Campo`, as plantas avançam em um único passo vetorizado
+        self.campo = campo
+        if campo is not None:
+            plantas = campo.plantas
+        self.plantas = plantas if plantas is not None else criar_plantas()
+        # Totais da fazenda mantidos a cada mudança, para HUD e relatórios (agregados.py);
+        # None quando as plantas não permitem (motor de eventos): aí cada leitura reconta
+        self.agregados = Agregados.acompanhar(self.plantas, campo, conferir_agregados)
+        self.colhedor_indexado = colhedor_indexado
+        self.modo_irrigador = modo_irrigador
+        self.politica_colhedor = politica_colhedor
+        self.arquivo_historico = arquivo_historico
+        # Mais de um agente de algum tipo (ou um `despacho` explícito): frota com
+        # despachante central (agentes/frota.py) no lugar dos agentes globais
+        self.irrigadores = irrigadores
+        self.colhedores = colhedores
+        self.despacho = despacho
+        self.frota = self._criar_frota()
+        if self.frota is not None and (modo_irrigador != "limiar" or politica_colhedor != "proximidade"
+                                       or colhedor_indexado or arquivo_historico):
+            raise ValueError("a frota usa irrigadores por limiar e colhedores por proximidade, sem índice "
+                             "espacial nem arquivo de histórico")
+        # Irrigador e colhedor em processos próprios, lendo a lousa (agentes/processos.py)
+        self.agentes_em_processos = agentes_em_processos
+        if agentes_em_processos and (self.frota is not None or modo_irrigador != "limiar" or colhedor_indexado
+                                     or politica_colhedor != "proximidade"):
+            raise ValueError("agentes em processos usam um irrigador por limiar e um colhedor por proximidade")
+        self.processos = None  # AgentesEmProcessos, criado em iniciar_agentes
+        # Cada ciclo espera os dois processos responderem à leitura publicada, para o
+        # resultado não depender da velocidade deles; a interface não espera
+        self.esperar_agentes = esperar_agentes
+        # Parâmetros dos agentes globais, aplicados em iniciar_agentes: {"irrigador": {...}
+        # (argumentos de AgenteIrrigador), "sensor": {...} (argumentos de sensor.configurar)}
+        self.parametros_agentes = parametros_agentes or {}
+        if self.frota is not None and self.parametros_agentes.get("irrigador"):
+            raise ValueError("os parâmetros do irrigador valem só para o agente global, não para a frota")
+
+        # Estados iniciais dos agentes
+        self.pos_irrigador = (0, 0)
+        self.pos_colhedor = (0, 0)
+        self.ultima_acao_irrigador = "Inicializando..."
+        self.ultima_acao_colhedor = "Inicializando..."
+        self.ultimas_leituras_sensor = "Coletando dados..."
+        self.irrigador_ativo = False
+        self.colhedor_ativo = False
+        self.agentes = self._listar_agentes()  # [(tipo, posição, ativo)] para a interface
+        self.agendador = self._criar_agendador()
+
+        # Contadores e controle de relatórios
+        self.plantas_colhidas = self.plantas_mortas = 0
+        self.plantas_colhidas_anterior = self.plantas_mortas_anterior = 0
+        self.ultimo_relatorio = -1
+
+        # Instrumentação opcional (perfil.PerfilQuadros); a nula não mede nada
+        self.perfil = perfil.NULO
+
+    def _criar_frota(self):
+        if self.despacho is None and self.irrigadores == 1 and self.colhedores == 1:
+            return None
+        return Frota(self.irrigadores, self.colhedores, self.despacho or "hungaro")
+
+    def _listar_agentes(self):
+        if self.frota is not None:
+            return self.frota.agentes()
+        return [("irrigador", self.pos_irrigador, self.irrigador_ativo),
+                ("colhedor", self.pos_colhedor, self.colhedor_ativo)]
+
+    def _criar_agendador(self):
+        """Sensor a cada `sensor.delay` s; irrigador e colhedor (ou frota, ou processos) depois dele."""
+        agendador = Agendador()
+        agendador.registrar("sensor", self.acionar_sensor, lambda: sensor.delay,
+                            ultimo=lambda: sensor.ultimo_tempo)
+        if self.frota is not None:
+            # Cada agente da frota tem o próprio intervalo: o despachante olha todo ciclo
+            agendador.registrar("frota", self.acionar_frota, 0.0, depois_de=("sensor",))
+        elif self.agentes_em_processos:
+            agendador.registrar("processos", self.acionar_processos, 0.0, depois_de=("sensor",))
+        else:
+            agendador.registrar("irrigador", self.acionar_irrigador, lambda: irrigador.agente_global.delay,
+                                prioridade=1, depois_de=("sensor",),
+                                ultimo=lambda: irrigador.agente_global.ultimo_tempo)
+            agendador.registrar("colhedor", self.acionar_colhedor, lambda: colhedor.delay,
+                                depois_de=("sensor",), ultimo=lambda: colhedor.ultimo_tempo)
+        return agendador
+
+    def iniciar_agentes(self):
+        """Reinicia os agentes e aplica as opções desta simulação."""
+        reiniciar_agentes()
+        self.frota = self._criar_frota()
+        self.agendador = self._criar_agendador()
+        self.encerrar_agentes()
+        if "sensor" in self.parametros_agentes:
+            # Sem a entrada, valem o intervalo e os limiares já configurados no sensor
+            sensor.configurar(**self.parametros_agentes["sensor"])
+        if self.agregados is not None:
+            self.agregados.recontar()  # as críticas seguem o limiar do sensor
+        parametros_irrigador = self.parametros_agentes.get("irrigador", {})
+        if self.modo_irrigador != "limiar" or self.arquivo_historico or parametros_irrigador:
+            agente = irrigador.reiniciar(modo=self.modo_irrigador, arquivo_historico=self.arquivo_historico,
+                                         **parametros_irrigador)
+            if self.modo_irrigador != "limiar":
+                agente.preparar_fila(self.plantas)
+        if self.agentes_em_processos:
+            # Depois do irrigador: os processos copiam o intervalo e os limiares dele
+            self.reiniciar_processos()
+        if self.politica_colhedor == "prazo":
+            colhedor.usar_fila_prazo(self.plantas)
+        elif self.colhedor_indexado:
+            colhedor.usar_indice_espacial(self.plantas)
+
+    def reiniciar_processos(self):
+        """(Re)cria os processos dos agentes a partir do estado atual (irrigador global e pos_colhedor)."""
+        from agentes.processos import AgentesEmProcessos
+        self.encerrar_agentes()
+        self.processos = AgentesEmProcessos(self.plantas, self.campo, sincrono=self.esperar_agentes,
+                                            pos_colhedor=self.pos_colhedor)
+
+    def encerrar_agentes(self):
+        """Para os processos dos agentes, se houver (chamar ao terminar a simulação)."""
+        if self.processos is not None:
+            self.processos.fechar()
+
+    def atualizar_plantas(self):
+        if self.campo is not None:
+            self.campo.passo()
+            return
+        for planta in self.plantas:
+            planta.atualizar()
+
+    def candidatos_irrigador(self):
+        return sensor.plantas_criticas + sensor.plantas_preventivas
+
+    def candidatos_colhedor(self):
+        return sensor.plantas_maduras + sensor.plantas_mortas
+
+    def acionar_agentes(self):
+        """Roda os agentes vencidos neste ciclo, na ordem do agendador (sensor primeiro)."""
+        # Destaque de "agindo" só no ciclo em que o agente age
+        self.irrigador_ativo = self.colhedor_ativo = False
+        self.agendador.executar()
+        self.agentes = self._listar_agentes()
+
+    def acionar_sensor(self):
+        with self.perfil.fase("sensor"):
+            self.ultimas_leituras_sensor = sensor.agir_sensor(self.plantas)
+
+    def acionar_irrigador(self):
+        # Depende exclusivamente das listas do sensor
+        with self.perfil.fase("irrigador"):
+            nova_pos_irrig, acao_irrig = irrigador.agir_irrigador(self.candidatos_irrigador())
+        if tuple(nova_pos_irrig) != (0, 0):
+            self.pos_irrigador = tuple(nova_pos_irrig)
+        self.ultima_acao_irrigador = acao_irrig
+        self.irrigador_ativo = "Irrigou" in acao_irrig
+
+    def acionar_colhedor(self):
+        # Depende exclusivamente das listas do sensor
+        with self.perfil.fase("colhedor"):
+            nova_pos_colh, acao_colh, colhida, morta = colhedor.agir_colhedor(
+                self.candidatos_colhedor(), self.pos_colhedor
+            )
+        if tuple(nova_pos_colh) != (0, 0):
+            self.pos_colhedor = tuple(nova_pos_colh)
+        self.ultima_acao_colhedor = acao_colh
+        self.colhedor_ativo = "Colheu" in acao_colh
+        self.plantas_colhidas += colhida
+        self.plantas_mortas += morta
+
+    def acionar_frota(self):
+        """Irrigadores e colhedores da frota recebem os alvos do despachante, em lote."""
+        frota = self.frota
+        with self.perfil.fase("irrigador"):
+            irrigacoes, livres = frota.irrigar(self.candidatos_irrigador())
+        if livres:
+            self.ultima_acao_irrigador = f"Irrigou {irrigacoes} planta(s) com {livres} livre(s)"
+        else:
+            self.ultima_acao_irrigador = "Aguardando próximo ciclo..."
+
+        with self.perfil.fase("colhedor"):
+            colhidas, mortas, livres = frota.colher(self.candidatos_colhedor())
+        if livres:
+            self.ultima_acao_colhedor = f"Colheu {colhidas}, removeu {mortas} ({livres} livre(s))"
+        else:
+            self.ultima_acao_colhedor = "Aguardando próximo ciclo..."
+        self.plantas_colhidas += colhidas
+        self.plantas_mortas += mortas
+
+        # Campos de um agente só (relatórios antigos): o primeiro de cada tipo
+        if frota.pos_irrigadores:
+            self.pos_irrigador = frota.pos_irrigadores[0]
+        if frota.pos_colhedores:
+            self.pos_colhedor = frota.pos_colhedores[0]
+        self.irrigador_ativo = any(frota.irrigadores_ativos)
+        self.colhedor_ativo = any(frota.colhedores_ativos)
+
+    def acionar_processos(self):
+        """Aplica os comandos que os agentes mandaram e publica a leitura de agora na lousa.
+
+        Esperando os agentes, publica primeiro e aplica as respostas à leitura no mesmo ciclo.
+        """
+        processos = self.processos
+        comandos = None
+        # Mesma conta do processo do irrigador: uma decisão a cada `delay`, com ou sem comando
+        # (assim o horário salvo num ponto de restauração é o que o processo usa)
+        agente = irrigador.agente_global
+        agora = relogio.agora()
+        if agora - agente.ultimo_tempo >= agente.delay:
+            agente.ultimo_tempo = agora
+        if processos.sincrono:
+            with self.perfil.fase("lousa"):
+                versao = processos.publicar()
+            with self.perfil.fase("esperar_agentes"):
+                comandos = processos.esperar_respostas(versao)
+        with self.perfil.fase("comandos"):
+            irrigacoes, colhidas, mortas = processos.aplicar_comandos(self, comandos)
+        self.irrigador_ativo = irrigacoes > 0
+        self.colhedor_ativo = colhidas > 0
+        self.plantas_colhidas += colhidas
+        self.plantas_mortas += mortas
+        if not processos.sincrono:
+            with self.perfil.fase("lousa"):
+                processos.publicar()
+
+    def passo(self):
+        """Executa um ciclo completo: plantas, agentes e avanço do relógio."""
+        with self.perfil.fase("atualizar_plantas"):
+            self.atualizar_plantas()
+        self.acionar_agentes()
+        if self.agregados is not None and self.agregados.conferir:
+            self.agregados.verificar()
+        relogio.atual().avancar()
+
+    def resumo_estatisticas(self):
+        """Total, vivas, colhidas, mortas, água média e maturidade média das vivas."""
+        if self.agregados is None:
+            return Agregados(self.plantas).resumo()
+        return self.agregados.resumo()
+
+    def plantas_vivas(self):
+        return self.resumo_estatisticas()[1]
+
+    def imprimir_progresso(self, tempo_passado):
+        """Imprime colheitas, mortes e o relatório a cada 30 segundos."""
+        if self.plantas_colhidas != self.plantas_colhidas_anterior:
+            print(f"Planta colhida! Total: {self.plantas_colhidas}")
+            self.plantas_colhidas_anterior = self.plantas_colhidas
+        if self.plantas_mortas != self.plantas_mortas_anterior:
+            print(f"Planta morreu! Total: {self.plantas_mortas}")
+            self.plantas_mortas_anterior = self.plantas_mortas
+
+        if tempo_passado % 30 == 0 and tempo_passado != self.ultimo_relatorio and tempo_passado > 0:
+            _, vivas, _, _, agua_media, maturidade_media = self.resumo_estatisticas()
+            if vivas > 0:
+                print(f"Relatório {tempo_passado}s - Vivas: {vivas}, Água: {agua_media:.1f}%, Maturidade: {maturidade_media:.1f}%")
+            self.ultimo_relatorio = tempo_passado
+
+    def imprimir_relatorio_final(self, tempo_passado):
+        print("\n" + "="*50)
+        print("RELATÓRIO FINAL DO SISTEMA")
+        print("="*50)
+        print(f"Tempo total de execução: {tempo_passado} segundos")
+        print(f"Total de plantas: {len(self.plantas)}")
+        print(f"Plantas colhidas: {self.plantas_colhidas}")
+        print(f"Plantas mortas: {self.plantas_mortas}")
+        print(f"Plantas ainda vivas: {self.plantas_vivas()}")
+        if self.frota is not None:
+            frota = self.frota
+            media = frota.tempo_despacho / frota.despachos * 1e3 if frota.despachos else 0.0
+            print(f"Frota: {self.irrigadores} irrigador(es), {self.colhedores} colhedor(es), "
+                  f"despacho {frota.metodo} ({media:.3f} ms por decisão)")
+        for tarefa in self.agendador.tarefas:
+            e = tarefa.estatisticas()
+            print(f"Agente {tarefa.nome}: {e['execucoes']} execuções, {e['duracao_media_ms']:.3f} ms cada "
+                  f"(máx {e['duracao_max_ms']:.2f}), atraso médio {e['atraso_medio_ms']:.3f} ms "
+                  f"(máx {e['atraso_max_ms']:.2f}), {e['estouros']} estouro(s), {e['perdidos']} período(s) perdido(s)")
+        if self.processos is not None:
+            processos = self.processos
+            print(f"Agentes em processos: {processos.comandos_aplicados} comandos aplicados, "
+                  f"{processos.comandos_recusados} recusados, atraso médio de "
+                  f"{processos.atraso_medio():.1f} versões da lousa")
+
+        if self.plantas_colhidas + self.plantas_mortas > 0:
+            taxa_sucesso = self.plantas_colhidas / (self.plantas_colhidas + self.plantas_mortas) * 100
+            print(f"Taxa de sucesso: {taxa_sucesso:.1f}%")
+            if taxa_sucesso >= 80:
+                print("EXCELENTE! Sistema altamente eficiente!")
+            elif taxa_sucesso >= 60:
+                print("BOM! Sistema funcionando adequadamente")
+            elif taxa_sucesso >= 40:
+                print("REGULAR. Sistema precisa de ajustes")
+            else:
+                print("CRÍTICO! Sistema requer revisão urgente")
+        print("=" * 50)
+
+
+def executar_sem_interface(ciclos, simulacao=None, relogio_virtual=None, verboso=False):
+    """Roda a simulação por `ciclos` ciclos, sem janela e sem limite de FPS."""
+    relogio_virtual = relogio_virtual if relogio_virtual is not None else relogio.RelogioVirtual()
+    anterior = relogio.usar(relogio_virtual)
+    try:
+        simulacao = simulacao if simulacao is not None else Simulacao()
+        simulacao.iniciar_agentes()
+        for _ in range(ciclos):
+            simulacao.passo()
+            if verboso:
+                simulacao.imprimir_progresso(int(relogio_virtual.agora() - relogio_virtual.inicio))
+    finally:
+        relogio.usar(anterior)
+        irrigador.agente_global.historico.fechar()
+        if simulacao is not None:
+            simulacao.encerrar_agentes()
+    return simulacao
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulação da fazenda sem interface gráfica")
+    parser.add_argument("--ciclos", type=int, default=12 * 3600,
+                        help="quantidade de ciclos (12 ciclos = 1 segundo simulado)")
+    parser.add_argument("--plantas", type=int, default=20, help="quantidade de plantas no campo")
+    parser.add_argument("--vetorizado", action="store_true",
+                        help="usa o motor NumPy (campo.Campo) para avançar as plantas")
+    parser.add_argument("--processos", type=int, default=None,
+                        help="com --vetorizado, divide o campo em ladrilhos avançados por N processos "
+                             "(campo_paralelo.py; padrão: um processo)")
+    parser.add_argument("--irrigador", choices=("limiar", "prazo"), default="limiar",
+                        help="limiar: mais seca das listas do sensor; prazo: fila pelo ciclo em que a água zera")
+    parser.add_argument("--colhedor-indexado", action="store_true",
+                        help="colhedor busca alvos no índice espacial em vez de varrer a lista")
+    parser.add_argument("--colhedor", choices=("proximidade", "prazo"), default="proximidade",
+                        help="proximidade: madura mais próxima; prazo: madura com menor folga até morrer")
+    parser.add_argument("--irrigadores", type=int, default=1, help="quantidade de irrigadores")
+    parser.add_argument("--colhedores", type=int, default=1, help="quantidade de colhedores")
+    parser.add_argument("--despacho", choices=("hungaro", "guloso"), default=None,
+                        help="como a frota escolhe os alvos (padrão com mais de um agente: hungaro)")
+    parser.add_argument("--agentes-processos", action="store_true",
+                        help="roda irrigador e colhedor em processos próprios, lendo a lousa do sensor")
+    parser.add_argument("--semente", type=int, default=None, help="semente do sorteio das plantas")
+    parser.add_argument("--historico", metavar="ARQUIVO", default=None,
+                        help="grava todas as irrigações neste arquivo (ler com agentes.historico.ler_arquivo)")
+    parser.add_argument("--registro", metavar="ARQUIVO", default=None,
+                        help="grava as transições de estado das plantas (ver python registro.py resumo)")
+    parser.add_argument("--verboso", action="store_true", help="imprime colheitas, mortes e relatórios parciais")
+    parser.add_argument("--conferir-agregados", action="store_true",
+                        help="confere os totais incrementais com uma recontagem a cada leitura (depuração, lento)")
+    args = parser.parse_args(argv)
+    if args.processos and not args.vetorizado:
+        parser.error("--processos só vale com --vetorizado")
+
+    opcoes = dict(colhedor_indexado=args.colhedor_indexado, modo_irrigador=args.irrigador,
+                  politica_colhedor=args.colhedor, arquivo_historico=args.historico,
+                  irrigadores=args.irrigadores, colhedores=args.colhedores, despacho=args.despacho,
+                  agentes_em_processos=args.agentes_processos, conferir_agregados=args.conferir_agregados)
+    try:
+        if args.vetorizado and args.processos:
+            from campo_paralelo import CampoParalelo
+            simulacao = Simulacao(campo=CampoParalelo.em_grade(args.plantas, semente=args.semente,
+                                                               processos=args.processos), **opcoes)
+        elif args.vetorizado:
+            from campo import Campo
+            simulacao = Simulacao(campo=Campo.em_grade(args.plantas, semente=args.semente), **opcoes)
+        else:
+            simulacao = Simulacao(criar_plantas(args.plantas, random.Random(args.semente)), **opcoes)
+    except ValueError as erro:
+        parser.error(str(erro))
+
+    registro = None
+    if args.registro:
+        from registro import RegistroEventos
+        registro = RegistroEventos(args.registro)
+        registro.acompanhar(simulacao.plantas)
+
+    relogio_virtual = relogio.RelogioVirtual()
+    try:
+        executar_sem_interface(args.ciclos, simulacao, relogio_virtual, verboso=args.verboso)
+    finally:
+        if registro is not None:
+            registro.fechar()
+        if hasattr(simulacao.campo, "fechar"):
+            simulacao.campo.fechar()
+    simulacao.imprimir_relatorio_final(int(relogio_virtual.agora() - relogio_virtual.inicio))
+
+
+if __name__ == "__main__":
+    main()
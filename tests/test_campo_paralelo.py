@@ -0,0 +1,52 @@
+import pytest
+
+import ambiente
+from agregados import Agregados
+from campo import Campo
+from campo_paralelo import CampoParalelo, _ladrilhos
+
+
+def _avancar(campo, ciclos=40):
+    avisos = []
+
+    def observador(planta, evento):
+        avisos.append((planta.indice, evento))
+
+    ambiente.registrar_observador(observador)
+    try:
+        agregados = Agregados.acompanhar(campo.plantas, campo)
+        for _ in range(ciclos):
+            campo.passo()
+    finally:
+        ambiente.remover_observador(observador)
+    return avisos, agregados.contagens()
+
+
+def test_ladrilhos_usam_os_limiares_do_processo_principal():
+    anteriores = ambiente.LIMIARES_AGUA
+    ambiente.definir_limiares_agua(35, 60)
+    try:
+        esperado = _avancar(Campo.em_grade(300, semente=3))
+        with CampoParalelo.em_grade(300, semente=3, processos=3) as campo:
+            obtido = _avancar(campo)
+    finally:
+        ambiente.definir_limiares_agua(*anteriores)
+    assert obtido[0] == esperado[0]
+    # As somas de água e maturidade são feitas por ladrilho e podem diferir no último bit
+    assert obtido[1] == pytest.approx(esperado[1])
+
+
+def test_ladrilhos_sem_vazios():
+    assert _ladrilhos(130, 3) == [(0, 64), (64, 130)]
+    assert _ladrilhos(200, 4) == [(0, 64), (64, 128), (128, 200)]
+    assert _ladrilhos(0, 2) == [(0, 0)]
+
+
+def test_um_processo_por_ladrilho():
+    with CampoParalelo.em_grade(130, semente=1, processos=3) as campo:
+        assert campo.processos == len(campo.ladrilhos) == 2
+        esperado = Campo.em_grade(130, semente=1)
+        for _ in range(20):
+            campo.passo()
+            esperado.passo()
+        assert (campo.agua == esperado.agua).all()
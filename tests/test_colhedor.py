@@ -0,0 +1,36 @@
+import random
+
+import pytest
+
+import relogio
+from agentes import colhedor, sensor
+from ambiente import Planta
+
+
+def _campo():
+    plantas = [Planta(x * 10, 0, random.Random(x)) for x in range(5)]
+    plantas[3].maturidade = 100
+    return plantas
+
+
+@pytest.mark.parametrize("usar", [colhedor.usar_indice_espacial, colhedor.usar_fila_prazo])
+def test_indice_so_conhece_o_que_o_sensor_leu(usar):
+    anterior = relogio.usar(relogio.RelogioVirtual())
+    sensor.reiniciar()
+    try:
+        plantas = _campo()
+        colhedor.reiniciar()
+        usar(plantas)
+        # Madura desde o início, mas o sensor ainda não leu o campo: a varredura também não a veria
+        assert not colhedor.tem_alvo(sensor.plantas_maduras + sensor.plantas_mortas)
+        assert colhedor.agir_colhedor([], (0, 0))[1] == "Nenhuma ação possível"
+
+        sensor.agir_sensor(plantas)
+        assert colhedor.tem_alvo(sensor.plantas_maduras + sensor.plantas_mortas)
+        assert colhedor.agir_colhedor(sensor.plantas_maduras + sensor.plantas_mortas, (0, 0))[2] == 1
+        # Replantada: continua na lista da última leitura, mas não é mais alvo
+        assert not colhedor.tem_alvo(sensor.plantas_maduras + sensor.plantas_mortas)
+    finally:
+        colhedor.reiniciar()
+        sensor.reiniciar()
+        relogio.usar(anterior)
@@ -0,0 +1,87 @@
+import random
+
+import relogio
+from agentes.irrigador import AgenteIrrigador
+from ambiente import Planta
+
+
+def _plantas():
+    # A tem o menor prazo (50 ciclos) mas ainda tem água; B (200 ciclos) está crítica
+    a = Planta(0, 0, random.Random(0))
+    a.agua, a.fator_consumo = 50, 1.0
+    b = Planta(10, 0, random.Random(1))
+    b.agua, b.fator_consumo = 20, 0.1
+    return a, b
+
+
+def test_prazo_irriga_a_mais_urgente_abaixo_do_limiar():
+    anterior = relogio.usar(relogio.RelogioVirtual())
+    try:
+        a, b = _plantas()
+        agente = AgenteIrrigador(modo="prazo")
+        agente.preparar_fila([a, b])
+        assert agente.tem_trabalho([a, b])
+        coords, _ = agente.executar([a, b])
+        assert coords == (b.x, b.y)
+        assert (a.agua, b.agua) == (50, 90)
+        assert agente.contador_emergencia == 1
+        agente.encerrar_fila()
+    finally:
+        relogio.usar(anterior)
+
+
+def test_prazo_e_limiar_escolhem_a_mesma_planta():
+    anterior = relogio.usar(relogio.RelogioVirtual())
+    try:
+        resultados = []
+        for modo in ("limiar", "prazo"):
+            a, b = _plantas()
+            agente = AgenteIrrigador(modo=modo)
+            agente.preparar_fila([a, b])
+            agente.executar([a, b])
+            agente.encerrar_fila()
+            resultados.append((a.agua, b.agua))
+        assert resultados[0] == resultados[1]
+    finally:
+        relogio.usar(anterior)
+
+
+def test_prazo_sem_trabalho_com_todas_acima_do_limiar():
+    anterior = relogio.usar(relogio.RelogioVirtual())
+    try:
+        a, b = _plantas()
+        b.agua = 60
+        agente = AgenteIrrigador(modo="prazo")
+        agente.preparar_fila([a, b])
+        assert not agente.tem_trabalho([a, b])
+        assert agente.executar([a, b])[0] == (0, 0)
+        agente.encerrar_fila()
+    finally:
+        relogio.usar(anterior)
+
+
+def test_prazo_so_enfileira_plantas_abaixo_do_limiar():
+    # Com o campo todo irrigado a fila fica vazia: tem_trabalho não percorre as plantas
+    anterior = relogio.usar(relogio.RelogioVirtual())
+    try:
+        rng = random.Random(0)
+        plantas = [Planta(i % 100, i // 100, rng) for i in range(10_000)]
+        for planta in plantas:
+            planta.agua, planta.fator_consumo = 90, 1.0
+        seca = plantas[1234]
+        seca.fator_consumo = 2.0
+        agente = AgenteIrrigador(modo="prazo")
+        agente.preparar_fila(plantas)
+        assert agente.fila == []
+        assert not agente.tem_trabalho(plantas)
+
+        # A seca cruza o limiar preventivo (45) no 23º ciclo e só ela entra na fila
+        for _ in range(23):
+            relogio.atual().avancar()
+            seca.atualizar()
+            assert agente.tem_trabalho(plantas) == (seca.agua < agente.limiar_preventivo)
+        assert [entrada[2] for entrada in agente.fila] == [seca]
+        assert agente.executar(plantas)[0] == (seca.x, seca.y)
+        agente.encerrar_fila()
+    finally:
+        relogio.usar(anterior)
@@ -0,0 +1,24 @@
+import random
+
+import relogio
+from simulacao import Simulacao, criar_plantas
+
+
+def _totais(ciclos, **opcoes):
+    anterior = relogio.usar(relogio.RelogioVirtual())
+    simulacao = Simulacao(criar_plantas(20, random.Random(1)), **opcoes)
+    simulacao.iniciar_agentes()
+    totais = []
+    try:
+        for _ in range(ciclos):
+            simulacao.passo()
+            totais.append((simulacao.plantas_colhidas, simulacao.plantas_mortas))
+    finally:
+        simulacao.encerrar_agentes()
+        relogio.usar(anterior)
+    return totais
+
+
+def test_processos_sincronos_seguem_os_agentes_no_processo():
+    # Com a semente 1 uma madura morre antes da leitura seguinte do sensor por volta do ciclo 926
+    assert _totais(1500, agentes_em_processos=True) == _totais(1500)
@@ -0,0 +1,38 @@
+import random
+
+import pytest
+
+import relogio
+from restauracao import PontosRestauracao
+from simulacao import Simulacao, criar_plantas
+
+
+def _estado(simulacao):
+    return simulacao.plantas_colhidas, simulacao.plantas_mortas, [p.agua for p in simulacao.plantas]
+
+
+@pytest.mark.parametrize("opcoes", [
+    {},
+    {"irrigadores": 3, "colhedores": 2},
+    {"agentes_em_processos": True},
+])
+def test_restaurar_refaz_os_mesmos_ciclos(tmp_path, opcoes):
+    anterior = relogio.usar(relogio.RelogioVirtual())
+    simulacao = Simulacao(criar_plantas(20, random.Random(1)), **opcoes)
+    simulacao.iniciar_agentes()
+    try:
+        for _ in range(500):
+            simulacao.passo()
+        pontos = PontosRestauracao(tmp_path / "pontos.bin", len(simulacao.plantas), 2)
+        pontos.salvar(simulacao)
+        for _ in range(100):
+            simulacao.passo()
+        esperado = _estado(simulacao)
+        pontos.restaurar(simulacao)
+        for _ in range(100):
+            simulacao.passo()
+        pontos.fechar()
+    finally:
+        simulacao.encerrar_agentes()
+        relogio.usar(anterior)
+    assert _estado(simulacao) == esperado
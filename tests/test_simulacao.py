@@ -0,0 +1,33 @@
+import pytest
+
+import ambiente
+from agentes import sensor
+from simulacao import Simulacao, criar_plantas
+
+
+@pytest.mark.parametrize("opcoes", [
+    {"modo_irrigador": "prazo"},
+    {"politica_colhedor": "prazo"},
+    {"colhedor_indexado": True},
+    {"arquivo_historico": "historico.bin"},
+])
+def test_frota_recusa_opcoes_dos_agentes_globais(opcoes):
+    with pytest.raises(ValueError):
+        Simulacao(criar_plantas(), irrigadores=2, **opcoes)
+
+
+def test_frota_com_opcoes_padrao():
+    assert Simulacao(criar_plantas(), irrigadores=2, colhedores=2).frota is not None
+
+
+def test_iniciar_agentes_so_configura_o_sensor_com_parametros():
+    anteriores = sensor.delay, ambiente.LIMIARES_AGUA
+    try:
+        sensor.configurar(intervalo=2.5, limiar_critico=30, limiar_preventivo=50)
+        Simulacao(criar_plantas()).iniciar_agentes()
+        assert (sensor.delay, ambiente.LIMIARES_AGUA) == (2.5, (30, 50))
+
+        Simulacao(criar_plantas(), parametros_agentes={"sensor": {"intervalo": 0.5}}).iniciar_agentes()
+        assert (sensor.delay, ambiente.LIMIARES_AGUA) == (0.5, (25, 45))
+    finally:
+        sensor.configurar(anteriores[0], *anteriores[1])
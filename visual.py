@@ -1,5 +1,11 @@
 import pygame
 import math
+from collections import OrderedDict
+
+import numpy as np
+
+import ambiente
+from perfil import NULO
 
 # Cores melhoradas
 CORES = {
@@ -21,8 +27,223 @@ CORES = {
     'LARANJA': (230, 126, 34)
 }
 
-def desenhar_planta_melhorada(tela, planta, fonte, tempo_atual):
-    """Desenha planta com animações e detalhes visuais aprimorados"""
+# Cor principal e secundária de cada agente
+CORES_AGENTES = {
+    'irrigador': (CORES['AZUL_AGUA'], CORES['AZUL_ESCURO']),
+    'colhedor': (CORES['AMARELO_COLHEITA'], CORES['AMARELO_ESCURO']),
+}
+
+class CacheTexto:
+    """Cache LRU limitado de superfícies de texto já renderizadas, por (fonte, texto, cor)"""
+
+    def __init__(self, capacidade=512):
+        self.capacidade = capacidade
+        self.superficies = OrderedDict()
+        self.acertos = 0
+        self.falhas = 0
+
+    def renderizar(self, fonte, texto, cor):
+        chave = (fonte, texto, cor)
+        superficie = self.superficies.get(chave)
+        if superficie is not None:
+            self.superficies.move_to_end(chave)
+            self.acertos += 1
+            return superficie
+
+        self.falhas += 1
+        superficie = fonte.render(texto, True, cor)
+        self.superficies[chave] = superficie
+        if len(self.superficies) > self.capacidade:
+            self.superficies.popitem(last=False)  # descarta a menos usada
+        return superficie
+
+    def taxa_acerto(self):
+        consultas = self.acertos + self.falhas
+        return self.acertos / consultas if consultas else 0.0
+
+    def estatisticas(self):
+        """Números para dimensionar o cache: acertos, falhas, taxa e ocupação"""
+        return {
+            "acertos": self.acertos,
+            "falhas": self.falhas,
+            "taxa_acerto": self.taxa_acerto(),
+            "tamanho": len(self.superficies),
+            "capacidade": self.capacidade,
+        }
+
+    def limpar(self):
+        self.superficies.clear()
+        self.acertos = self.falhas = 0
+
+# Cache compartilhado por todas as funções de desenho
+cache_texto = CacheTexto()
+
+def renderizar_texto(fonte, texto, cor):
+    """Equivale a fonte.render(texto, True, cor), reaproveitando superfícies do cache"""
+    return cache_texto.renderizar(fonte, texto, tuple(cor))
+
+# Cor de fundo das camadas em construção; nenhum desenho usa este magenta
+COR_CHAVE = (255, 0, 255)
+
+class Composicao:
+    """Empilha camadas de desenho sem conhecer o fundo: resultado = fundo * (1 - A) + C.
+
+    Camadas opacas substituem os pixels que desenham; camadas translúcidas (superfície
+    inteira com set_alpha, como nos efeitos originais) misturam-se ao que já existe.
+    No fim, C / A e A viram a cor e o alfa de um único sprite com alfa por pixel.
+    """
+
+    def __init__(self, largura, altura):
+        self.tamanho = (largura, altura)
+        self.opacidade = np.zeros((largura, altura))
+        self.cor = np.zeros((largura, altura, 3))
+
+    def nova_camada(self):
+        camada = pygame.Surface(self.tamanho)
+        camada.fill(COR_CHAVE)
+        return camada
+
+    def opaca(self, camada):
+        rgb = pygame.surfarray.array3d(camada)
+        coberto = (rgb != COR_CHAVE).any(axis=2)
+        self.opacidade[coberto] = 1.0
+        self.cor[coberto] = rgb[coberto]
+
+    def translucida(self, superficie, pos, alpha):
+        a = alpha / 255
+        largura, altura = superficie.get_size()
+        janela = (slice(pos[0], pos[0] + largura), slice(pos[1], pos[1] + altura))
+        self.opacidade[janela] = 1 - (1 - self.opacidade[janela]) * (1 - a)
+        self.cor[janela] = self.cor[janela] * (1 - a) + pygame.surfarray.array3d(superficie) * a
+
+    def sprite(self):
+        sprite = pygame.Surface(self.tamanho, pygame.SRCALPHA)
+        opacidade = self.opacidade[..., None]
+        cor = np.divide(self.cor, opacidade, out=np.zeros_like(self.cor), where=opacidade > 0)
+        pygame.surfarray.pixels3d(sprite)[...] = np.rint(np.clip(cor, 0, 255)).astype(np.uint8)
+        pygame.surfarray.pixels_alpha(sprite)[...] = np.rint(self.opacidade * 255).astype(np.uint8)
+        if pygame.display.get_surface() is not None:
+            sprite = sprite.convert_alpha()
+        return sprite
+
+class AtlasSprites:
+    """Sprites de sombra, corpo, brilho e aura, compostos uma vez por combinação e reutilizados.
+
+    Cada planta ou agente vira um único blit; nenhum quadro aloca superfícies.
+    """
+
+    def __init__(self):
+        self.sprites = {}
+
+    def __len__(self):
+        return len(self.sprites)
+
+    def planta(self, tamanho, cor_borda, cor_principal, brilho):
+        """(sprite, margem): desenhar em (x - margem, y - margem)"""
+        chave = ("planta", tamanho, cor_borda, cor_principal, brilho)
+        sprite = self.sprites.get(chave)
+        if sprite is None:
+            sprite = self.sprites[chave] = self._compor_planta(tamanho, cor_borda, cor_principal, brilho)
+        return sprite
+
+    def agente(self, tipo, ativo):
+        chave = ("agente", tipo, ativo)
+        sprite = self.sprites.get(chave)
+        if sprite is None:
+            sprite = self.sprites[chave] = self._compor_agente(tipo, ativo)
+        return sprite
+
+    def retangulo(self, tamanho, cor, alpha):
+        """Retângulo liso semitransparente (fundo da faixa de estatísticas)"""
+        chave = ("retangulo", tamanho, cor, alpha)
+        superficie = self.sprites.get(chave)
+        if superficie is None:
+            superficie = self.sprites[chave] = pygame.Surface(tamanho)
+            superficie.set_alpha(alpha)
+            superficie.fill(cor)
+        return superficie
+
+    def _compor_planta(self, tamanho, cor_borda, cor_principal, brilho):
+        margem = tamanho + 4
+        composicao = Composicao(2 * margem + 1, 2 * margem + 1)
+        camada = composicao.nova_camada()
+        
+        # Sombra, borda e corpo
+        pygame.draw.circle(camada, (0, 0, 0, 50), (margem + 2, margem + 2), tamanho)
+        pygame.draw.circle(camada, cor_borda, (margem, margem), tamanho + 2)
+        pygame.draw.circle(camada, cor_principal, (margem, margem), tamanho)
+        composicao.opaca(camada)
+        
+        # Brilho da planta madura: três quadrados translúcidos com círculos amarelos
+        if brilho:
+            for i in range(3):
+                s = pygame.Surface((tamanho * 2, tamanho * 2))
+                pygame.draw.circle(s, CORES['AMARELO_COLHEITA'], (tamanho, tamanho), tamanho - i * 2)
+                composicao.translucida(s, (margem - tamanho, margem - tamanho), 100 - (i * 30))
+        return composicao.sprite(), margem
+
+    def _compor_agente(self, tipo, ativo):
+        cor_principal, cor_secundaria = CORES_AGENTES[tipo]
+        tamanho = 16 if ativo else 12
+        margem = 46  # aura de raio 44 com anel de 3 pixels
+        x = y = margem
+        composicao = Composicao(2 * margem + 1, 2 * margem + 1)
+        
+        # Rastro/trilha do movimento (linhas pontilhadas em cruz)
+        camada = composicao.nova_camada()
+        for i in range(-20, 21, 5):
+            alpha = max(0, 100 - abs(i) * 3)
+            if alpha > 20:
+                pygame.draw.circle(camada, (*cor_principal, alpha), (x + i, y), 2)
+                pygame.draw.circle(camada, (*cor_principal, alpha), (x, y + i), 2)
+        
+        # Círculo de área de ação (raio de alcance)
+        if ativo:
+            pygame.draw.circle(camada, (*cor_principal, 30), (x, y), 40, 2)
+            pygame.draw.circle(camada, (*cor_principal, 15), (x, y), 25, 1)
+        composicao.opaca(camada)
+        
+        # Aura pulsante
+        if ativo:
+            for i in range(4):
+                raio = 20 + i * 8
+                s = pygame.Surface((raio * 2, raio * 2))
+                pygame.draw.circle(s, cor_principal, (raio, raio), raio, 3)
+                composicao.translucida(s, (x - raio, y - raio), 80 - (i * 20))
+        
+        camada = composicao.nova_camada()
+        # Sombra do agente
+        pygame.draw.circle(camada, (50, 50, 50, 100), (x + 3, y + 3), tamanho + 2)
+        
+        # Corpo principal do agente (formato mais distintivo)
+        pygame.draw.circle(camada, CORES['PRETO'], (x, y), tamanho + 3)  # Borda preta
+        pygame.draw.circle(camada, cor_secundaria, (x, y), tamanho + 1)  # Borda colorida
+        pygame.draw.circle(camada, cor_principal, (x, y), tamanho)       # Corpo principal
+        
+        # Centro brilhante
+        pygame.draw.circle(camada, CORES['BRANCO'], (x - 3, y - 3), 3)
+        
+        # Indicador de direção/orientação
+        if tipo == "irrigador":
+            # Gotas d'água
+            for offset in [(0, -20), (-8, -15), (8, -15)]:
+                pygame.draw.circle(camada, CORES['AZUL_AGUA'], (x + offset[0], y + offset[1]), 2)
+        else:
+            # Símbolo de colheita
+            pontos = [(x, y - 20), (x - 6, y - 12), (x + 6, y - 12), (x, y - 16)]
+            pygame.draw.polygon(camada, CORES['AMARELO_ESCURO'], pontos)
+        composicao.opaca(camada)
+        return composicao.sprite(), margem
+
+# Atlas compartilhado por todas as funções de desenho
+atlas = AtlasSprites()
+
+# Barras de água e maturidade sob cada planta
+LARGURA_BARRA = 30
+ALTURA_BARRA = 6
+
+def aparencia_planta(planta, tempo_atual):
+    """Tudo o que define o desenho da planta neste instante; se não mudou, o desenho é o mesmo"""
     
     # Animação de pulsação para plantas vivas
     pulso = 1.0
@@ -51,35 +272,11 @@ def desenhar_planta_melhorada(tela, planta, fonte, tempo_atual):
     
     tamanho = int(tamanho_base * pulso)
     
-    # Desenha sombra
-    pygame.draw.circle(tela, (0, 0, 0, 50), (planta.x + 2, planta.y + 2), tamanho)
-    
-    # Desenha borda da planta
-    pygame.draw.circle(tela, cor_borda, (planta.x, planta.y), tamanho + 2)
-    
-    # Desenha corpo da planta
-    pygame.draw.circle(tela, cor_principal, (planta.x, planta.y), tamanho)
-    
-    # Adiciona brilho se planta estiver madura
-    if not planta.morta and not planta.coletada and planta.maturidade > 80:
-        for i in range(3):
-            alpha = 100 - (i * 30)
-            s = pygame.Surface((tamanho * 2, tamanho * 2))
-            s.set_alpha(alpha)
-            pygame.draw.circle(s, CORES['AMARELO_COLHEITA'], (tamanho, tamanho), tamanho - i * 2)
-            tela.blit(s, (planta.x - tamanho, planta.y - tamanho))
-    
-    # Barra de água aprimorada
-    barra_largura = 30
-    barra_altura = 6
-    barra_x = planta.x - barra_largura // 2
-    barra_y = planta.y + tamanho + 8
-    
-    # Fundo da barra
-    pygame.draw.rect(tela, CORES['CINZA_MORTA'], (barra_x, barra_y, barra_largura, barra_altura))
+    # Brilho se planta estiver madura
+    brilho = not planta.morta and not planta.coletada and planta.maturidade > 80
     
-    # Preenchimento da barra de água
-    agua_largura = int((planta.agua / 100) * barra_largura)
+    # Barra de água
+    agua_largura = int((planta.agua / 100) * LARGURA_BARRA)
     if planta.agua > 60:
         cor_agua = CORES['AZUL_AGUA']
     elif planta.agua > 30:
@@ -87,29 +284,12 @@ def desenhar_planta_melhorada(tela, planta, fonte, tempo_atual):
     else:
         cor_agua = CORES['VERMELHO']
     
-    if agua_largura > 0:
-        pygame.draw.rect(tela, cor_agua, (barra_x, barra_y, agua_largura, barra_altura))
-    
-    # Borda da barra
-    pygame.draw.rect(tela, CORES['PRETO'], (barra_x, barra_y, barra_largura, barra_altura), 1)
-    
     # Barra de maturidade
-    barra_y_mat = barra_y + barra_altura + 2
-    mat_largura = int((planta.maturidade / 100) * barra_largura)
-    
-    # Fundo da barra de maturidade
-    pygame.draw.rect(tela, CORES['CINZA_MORTA'], (barra_x, barra_y_mat, barra_largura, barra_altura))
-    
-    # Preenchimento da barra de maturidade
-    if mat_largura > 0:
-        if planta.maturidade >= 100:
-            cor_mat = CORES['AMARELO_COLHEITA']
-        else:
-            cor_mat = CORES['VERDE_SAUDAVEL']
-        pygame.draw.rect(tela, cor_mat, (barra_x, barra_y_mat, mat_largura, barra_altura))
-    
-    # Borda da barra de maturidade
-    pygame.draw.rect(tela, CORES['PRETO'], (barra_x, barra_y_mat, barra_largura, barra_altura), 1)
+    mat_largura = int((planta.maturidade / 100) * LARGURA_BARRA)
+    if planta.maturidade >= 100:
+        cor_mat = CORES['AMARELO_COLHEITA']
+    else:
+        cor_mat = CORES['VERDE_SAUDAVEL']
     
     # Texto de status compacto
     if planta.morta:
@@ -125,10 +305,59 @@ def desenhar_planta_melhorada(tela, planta, fonte, tempo_atual):
         status = f"{int(planta.maturidade)}%"
         cor_texto = CORES['PRETO']
     
-    texto_status = fonte.render(status, True, cor_texto)
-    texto_rect = texto_status.get_rect(center=(planta.x, planta.y + tamanho + 25))
+    return (planta.x, planta.y, tamanho, cor_principal, cor_borda, brilho,
+            agua_largura, cor_agua, mat_largura, cor_mat, status, cor_texto)
+
+def desenhar_aparencia_planta(tela, aparencia, fonte):
+    """Desenha uma planta a partir de aparencia_planta"""
+    (x, y, tamanho, cor_principal, cor_borda, brilho,
+     agua_largura, cor_agua, mat_largura, cor_mat, status, cor_texto) = aparencia
+    
+    # Sombra, corpo e brilho em um único sprite
+    sprite, margem = atlas.planta(tamanho, cor_borda, cor_principal, brilho)
+    tela.blit(sprite, (x - margem, y - margem))
+    
+    # Barra de água aprimorada
+    barra_x = x - LARGURA_BARRA // 2
+    barra_y = y + tamanho + 8
+    
+    # Fundo da barra
+    pygame.draw.rect(tela, CORES['CINZA_MORTA'], (barra_x, barra_y, LARGURA_BARRA, ALTURA_BARRA))
+    
+    # Preenchimento da barra de água
+    if agua_largura > 0:
+        pygame.draw.rect(tela, cor_agua, (barra_x, barra_y, agua_largura, ALTURA_BARRA))
+    
+    # Borda da barra
+    pygame.draw.rect(tela, CORES['PRETO'], (barra_x, barra_y, LARGURA_BARRA, ALTURA_BARRA), 1)
+    
+    # Barra de maturidade
+    barra_y_mat = barra_y + ALTURA_BARRA + 2
+    
+    # Fundo da barra de maturidade
+    pygame.draw.rect(tela, CORES['CINZA_MORTA'], (barra_x, barra_y_mat, LARGURA_BARRA, ALTURA_BARRA))
+    
+    # Preenchimento da barra de maturidade
+    if mat_largura > 0:
+        pygame.draw.rect(tela, cor_mat, (barra_x, barra_y_mat, mat_largura, ALTURA_BARRA))
+    
+    # Borda da barra de maturidade
+    pygame.draw.rect(tela, CORES['PRETO'], (barra_x, barra_y_mat, LARGURA_BARRA, ALTURA_BARRA), 1)
+    
+    # Texto de status
+    texto_status = renderizar_texto(fonte, status, cor_texto)
+    texto_rect = texto_status.get_rect(center=(x, y + tamanho + 25))
     tela.blit(texto_status, texto_rect)
 
+def desenhar_planta_melhorada(tela, planta, fonte, tempo_atual):
+    """Desenha planta com animações e detalhes visuais aprimorados"""
+    desenhar_aparencia_planta(tela, aparencia_planta(planta, tempo_atual), fonte)
+
+def area_planta(x, y):
+    """Retângulo que contém qualquer desenho da planta em (x, y), em qualquer estado"""
+    # tamanho máximo int((8 + 100/12) * 1.1) = 17; texto de status até y + 17 + 25 + 7
+    return pygame.Rect(x - 32, y - 20, 64, 72)
+
 def desenhar_agente_melhorado(tela, pos, tipo, ativo=False, fonte_pequena=None):
     """Desenha agentes com animações, indicadores visuais e localização precisa"""
     x, y = pos
@@ -136,77 +365,18 @@ def desenhar_agente_melhorado(tela, pos, tipo, ativo=False, fonte_pequena=None):
     OFFSET_Y = 20  
     y -= OFFSET_Y
     
-    if tipo == "irrigador":
-        cor_principal = CORES['AZUL_AGUA']
-        cor_secundaria = CORES['AZUL_ESCURO']
-        cor_trail = CORES['AZUL_AGUA']
-        simbolo = "💧"
-        nome = "IRRIGADOR"
-    else:  # colhedor
-        cor_principal = CORES['AMARELO_COLHEITA']
-        cor_secundaria = CORES['AMARELO_ESCURO']
-        cor_trail = CORES['AMARELO_COLHEITA']
-        simbolo = "🌾"
-        nome = "COLHEDOR"
-    
-    # Rastro/trilha do movimento (linhas pontilhadas em cruz)
-    for i in range(-20, 21, 5):
-        alpha = max(0, 100 - abs(i) * 3)
-        if alpha > 20:
-            # Linhas horizontais
-            pygame.draw.circle(tela, (*cor_trail, alpha), (x + i, y), 2)
-            # Linhas verticais
-            pygame.draw.circle(tela, (*cor_trail, alpha), (x, y + i), 2)
-    
-    # Círculo de área de ação (raio de alcance)
-    if ativo:
-        pygame.draw.circle(tela, (*cor_principal, 30), (x, y), 40, 2)
-        pygame.draw.circle(tela, (*cor_principal, 15), (x, y), 25, 1)
-    
-    # Efeito de atividade (aura pulsante)
-    tamanho = 12
-    if ativo:
-        tamanho = 16
-        # Aura pulsante mais visível
-        for i in range(4):
-            alpha = 80 - (i * 20)
-            raio = 20 + i * 8
-            s = pygame.Surface((raio * 2, raio * 2))
-            s.set_alpha(alpha)
-            pygame.draw.circle(s, cor_principal, (raio, raio), raio, 3)
-            tela.blit(s, (x - raio, y - raio))
-    
-    # Sombra do agente
-    pygame.draw.circle(tela, (50, 50, 50, 100), (x + 3, y + 3), tamanho + 2)
-    
-    # Corpo principal do agente (formato mais distintivo)
-    pygame.draw.circle(tela, CORES['PRETO'], (x, y), tamanho + 3)  # Borda preta
-    pygame.draw.circle(tela, cor_secundaria, (x, y), tamanho + 1)  # Borda colorida
-    pygame.draw.circle(tela, cor_principal, (x, y), tamanho)       # Corpo principal
-    
-    # Centro brilhante
-    pygame.draw.circle(tela, CORES['BRANCO'], (x - 3, y - 3), 3)
-    
-    # Indicador de direção/orientação
-    if tipo == "irrigador":
-        # Desenha gotas d'água
-        for i, offset in enumerate([(0, -20), (-8, -15), (8, -15)]):
-            gota_x, gota_y = x + offset[0], y + offset[1]
-            pygame.draw.circle(tela, CORES['AZUL_AGUA'], (gota_x, gota_y), 2)
-    else:
-        # Desenha símbolo de colheita
-        pontos = [
-            (x, y - 20),
-            (x - 6, y - 12),
-            (x + 6, y - 12),
-            (x, y - 16)
-        ]
-        pygame.draw.polygon(tela, CORES['AMARELO_ESCURO'], pontos)
+    cor_principal, cor_secundaria = CORES_AGENTES[tipo]
+    nome = tipo.upper()
+    tamanho = 16 if ativo else 12
+    
+    # Rastro, alcance, aura, sombra, corpo e indicador em um único sprite
+    sprite, margem = atlas.agente(tipo, ativo)
+    tela.blit(sprite, (x - margem, y - margem))
     
     # Nome e coordenadas do agente
     if fonte_pequena:
         # Nome do agente
-        texto_nome = fonte_pequena.render(nome, True, CORES['PRETO'])
+        texto_nome = renderizar_texto(fonte_pequena, nome, CORES['PRETO'])
         nome_rect = texto_nome.get_rect(center=(x, y + tamanho + 8))
         
         # Fundo do texto para melhor legibilidade
@@ -216,7 +386,7 @@ def desenhar_agente_melhorado(tela, pos, tipo, ativo=False, fonte_pequena=None):
         
         # Coordenadas precisas
         coord_texto = f"({x}, {y})"
-        texto_coord = fonte_pequena.render(coord_texto, True, cor_secundaria)
+        texto_coord = renderizar_texto(fonte_pequena, coord_texto, cor_secundaria)
         coord_rect = texto_coord.get_rect(center=(x, y + tamanho + 22))
         
         # Fundo das coordenadas
@@ -226,6 +396,11 @@ def desenhar_agente_melhorado(tela, pos, tipo, ativo=False, fonte_pequena=None):
     # Linha conectora para mostrar posição exata
     pygame.draw.line(tela, cor_secundaria, (x, y + tamanho), (x, y + tamanho + 5), 2)
 
+def area_agente(pos):
+    """Retângulo que contém qualquer desenho do agente em `pos` (aura, nome e coordenadas)"""
+    x, y = pos
+    return pygame.Rect(x - 50, y - 70, 100, 100)
+
 def desenhar_mira_posicao(tela, pos, cor, tamanho=15):
     """Desenha uma mira para indicar posição exata"""
     x, y = pos
@@ -247,20 +422,24 @@ def desenhar_grid_coordenadas(tela, largura, altura, fonte_pequena, tamanho_grid
     for x in range(0, largura, tamanho_grid):
         pygame.draw.line(tela, cor_grid, (x, 0), (x, altura), 1)
         if x > 0:  # Não desenha no x=0
-            texto = fonte_pequena.render(str(x), True, cor_texto)
+            texto = renderizar_texto(fonte_pequena, str(x), cor_texto)
             tela.blit(texto, (x + 2, 2))
     
     # Linhas horizontais com coordenadas
     for y in range(0, altura, tamanho_grid):
         pygame.draw.line(tela, cor_grid, (0, y), (largura, y), 1)
         if y > 0:  # Não desenha no y=0
-            texto = fonte_pequena.render(str(y), True, cor_texto)
+            texto = renderizar_texto(fonte_pequena, str(y), cor_texto)
             tela.blit(texto, (2, y + 2))
 
 def desenhar_hud_melhorado(tela, fonte, fonte_pequena, acao_irrigador, acao_colhedor, 
                            leitura_sensor, colhidas, mortas, tempo_passado, total_plantas,
-                           pos_irrigador=None, pos_colhedor=None, plantas_vivas=None):
-    """HUD sem emojis, dead-bar ajustada e texto reposicionado para visibilidade"""
+                           pos_irrigador=None, pos_colhedor=None, plantas_vivas=None, agentes=(1, 1)):
+    """HUD sem emojis, dead-bar ajustada e texto reposicionado para visibilidade
+
+    `agentes` é (irrigadores, colhedores), como devolvido por contar_agentes.
+    """
+    n_irrigadores, n_colhedores = agentes
 
     # Painel principal (220×altura suficiente)
     painel_x, painel_w = 780, 220
@@ -268,7 +447,7 @@ def desenhar_hud_melhorado(tela, fonte, fonte_pequena, acao_irrigador, acao_colh
     pygame.draw.rect(tela, CORES['PRETO'],       (painel_x, 0, painel_w, 600), 2)
 
     y_pos = 15
-    tela.blit(fonte.render("SISTEMA DE MONITORAMENTO", True, CORES['PRETO']),
+    tela.blit(renderizar_texto(fonte, "SISTEMA DE MONITORAMENTO", CORES['PRETO']),
               (painel_x+5, y_pos))
     y_pos += 35
     pygame.draw.line(tela, CORES['PRETO'],
@@ -276,38 +455,40 @@ def desenhar_hud_melhorado(tela, fonte, fonte_pequena, acao_irrigador, acao_colh
     y_pos += 15
 
     # AGENTES IA
-    tela.blit(fonte.render("AGENTES IA", True, CORES['ROXO']), (painel_x+5, y_pos))
+    tela.blit(renderizar_texto(fonte, "AGENTES IA", CORES['ROXO']), (painel_x+5, y_pos))
     y_pos += 25
 
     # Irrigador
     pygame.draw.circle(tela, CORES['AZUL_AGUA'], (painel_x+10, y_pos+8), 6)
-    tela.blit(fonte_pequena.render("Irrigador:", True, CORES['PRETO']),
+    rotulo = "Irrigador:" if n_irrigadores == 1 else f"Irrigadores ({n_irrigadores}):"
+    tela.blit(renderizar_texto(fonte_pequena, rotulo, CORES['PRETO']),
               (painel_x+25, y_pos))
     if pos_irrigador:
-        tela.blit(fonte_pequena.render(f"Pos: {pos_irrigador}", True, CORES['AZUL_ESCURO']),
+        tela.blit(renderizar_texto(fonte_pequena, f"Pos: {pos_irrigador}", CORES['AZUL_ESCURO']),
                   (painel_x+25, y_pos+15))
         y_pos += 15
-    tela.blit(fonte_pequena.render(acao_irrigador, True, CORES['AZUL_ESCURO']),
+    tela.blit(renderizar_texto(fonte_pequena, acao_irrigador, CORES['AZUL_ESCURO']),
               (painel_x+25, y_pos+30))
     y_pos += 45
 
     # Colhedor
     pygame.draw.circle(tela, CORES['AMARELO_COLHEITA'], (painel_x+10, y_pos+8), 6)
-    tela.blit(fonte_pequena.render("Colhedor:", True, CORES['PRETO']),
+    rotulo = "Colhedor:" if n_colhedores == 1 else f"Colhedores ({n_colhedores}):"
+    tela.blit(renderizar_texto(fonte_pequena, rotulo, CORES['PRETO']),
               (painel_x+25, y_pos))
     if pos_colhedor:
-        tela.blit(fonte_pequena.render(f"Pos: {pos_colhedor}", True, CORES['AMARELO_ESCURO']),
+        tela.blit(renderizar_texto(fonte_pequena, f"Pos: {pos_colhedor}", CORES['AMARELO_ESCURO']),
                   (painel_x+25, y_pos+15))
         y_pos += 15
-    tela.blit(fonte_pequena.render(acao_colhedor, True, CORES['AMARELO_ESCURO']),
+    tela.blit(renderizar_texto(fonte_pequena, acao_colhedor, CORES['AMARELO_ESCURO']),
               (painel_x+25, y_pos+30))
     y_pos += 45
 
     # Sensor
     pygame.draw.circle(tela, CORES['CINZA_MORTA'], (painel_x+10, y_pos+8), 6)
-    tela.blit(fonte_pequena.render("Sensor:", True, CORES['PRETO']),
+    tela.blit(renderizar_texto(fonte_pequena, "Sensor:", CORES['PRETO']),
               (painel_x+25, y_pos))
-    tela.blit(fonte_pequena.render(leitura_sensor, True, CORES['PRETO']),
+    tela.blit(renderizar_texto(fonte_pequena, leitura_sensor, CORES['PRETO']),
               (painel_x+25, y_pos+30))
     y_pos += 50
 
@@ -316,7 +497,7 @@ def desenhar_hud_melhorado(tela, fonte, fonte_pequena, acao_irrigador, acao_colh
     y_pos += 15
 
     # MÉTRICAS
-    tela.blit(fonte.render("MÉTRICAS", True, CORES['VERDE_LEGENDA']),
+    tela.blit(renderizar_texto(fonte, "MÉTRICAS", CORES['VERDE_LEGENDA']),
               (painel_x+5, y_pos))
     y_pos += 30
 
@@ -326,7 +507,7 @@ def desenhar_hud_melhorado(tela, fonte, fonte_pequena, acao_irrigador, acao_colh
     altura_barra = 15
 
     def draw_bar(label, count, color, y):
-        tela.blit(fonte_pequena.render(f"{label}: {count}", True, color),
+        tela.blit(renderizar_texto(fonte_pequena, f"{label}: {count}", color),
                   (painel_x+5, y))
         pygame.draw.rect(tela, CORES['CINZA_MORTA'],
                          (painel_x+5, y+20, largura_barra, altura_barra))
@@ -351,13 +532,13 @@ def desenhar_hud_melhorado(tela, fonte, fonte_pequena, acao_irrigador, acao_colh
         cor_taxa = (CORES['VERDE_SAUDAVEL'] if taxa > 70 else
                     CORES['LARANJA']       if taxa > 40 else
                     CORES['VERMELHO'])
-        tela.blit(fonte_pequena.render(f"Taxa Sucesso: {taxa:.1f}%", True, cor_taxa),
+        tela.blit(renderizar_texto(fonte_pequena, f"Taxa Sucesso: {taxa:.1f}%", cor_taxa),
                   (painel_x+5, y_pos))
         y_pos += 30
 
     # Tempo
     minutos, segundos = divmod(tempo_passado, 60)
-    tela.blit(fonte.render(f"Tempo: {minutos:02d}:{segundos:02d}", True, CORES['PRETO']),
+    tela.blit(renderizar_texto(fonte, f"Tempo: {minutos:02d}:{segundos:02d}", CORES['PRETO']),
               (painel_x+5, y_pos))
     y_pos += 40
 
@@ -366,7 +547,7 @@ def desenhar_hud_melhorado(tela, fonte, fonte_pequena, acao_irrigador, acao_colh
     y_pos += 15
 
     # LEGENDA sem emojis
-    tela.blit(fonte.render("LEGENDA", True, CORES['PRETO']), (painel_x+5, y_pos))
+    tela.blit(renderizar_texto(fonte, "LEGENDA", CORES['PRETO']), (painel_x+5, y_pos))
     y_pos += 25
     legendas = [
         ("Nível de Água",  CORES['AZUL_AGUA']),
@@ -376,9 +557,14 @@ def desenhar_hud_melhorado(tela, fonte, fonte_pequena, acao_irrigador, acao_colh
         ("Posição Agentes", CORES['PRETO'])
     ]
     for texto, cor in legendas:
-        tela.blit(fonte_pequena.render(texto, True, cor), (painel_x+5, y_pos))
+        tela.blit(renderizar_texto(fonte_pequena, texto, cor), (painel_x+5, y_pos))
         y_pos += 18
 
+def contar_agentes(agentes):
+    """(irrigadores, colhedores) em uma lista de (tipo, posição, ativo)"""
+    irrigadores = sum(1 for tipo, _, _ in agentes if tipo == "irrigador")
+    return irrigadores, len(agentes) - irrigadores
+
 def desenhar_grid_fundo(tela, largura, altura, tamanho_grid=50):
     """Desenha uma grade sutil no fundo para melhor orientação visual"""
     cor_grid = (200, 200, 200)
@@ -389,10 +575,8 @@ def desenhar_grid_fundo(tela, largura, altura, tamanho_grid=50):
     for y in range(0, altura, tamanho_grid):
         pygame.draw.line(tela, cor_grid, (0, y), (largura, y), 1)
 
-def desenhar_estatisticas_tempo_real(tela, fonte_pequena, plantas, x_offset=10, y_offset=550):
-    """Desenha estatísticas em tempo real na parte inferior da tela"""
-    
-    # Calcula estatísticas
+def resumo_estatisticas(plantas):
+    """Total, vivas, colhidas, mortas, água média e maturidade média das plantas vivas"""
     total = len(plantas)
     vivas = sum(1 for p in plantas if not p.morta and not p.coletada)
     colhidas = sum(1 for p in plantas if p.coletada)
@@ -404,12 +588,17 @@ def desenhar_estatisticas_tempo_real(tela, fonte_pequena, plantas, x_offset=10,
     else:
         agua_media = 0
         maturidade_media = 0
+    return total, vivas, colhidas, mortas, agua_media, maturidade_media
+
+def desenhar_estatisticas_tempo_real(tela, fonte_pequena, plantas, x_offset=10, y_offset=550, resumo=None):
+    """Desenha estatísticas em tempo real na parte inferior da tela"""
+    
+    if resumo is None:
+        resumo = resumo_estatisticas(plantas)
+    total, vivas, colhidas, mortas, agua_media, maturidade_media = resumo
     
     # Fundo semitransparente
-    s = pygame.Surface((760, 45))
-    s.set_alpha(180)
-    s.fill(CORES['CINZA_CLARO'])
-    tela.blit(s, (x_offset, y_offset))
+    tela.blit(atlas.retangulo((760, 45), CORES['CINZA_CLARO'], 180), (x_offset, y_offset))
     
     # Textos das estatísticas
     stats = [
@@ -433,10 +622,415 @@ def desenhar_estatisticas_tempo_real(tela, fonte_pequena, plantas, x_offset=10,
         elif "Colhidas:" in stat and colhidas > 0:
             cor_texto = CORES['VERDE_SAUDAVEL']
         
-        texto = fonte_pequena.render(stat, True, cor_texto)
+        texto = renderizar_texto(fonte_pequena, stat, cor_texto)
         tela.blit(texto, (x_pos, y_offset))
         x_pos += texto.get_width() + 20
 
+# Mapa de calor: quando as plantas não cabem legíveis na tela, cada uma vira uma
+# célula colorida de uma grade montada em NumPy, ampliada e aplicada com um blit
+AREA_CAMPO = pygame.Rect(0, 0, 780, 550)
+MODOS_DETALHE = ("auto", "plantas", "mapa")
+CAMADAS_MAPA = ("estado", "agua", "maturidade")
+COR_CELULA_VAZIA = (225, 225, 225)
+NIVEIS_GRADIENTE = 20  # faixas de 5%: a cor só muda (e a célula só é redesenhada) ao trocar de faixa
+
+def detalhe_legivel(x, y, area=AREA_CAMPO):
+    """True se as plantas nas posições `x`, `y` cabem em `area` em tamanho real sem se sobrepor demais"""
+    if len(x) == 0:
+        return True
+    # Cada desenho detalhado ocupa até area_planta (64 x 72): acima disso na área, vira borrão
+    cabem = area.width * area.height // (64 * 72)
+    return (len(x) <= cabem and area.left <= x.min() and x.max() < area.right
+            and area.top <= y.min() and y.max() < area.bottom)
+
+def _eixo_grade(valores, maximo):
+    """Eixo da grade: (posições distintas, células); com mais posições que `maximo`, agrupa em faixas"""
+    distintos = np.unique(valores)
+    return distintos, min(len(distintos), maximo)
+
+def _celulas(eixo, valores):
+    """Célula da grade de cada valor (posição de planta ou de agente) ao longo de `eixo`"""
+    distintos, celulas = eixo
+    if celulas == len(distintos):
+        indices = np.searchsorted(distintos, valores)
+    else:
+        menor, maior = distintos[0], distintos[-1]
+        indices = (np.asarray(valores) - menor) * (celulas - 1) // (maior - menor)
+    return np.clip(indices, 0, celulas - 1)
+
+def _gradiente(inicio, fim, t):
+    """Cores (n, 3) entre `inicio` (t = 0) e `fim` (t = 1), em NIVEIS_GRADIENTE faixas"""
+    t = (np.floor(np.clip(t, 0, 1) * NIVEIS_GRADIENTE) / NIVEIS_GRADIENTE)[:, None]
+    return np.asarray(inicio) + (np.asarray(fim) - np.asarray(inicio)) * t
+
+def cores_mapa(agua, maturidade, morta, coletada, camada="estado"):
+    """Cor (n, 3) de cada planta no mapa de calor; mortas e colhidas ficam cinza em qualquer camada"""
+    if camada == "agua":
+        cores = _gradiente(CORES['VERMELHO'], CORES['AZUL_AGUA'], agua / 100)
+    elif camada == "maturidade":
+        cores = _gradiente(CORES['VERDE_JOVEM'], CORES['VERDE_MADURO'], maturidade / 100)
+        cores[maturidade >= 100] = CORES['AMARELO_COLHEITA']
+    else:
+        # As mesmas faixas do sensor: crítica, preventiva, madura e saudável
+        critico, preventivo = ambiente.LIMIARES_AGUA
+        cores = np.empty((len(agua), 3))
+        cores[:] = CORES['VERDE_SAUDAVEL']
+        cores[maturidade >= 100] = CORES['AMARELO_COLHEITA']
+        cores[agua < preventivo] = CORES['LARANJA']
+        cores[agua < critico] = CORES['VERMELHO']
+    cores[coletada] = CORES['CINZA_COLETADA']
+    cores[morta] = CORES['CINZA_MORTA']
+    return cores
+
+class MapaCalor:
+    """Nível de detalhe do campo: plantas desenhadas uma a uma ou mapa de calor.
+
+    No modo "auto" o mapa entra quando detalhe_legivel é falso (plantas demais, ou
+    posições fora da tela em tamanho real); "plantas" e "mapa" fixam o modo. As
+    posições não mudam, então a grade (uma célula por posição distinta, ou por
+    faixa se houver mais posições que pixels) é calculada uma vez por campo. A cada
+    quadro as cores das plantas de uma célula são tiradas pela média (np.bincount),
+    copiadas para uma superfície do tamanho da grade com surfarray e ampliadas para
+    a área do campo.
+    """
+
+    def __init__(self, area=AREA_CAMPO, modo="auto", camada="estado"):
+        self.area = pygame.Rect(area)
+        self.modo = modo
+        self.camada = camada
+        self.plantas = None
+        self.legivel = True
+        self.imagem = pygame.Surface(self.area.size)
+
+    def _preparar(self, plantas, origem):
+        # Posições não mudam: grade e decisão do modo "auto" valem enquanto a origem for a mesma
+        self.plantas = origem
+        n = len(plantas)
+        x = np.fromiter((p.x for p in plantas), np.int64, n)
+        y = np.fromiter((p.y for p in plantas), np.int64, n)
+        self.legivel = detalhe_legivel(x, y, self.area)
+        if n == 0:
+            self.eixo_x = self.eixo_y = (np.zeros(1, np.int64), 1)
+            self.celula = np.zeros(0, np.int64)
+        else:
+            self.eixo_x = _eixo_grade(x, self.area.width)
+            self.eixo_y = _eixo_grade(y, self.area.height)
+            # Índice plano no layout [coluna, linha] de pygame.surfarray
+            self.celula = _celulas(self.eixo_x, x) * self.eixo_y[1] + _celulas(self.eixo_y, y)
+        self.tamanho_grade = (self.eixo_x[1], self.eixo_y[1])
+        self.ocupacao = np.bincount(self.celula, minlength=self.tamanho_grade[0] * self.tamanho_grade[1])
+        self.grade = pygame.Surface(self.tamanho_grade)
+
+    def ativo(self, simulacao):
+        """True se o campo de `simulacao` deve ser desenhado como mapa de calor neste quadro"""
+        plantas = simulacao.plantas
+        origem = getattr(simulacao, "plantas_origem", plantas)
+        if origem is not self.plantas:
+            self._preparar(plantas, origem)
+        if self.modo == "auto":
+            return not self.legivel
+        return self.modo == "mapa"
+
+    def alternar_modo(self):
+        self.modo = MODOS_DETALHE[(MODOS_DETALHE.index(self.modo) + 1) % len(MODOS_DETALHE)]
+        return self.modo
+
+    def alternar_camada(self):
+        self.camada = CAMADAS_MAPA[(CAMADAS_MAPA.index(self.camada) + 1) % len(CAMADAS_MAPA)]
+        return self.camada
+
+    def atualizar(self, simulacao):
+        """Monta a imagem do mapa com o estado atual das plantas; devolve os pixels da grade"""
+        campo = getattr(simulacao, "campo", None)
+        if campo is not None:
+            # Motor vetorizado: as colunas já são arrays
+            colunas = (campo.agua, campo.maturidade, campo.morta, campo.coletada)
+        else:
+            plantas = simulacao.plantas
+            n = len(plantas)
+            colunas = (np.fromiter((p.agua for p in plantas), np.float64, n),
+                       np.fromiter((p.maturidade for p in plantas), np.float64, n),
+                       np.fromiter((p.morta for p in plantas), np.bool_, n),
+                       np.fromiter((p.coletada for p in plantas), np.bool_, n))
+        cores = cores_mapa(*colunas, self.camada)
+        ocupadas = self.ocupacao > 0
+        pixels = np.empty((len(self.ocupacao), 3))
+        pixels[:] = COR_CELULA_VAZIA
+        for canal in range(3):
+            soma = np.bincount(self.celula, weights=cores[:, canal], minlength=len(self.ocupacao))
+            pixels[ocupadas, canal] = soma[ocupadas] / self.ocupacao[ocupadas]
+        pixels = np.rint(pixels).astype(np.uint8).reshape(*self.tamanho_grade, 3)
+        pygame.surfarray.blit_array(self.grade, pixels)
+        pygame.transform.scale(self.grade, self.area.size, self.imagem)
+        return pixels
+
+    def desenhar(self, tela, fonte_pequena, regiao=None):
+        """Aplica a imagem montada por atualizar(), com borda e legenda, só dentro de `regiao` se dada"""
+        if regiao is None:
+            tela.blit(self.imagem, self.area)
+        else:
+            recorte = regiao.clip(self.area)
+            tela.blit(self.imagem, recorte, recorte.move(-self.area.x, -self.area.y))
+        pygame.draw.rect(tela, CORES['CINZA_MORTA'], self.area, 1)
+        legenda = f"Mapa de calor: {self.camada} - {len(self.celula)} plantas (M: detalhe, H: camada)"
+        texto = renderizar_texto(fonte_pequena, legenda, CORES['PRETO'])
+        tela.blit(atlas.retangulo((texto.get_width() + 8, texto.get_height() + 4), CORES['BRANCO'], 200),
+                  (self.area.x + 6, self.area.y + 6))
+        tela.blit(texto, (self.area.x + 10, self.area.y + 8))
+
+    def area_celulas(self, coluna_min, coluna_max, linha_min, linha_max):
+        """Retângulo da tela ocupado pelas células da grade nesses intervalos (inclusive)"""
+        largura, altura = self.tamanho_grade
+        esquerda = self.area.x + coluna_min * self.area.width // largura
+        topo = self.area.y + linha_min * self.area.height // altura
+        direita = self.area.x + -(-(coluna_max + 1) * self.area.width // largura)
+        base = self.area.y + -(-(linha_max + 1) * self.area.height // altura)
+        return pygame.Rect(esquerda, topo, direita - esquerda, base - topo)
+
+    def posicao(self, pos):
+        """Posição na tela, sobre o mapa, de uma posição do campo (ex.: a de um agente)"""
+        coluna = _celulas(self.eixo_x, pos[0])
+        linha = _celulas(self.eixo_y, pos[1])
+        largura, altura = self.tamanho_grade
+        return (self.area.x + int((coluna + 0.5) * self.area.width / largura),
+                self.area.y + int((linha + 0.5) * self.area.height / altura))
+
+def desenhar_agente_mapa(tela, pos, tipo):
+    """Agente sobre o mapa de calor: só uma mira na cor do agente"""
+    desenhar_mira_posicao(tela, pos, CORES_AGENTES[tipo][1], tamanho=8)
+
+def area_agente_mapa(pos):
+    """Retângulo que contém a mira de desenhar_agente_mapa em `pos`"""
+    x, y = pos
+    return pygame.Rect(x - 10, y - 10, 21, 21)
+
+# Nível de detalhe compartilhado pelo quadro completo e pelo incremental (M e H na interface)
+mapa_calor = MapaCalor()
+
+def desenhar_quadro(tela, fonte, fonte_pequena, simulacao, tempo_atual, tempo_passado, perfil=NULO):
+    """Desenha um quadro completo da interface a partir do estado da simulação"""
+    with perfil.fase("desenhar_fundo"):
+        tela.fill(CORES['BRANCO'])
+        desenhar_grid_fundo(tela, 780, tela.get_height())
+
+    mapa = mapa_calor.ativo(simulacao)
+    with perfil.fase("desenhar_plantas"):
+        if mapa:
+            mapa_calor.atualizar(simulacao)
+            mapa_calor.desenhar(tela, fonte_pequena)
+        else:
+            for planta in simulacao.plantas:
+                desenhar_planta_melhorada(tela, planta, fonte_pequena, tempo_atual)
+
+    with perfil.fase("desenhar_agentes"):
+        for tipo, pos, ativo in simulacao.agentes:
+            if mapa:
+                desenhar_agente_mapa(tela, mapa_calor.posicao(pos), tipo)
+            else:
+                desenhar_agente_melhorado(tela, pos, tipo, ativo, fonte_pequena)
+
+    # Totais mantidos pela simulação (agregados.py), sem percorrer as plantas
+    resumo = simulacao.resumo_estatisticas()
+    with perfil.fase("desenhar_hud"):
+        desenhar_hud_melhorado(
+            tela, fonte, fonte_pequena,
+            simulacao.ultima_acao_irrigador, simulacao.ultima_acao_colhedor, simulacao.ultimas_leituras_sensor,
+            simulacao.plantas_colhidas, simulacao.plantas_mortas, tempo_passado, len(simulacao.plantas),
+            plantas_vivas=resumo[1], agentes=contar_agentes(simulacao.agentes)
+        )
+
+    with perfil.fase("desenhar_estatisticas"):
+        desenhar_estatisticas_tempo_real(tela, fonte_pequena, simulacao.plantas, resumo=resumo)
+
+class QuadroIncremental:
+    """Desenha o quadro só onde algo mudou e devolve os retângulos para pygame.display.update.
+
+    Grade e fundo ficam em uma superfície pronta; o painel lateral é refeito só quando
+    os números dele mudam. Plantas, agentes e a faixa de estatísticas são comparados com
+    o quadro anterior, e cada região alterada é restaurada do fundo e redesenhada na
+    mesma ordem de camadas de desenhar_quadro. Com o mapa de calor (`mapa`, por padrão o
+    mapa_calor do módulo), a área do campo é refeita quando algum pixel da grade muda.
+    """
+
+    PAINEL = pygame.Rect(780, 0, 220, 600)
+    FAIXA = pygame.Rect(10, 550, 760, 45)
+
+    def __init__(self, tela, fonte, fonte_pequena, limite_redesenho=0.5, mapa=None):
+        self.tela = tela
+        self.mapa = mapa if mapa is not None else mapa_calor
+        self.fonte = fonte
+        self.fonte_pequena = fonte_pequena
+        self.tela_rect = tela.get_rect()
+        # Acima desta fração da tela alterada, um quadro completo sai mais barato
+        self.limite_redesenho = limite_redesenho
+
+        self.fundo = pygame.Surface(self.tela_rect.size)
+        self.fundo.fill(CORES['BRANCO'])
+        desenhar_grid_fundo(self.fundo, 780, self.tela_rect.height)
+        self.painel = pygame.Surface(self.tela_rect.size)
+        self.composicao = pygame.Surface(self.tela_rect.size)
+        self.reiniciar()
+
+    def reiniciar(self):
+        """Esquece o quadro anterior; o próximo será desenhado por completo"""
+        self.plantas = None
+        self.chave_mapa = None
+        self.pixels_mapa = None
+        self.pendentes = []
+        self.visiveis = []
+        self.aparencias = {}
+        self.agentes = {}
+        self.chave_painel = None
+        self.resumo = None
+        self.quadros_completos = 0
+        self.quadros_parciais = 0
+
+    def _preparar_plantas(self, plantas, origem, mapa):
+        # Posições não mudam: as plantas fora da tela são descartadas uma única vez
+        self.plantas = origem
+        self.visiveis = [] if mapa else [(i, area_planta(p.x, p.y)) for i, p in enumerate(plantas)
+                                         if area_planta(p.x, p.y).colliderect(self.tela_rect)]
+        self.aparencias = {}
+
+    def invalidar(self, regiao):
+        """Marca uma região desenhada por fora (ex.: sobreposição) para ser refeita no próximo quadro"""
+        self.pendentes.append(pygame.Rect(regiao))
+
+    def desenhar(self, simulacao, tempo_atual, tempo_passado, perfil=NULO):
+        """`simulacao` pode ser a própria Simulacao ou um passo_fixo.Instantaneo"""
+        plantas = simulacao.plantas
+        # Instantâneos trazem plantas novas a cada quadro; o campo é o mesmo enquanto a origem for
+        origem = getattr(simulacao, "plantas_origem", plantas)
+        mapa = self.mapa.ativo(simulacao)
+        chave_mapa = (mapa, self.mapa.camada)
+        if origem is not self.plantas or chave_mapa != self.chave_mapa:
+            self.reiniciar()
+            self.chave_mapa = chave_mapa
+            self._preparar_plantas(plantas, origem, mapa)
+        sujos, self.pendentes = self.pendentes, []
+
+        # Mapa de calor: o retângulo que envolve as células cuja cor mudou
+        if mapa:
+            with perfil.fase("comparar_plantas"):
+                pixels = self.mapa.atualizar(simulacao)
+                if self.pixels_mapa is None:
+                    sujos.append(self.mapa.area)
+                else:
+                    colunas, linhas = np.nonzero((pixels != self.pixels_mapa).any(axis=2))
+                    if len(colunas):
+                        sujos.append(self.mapa.area_celulas(colunas.min(), colunas.max(), linhas.min(), linhas.max()))
+                self.pixels_mapa = pixels
+
+        # Plantas visíveis cuja aparência mudou
+        with perfil.fase("comparar_plantas"):
+            aparencias = {}
+            for i, area in self.visiveis:
+                aparencia = aparencia_planta(plantas[i], tempo_atual)
+                aparencias[i] = aparencia
+                if self.aparencias.get(i) != aparencia:
+                    sujos.append(area)
+            self.aparencias = aparencias
+
+        # Agentes: área antiga e nova quando mudam de posição ou de estado (ou somem)
+        # (no mapa de calor, a posição já convertida para a tela)
+        if mapa:
+            agentes = {i: (tipo, self.mapa.posicao(pos), ativo)
+                       for i, (tipo, pos, ativo) in enumerate(simulacao.agentes)}
+            area = area_agente_mapa
+        else:
+            agentes = dict(enumerate(simulacao.agentes))
+            area = area_agente
+        for i in agentes.keys() | self.agentes.keys():
+            anterior, estado = self.agentes.get(i), agentes.get(i)
+            if anterior != estado:
+                if anterior is not None:
+                    sujos.append(area(anterior[1]))
+                if estado is not None:
+                    sujos.append(area(estado[1]))
+        self.agentes = agentes
+
+        # Painel lateral: refeito na própria superfície só quando os valores mudam
+        resumo = simulacao.resumo_estatisticas()  # O(1): totais mantidos pela simulação
+        with perfil.fase("desenhar_hud"):
+            chave_painel = (simulacao.ultima_acao_irrigador, simulacao.ultima_acao_colhedor,
+                            simulacao.ultimas_leituras_sensor, simulacao.plantas_colhidas,
+                            simulacao.plantas_mortas, tempo_passado, len(simulacao.plantas),
+                            resumo[1], contar_agentes(simulacao.agentes))
+            if chave_painel != self.chave_painel:
+                self.chave_painel = chave_painel
+                desenhar_hud_melhorado(self.painel, self.fonte, self.fonte_pequena, *chave_painel[:7],
+                                       plantas_vivas=chave_painel[7], agentes=chave_painel[8])
+                sujos.append(self.PAINEL)
+
+        # Faixa de estatísticas: compara os números como aparecem na tela
+        with perfil.fase("comparar_estatisticas"):
+            chave_resumo = resumo[:4] + (f"{resumo[4]:.1f}", f"{resumo[5]:.1f}")
+            if chave_resumo != self.resumo:
+                self.resumo = chave_resumo
+                sujos.append(self.FAIXA)
+
+        area_suja = sum(r.width * r.height for r in sujos)
+        if self.quadros_completos == 0 or area_suja > self.limite_redesenho * self.tela_rect.width * self.tela_rect.height:
+            sujos = [self.tela_rect]
+            self.quadros_completos += 1
+        else:
+            self.quadros_parciais += 1
+
+        with perfil.fase("redesenhar_regioes"):
+            sujos = [r.clip(self.tela_rect) for r in sujos]
+            sujos = [r for r in sujos if r.width and r.height]
+            for regiao in sujos:
+                self._redesenhar(regiao, simulacao, resumo)
+        return sujos
+
+    def _redesenhar(self, regiao, simulacao, resumo):
+        """Restaura o fundo em `regiao`, redesenha tudo o que a toca e copia só a região para a tela"""
+        # Compõe sem recorte em uma superfície auxiliar: com clip, pygame.draw.rect com
+        # borda desenharia a borda na linha do recorte
+        composicao = self.composicao
+        composicao.blit(self.fundo, regiao, regiao)
+        mapa = self.chave_mapa[0]
+
+        if mapa and self.mapa.area.colliderect(regiao):
+            self.mapa.desenhar(composicao, self.fonte_pequena, regiao)
+        for i, area in self.visiveis:
+            if area.colliderect(regiao):
+                desenhar_aparencia_planta(composicao, self.aparencias[i], self.fonte_pequena)
+
+        for tipo, pos, ativo in self.agentes.values():
+            if mapa:
+                if area_agente_mapa(pos).colliderect(regiao):
+                    desenhar_agente_mapa(composicao, pos, tipo)
+            elif area_agente(pos).colliderect(regiao):
+                desenhar_agente_melhorado(composicao, pos, tipo, ativo, self.fonte_pequena)
+
+        if self.PAINEL.colliderect(regiao):
+            composicao.blit(self.painel, self.PAINEL, self.PAINEL)
+
+        if self.FAIXA.colliderect(regiao):
+            desenhar_estatisticas_tempo_real(composicao, self.fonte_pequena, simulacao.plantas, resumo=resumo)
+
+        self.tela.blit(composicao, regiao, regiao)
+
+def desenhar_perfil(tela, fonte_pequena, resumo, pos=(10, 10), cabecalho=("fase (ms)", "p50", "p95", "p99")):
+    """Sobreposição com p50/p95/p99 (ms) de cada fase (ou outra tabela de 3 colunas); devolve o retângulo ocupado"""
+    largura_nome, largura_coluna, altura_linha = 130, 48, 14
+    linhas = [cabecalho]
+    linhas += [(nome, *(f"{v:.2f}" if isinstance(v, float) else str(v) for v in valores))
+               for nome, *valores in resumo]
+    area = pygame.Rect(pos, (largura_nome + 3 * largura_coluna + 12, altura_linha * len(linhas) + 8))
+    tela.blit(atlas.retangulo(area.size, CORES['PRETO'], 190), area)
+    
+    for i, (nome, *valores) in enumerate(linhas):
+        y = area.y + 4 + altura_linha * i
+        tela.blit(renderizar_texto(fonte_pequena, nome, CORES['BRANCO']), (area.x + 6, y))
+        for j, valor in enumerate(valores):
+            texto = renderizar_texto(fonte_pequena, valor, CORES['BRANCO'])
+            # Números alinhados à direita de cada coluna
+            direita = area.x + 6 + largura_nome + largura_coluna * (j + 1)
+            tela.blit(texto, (direita - texto.get_width(), y))
+    return area
+
 # Funções auxiliares para integração
 def obter_tempo_pygame():
     """Retorna o tempo atual do pygame para animações"""